@@ -0,0 +1,153 @@
+"""
+Benchmark the hot query patterns with and without the declared indexes.
+
+Fills a scratch database with synthetic users, jobs, applications and
+matches, times each query as a collection scan, creates the indexes from
+``services.db_indexes.REQUIRED_INDEXES`` and times it again. The plan stage
+(COLLSCAN / IXSCAN) is read from ``explain``. Needs a running MongoDB
+(``MONGO_URL``); the scratch database is dropped at the end.
+
+Usage:
+    python benchmark_indexes.py                  # 100k users, 20k jobs, 500k applications
+    python benchmark_indexes.py --users 10000 --jobs 2000 --applications 50000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from pymongo import MongoClient
+
+from services.db_indexes import REQUIRED_INDEXES
+
+def generate(db, n_users: int, n_jobs: int, n_applications: int, seed: int = 42):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    users = [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "email": f"user{i}@example.com",
+            "role": "recruiter" if i % 20 == 0 else "candidate",
+            "skills": ["Python", "React"],
+            "password": "x"
+        }
+        for i in range(n_users)
+    ]
+    recruiters = [u["id"] for u in users if u["role"] == "recruiter"]
+    candidates = [u["id"] for u in users if u["role"] == "candidate"]
+    jobs = [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "posted_by": rng.choice(recruiters),
+            "status": "active",
+            "created_at": now - timedelta(minutes=i)
+        }
+        for i in range(n_jobs)
+    ]
+    job_ids = [j["id"] for j in jobs]
+    applications = [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "user_id": rng.choice(candidates),
+            "job_id": rng.choice(job_ids),
+            "created_at": now - timedelta(seconds=i)
+        }
+        for i in range(n_applications)
+    ]
+    matches = [{"user_id": rng.choice(candidates), "job_id": rng.choice(job_ids)} for _ in range(n_applications // 2)]
+
+    for name, docs in [("users", users), ("jobs", jobs), ("applications", applications), ("matches", matches)]:
+        for start in range(0, len(docs), 10000):
+            db[name].insert_many(docs[start:start + 10000], ordered=False)
+    return users, jobs, recruiters, candidates
+
+def query_patterns(db, users, jobs, recruiters, candidates, rng):
+    """(label, collection, run, filter) for the queries the routes issue"""
+    def user_by_id():
+        f = {"id": rng.choice(users)["id"]}
+        return db.users.find_one(f), f
+    def user_by_email():
+        f = {"email": rng.choice(users)["email"]}
+        return db.users.find_one(f), f
+    def job_by_id():
+        f = {"id": rng.choice(jobs)["id"]}
+        return db.jobs.find_one(f), f
+    def applications_by_user():
+        f = {"user_id": rng.choice(candidates)}
+        return list(db.applications.find(f).limit(100)), f
+    def recent_applications():
+        recruiter = rng.choice(recruiters)
+        job_ids = [j["id"] for j in db.jobs.find({"posted_by": recruiter}, {"id": 1})]
+        f = {"job_id": {"$in": job_ids}}
+        return list(db.applications.find(f).sort("created_at", -1).limit(10)), f
+    def jobs_by_recruiter():
+        f = {"posted_by": rng.choice(recruiters)}
+        return list(db.jobs.find(f).limit(100)), f
+    def count_matches():
+        f = {"user_id": rng.choice(candidates)}
+        return db.matches.count_documents(f), f
+    return [
+        ("users.find_one(id)", "users", user_by_id),
+        ("users.find_one(email)", "users", user_by_email),
+        ("jobs.find_one(id)", "jobs", job_by_id),
+        ("applications.find(user_id)", "applications", applications_by_user),
+        ("applications recent by job_id $in", "applications", recent_applications),
+        ("jobs.find(posted_by)", "jobs", jobs_by_recruiter),
+        ("matches.count_documents(user_id)", "matches", count_matches),
+    ]
+
+def plan_stage(db, collection: str, filter_: dict) -> str:
+    plan = db.command("explain", {"find": collection, "filter": filter_}, verbosity="queryPlanner")
+    stage = plan["queryPlanner"]["winningPlan"]
+    while "inputStage" in stage and stage["stage"] not in ("COLLSCAN", "IXSCAN"):
+        stage = stage["inputStage"]
+    return stage["stage"]
+
+def measure(db, patterns, repeats: int) -> dict:
+    results = {}
+    for label, collection, run in patterns:
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            _, filter_ = run()
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))] * 1000
+        results[label] = (statistics.median(samples) * 1000, p95, plan_stage(db, collection, filter_))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--applications", type=int, default=500000)
+    parser.add_argument("--repeats", type=int, default=50, help="timed runs per query")
+    args = parser.parse_args()
+
+    client = MongoClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    db_name = os.environ.get("DB_NAME", "job_matching_db") + "_index_benchmark"
+    client.drop_database(db_name)
+    db = client[db_name]
+    try:
+        print(f"\n📊 {args.users} users, {args.jobs} jobs, {args.applications} applications")
+        users, jobs, recruiters, candidates = generate(db, args.users, args.jobs, args.applications)
+        patterns = query_patterns(db, users, jobs, recruiters, candidates, random.Random(7))
+
+        before = measure(db, patterns, args.repeats)
+        for collection, indexes in REQUIRED_INDEXES.items():
+            db[collection].create_indexes(indexes)
+        after = measure(db, patterns, args.repeats)
+
+        print(f"  {'query':<36} {'scan p50':>9} {'p95':>9}  {'indexed p50':>11} {'p95':>9}  plan")
+        for label, (p50, p95, stage) in before.items():
+            ip50, ip95, istage = after[label]
+            print(f"  {label:<36} {p50:>7.2f}ms {p95:>7.2f}ms  {ip50:>9.2f}ms {ip95:>7.2f}ms  {stage} -> {istage}")
+    finally:
+        client.drop_database(db_name)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark job search: the in-process BM25 index versus an unanchored
+case-insensitive regex scan (what ``$regex`` without an index does).
+
+Usage:
+    python benchmark_job_search.py                # 100k jobs, 500 queries
+    python benchmark_job_search.py 10000 --queries 1000
+"""
+
+import argparse
+import random
+import re
+import statistics
+import time
+
+from services.job_search import JobSearchIndex
+
+TITLE_WORDS = ["Senior", "Junior", "Lead", "Staff", "Principal", "Backend", "Frontend", "Full Stack",
+               "Data", "Machine Learning", "DevOps", "Cloud", "Mobile", "Security", "Platform"]
+ROLES = ["Engineer", "Developer", "Scientist", "Analyst", "Architect", "Manager", "Designer"]
+SKILLS = ["Python", "JavaScript", "React", "Node.js", "MongoDB", "FastAPI", "AWS", "Docker",
+          "Kubernetes", "TypeScript", "Java", "Go", "SQL", "PostgreSQL", "Redis", "Kafka", "Terraform"]
+FILLER = ("build maintain scalable services team customers product design deliver features "
+          "collaborate stakeholders testing deployment monitoring performance reliable systems "
+          "mentoring reviews architecture data pipelines analytics dashboards").split()
+LOCATIONS = ["Remote", "New York", "London", "Berlin", "Bangalore", "San Francisco", "Toronto"]
+
+def generate_jobs(n_jobs: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n_jobs):
+        skills = rng.sample(SKILLS, rng.randint(3, 6))
+        words = rng.choices(FILLER, k=rng.randint(40, 120)) + skills
+        rng.shuffle(words)
+        jobs.append({
+            "id": f"job-{i}",
+            "title": f"{rng.choice(TITLE_WORDS)} {rng.choice(ROLES)}",
+            "company": f"Company {rng.randint(1, 2000)}",
+            "description": " ".join(words),
+            "required_skills": skills,
+            "location": rng.choice(LOCATIONS),
+            "status": "active"
+        })
+    return jobs
+
+def generate_queries(n_queries: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n_queries):
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append(f"{rng.choice(TITLE_WORDS)} {rng.choice(ROLES)}")
+        elif kind < 0.8:
+            queries.append(f"{rng.choice(SKILLS)} {rng.choice(ROLES).lower()}")
+        else:
+            queries.append(" ".join(rng.sample(FILLER, 2)))
+    return queries
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+    return f"p50 {p(0.50):>8.2f} ms  p95 {p(0.95):>8.2f} ms  p99 {p(0.99):>8.2f} ms  mean {statistics.mean(samples) * 1000:>8.2f} ms"
+
+def regex_scan(jobs: list, query: str, limit: int) -> list:
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    found = []
+    for job in jobs:
+        if pattern.search(job["title"]) or pattern.search(job["description"]):
+            found.append(job["id"])
+            if len(found) == limit:
+                break
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("jobs", nargs="?", type=int, default=100000, help="number of jobs to index")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=20, help="page size")
+    parser.add_argument("--regex-queries", type=int, default=50,
+                        help="queries to time with the regex scan (it is slow)")
+    args = parser.parse_args()
+
+    jobs = generate_jobs(args.jobs)
+    queries = generate_queries(args.queries)
+    print(f"\n📊 {args.jobs} jobs, {args.queries} queries, page size {args.limit}")
+
+    start = time.perf_counter()
+    index = JobSearchIndex()
+    for job in jobs:
+        index.add(job)
+    print(f"  index build                   {time.perf_counter() - start:>8.2f}s  {len(index.postings)} terms")
+
+    first_page, next_page = [], []
+    for query in queries:
+        start = time.perf_counter()
+        page, has_more = index.search(query, limit=args.limit)
+        first_page.append(time.perf_counter() - start)
+        if has_more:
+            start = time.perf_counter()
+            index.search(query, after=page[-1], limit=args.limit)
+            next_page.append(time.perf_counter() - start)
+    print(f"  BM25 first page               {percentiles(first_page)}")
+    if next_page:
+        print(f"  BM25 next page (cursor)       {percentiles(next_page)}")
+
+    filtered = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, skills=["Python"], location="remote", limit=args.limit)
+        filtered.append(time.perf_counter() - start)
+    print(f"  BM25 + skill/location filter  {percentiles(filtered)}")
+
+    scans = []
+    for query in queries[:args.regex_queries]:
+        start = time.perf_counter()
+        regex_scan(jobs, query, args.limit)
+        scans.append(time.perf_counter() - start)
+    print(f"  regex scan (unranked)         {percentiles(scans)}")
+
+if __name__ == "__main__":
+    main()
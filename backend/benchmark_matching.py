@@ -0,0 +1,80 @@
+"""
+Benchmark the matching pipeline: NetworkX graph + Hopcroft-Karp versus the
+vectorized scorer + weighted assignment solver.
+
+Usage:
+    python benchmark_matching.py                 # 1k / 10k / 50k candidates
+    python benchmark_matching.py 2000 --capacity 3
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from utils.graph_utils import build_bipartite_graph, find_optimal_matches, match_candidates_to_jobs
+
+SKILLS = [f"Skill {i}" for i in range(400)]
+
+def generate_data(n_candidates: int, n_jobs: int, seed: int = 42):
+    """Generate synthetic candidates and jobs with realistic skill counts"""
+    rng = random.Random(seed)
+    candidates = [
+        {
+            "id": f"candidate-{i}",
+            "skills": rng.sample(SKILLS, rng.randint(3, 15)),
+            "experience": rng.randint(0, 15)
+        }
+        for i in range(n_candidates)
+    ]
+    jobs = []
+    for i in range(n_jobs):
+        min_exp = rng.randint(0, 8)
+        jobs.append({
+            "id": f"job-{i}",
+            "required_skills": rng.sample(SKILLS, rng.randint(3, 8)),
+            "min_experience": min_exp,
+            "max_experience": min_exp + rng.randint(2, 6)
+        })
+    return candidates, jobs
+
+def measure(label: str, func):
+    """Run func and print wall time and peak traced memory"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    matches = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total = sum(weight for _, _, weight in matches)
+    print(f"  {label:<28} {elapsed:>9.2f}s  peak {peak / 1024 / 1024:>9.1f} MB  "
+          f"matches {len(matches):>6}  total weight {total:.2f}")
+
+def networkx_path(candidates, jobs):
+    graph = build_bipartite_graph(candidates, jobs)
+    return find_optimal_matches(graph, mode="cardinality")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sizes", nargs="*", type=int, default=[1000, 10000, 50000],
+                        help="candidate counts to benchmark")
+    parser.add_argument("--jobs-ratio", type=float, default=0.1,
+                        help="number of jobs per candidate (default 0.1)")
+    parser.add_argument("--capacity", type=int, default=1, help="candidates per job")
+    parser.add_argument("--networkx-max", type=int, default=10000,
+                        help="skip the NetworkX path above this many candidates")
+    args = parser.parse_args()
+
+    for n_candidates in args.sizes:
+        n_jobs = max(1, int(n_candidates * args.jobs_ratio))
+        candidates, jobs = generate_data(n_candidates, n_jobs)
+        print(f"\n📊 {n_candidates} candidates x {n_jobs} jobs")
+
+        if n_candidates <= args.networkx_max:
+            measure("networkx (cardinality)", lambda: networkx_path(candidates, jobs))
+        else:
+            print("  networkx (cardinality)       skipped")
+        measure("weighted assignment", lambda: match_candidates_to_jobs(candidates, jobs, capacity=args.capacity))
+
+if __name__ == "__main__":
+    main()
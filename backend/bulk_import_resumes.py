@@ -0,0 +1,69 @@
+"""
+Bulk Resume Import Script for Job Matching Platform
+Imports a directory or zip of PDF resumes as candidate profiles.
+
+Usage:
+    python bulk_import_resumes.py /path/to/resumes.zip
+    python bulk_import_resumes.py /path/to/resume_dir --checkpoint agency.checkpoint.jsonl
+
+Re-running with the same checkpoint after a crash skips the files that were
+already imported.
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from utils.env_utils import load_environment_variables
+
+load_environment_variables()
+
+from services.bulk_ingest import BulkImporter
+from services.job_rankings import wait_for_background_rebuilds
+from services.skill_index import initialize_skill_index_from_db, mark_skill_index_stale
+
+
+async def bulk_import(source: Path, checkpoint: Path):
+    # Rankings are rebuilt per imported candidate, which needs the skill index
+    await initialize_skill_index_from_db()
+
+    async def on_progress(stats: dict):
+        print(
+            f"   {stats['processed']}/{stats['total'] - stats['skipped']} processed, "
+            f"{stats['failed']} failed, {stats['resumes_per_minute']} resumes/min"
+        )
+
+    importer = BulkImporter(source, checkpoint, on_progress=on_progress)
+    stats = await importer.run()
+    await wait_for_background_rebuilds()
+    # The server's skill index does not see writes made from this process
+    await mark_skill_index_stale()
+
+    print("\n✅ Bulk import completed!")
+    print("📊 Summary:")
+    print(f"   - Files found: {stats['total']}")
+    print(f"   - Skipped (already in checkpoint): {stats['skipped']}")
+    print(f"   - Imported: {stats['succeeded']}")
+    print(f"   - Failed: {stats['failed']}")
+    print(f"   - Throughput: {stats['resumes_per_minute']} resumes/min")
+
+    if stats["failures"]:
+        print("\n❌ Failures:")
+        print("=" * 60)
+        for failure in stats["failures"]:
+            print(f"{failure['file']}: {failure['error']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a directory or zip of PDF resumes")
+    parser.add_argument("source", type=Path, help="Directory or .zip of PDF resumes")
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="Checkpoint file (default: <source>.checkpoint.jsonl)"
+    )
+    args = parser.parse_args()
+
+    checkpoint = args.checkpoint or args.source.with_name(args.source.name + ".checkpoint.jsonl")
+    print(f"🚀 Importing resumes from {args.source} (checkpoint: {checkpoint})...")
+    asyncio.run(bulk_import(args.source, checkpoint))
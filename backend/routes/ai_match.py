@@ -1,76 +1,89 @@
-from fastapi import APIRouter, HTTPException, Depends
-from routes.auth import get_current_user
+from fastapi import APIRouter, HTTPException, Depends, Query
+from routes.auth import get_current_user, get_current_user_profile
 from utils.db import get_database
-from services.ranking_engine import rank_candidates_for_job
-from utils.graph_utils import build_bipartite_graph, find_optimal_matches
-from datetime import datetime
-import uuid
+from services.job_rankings import get_job_ranking
+from services.scoring_engine import candidate_features, get_scoring_function, job_features, to_percentage
+from services.match_runs import start_match_run, get_match_run, cancel_match_run, MatchRunInProgress
 
 router = APIRouter()
 
-@router.post("/run")
-async def run_matching_algorithm(current_user: dict = Depends(get_current_user)):
+@router.post("/run", status_code=202)
+async def run_matching_algorithm(
+    capacity: int = Query(1, ge=1, le=100),
+    rebuild: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
     """
-    Execute bipartite matching algorithm for all active jobs
+    Start maximum-weight bipartite matching for all active jobs in the background.
+    Each job can take up to ``capacity`` candidates. Only candidates and jobs
+    changed since the last run are rescored unless ``rebuild`` is set.
+    Poll ``GET /run/{run_id}`` for progress.
     """
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Only recruiters can run matching")
     
-    db = get_database()
+    try:
+        run = await start_match_run(current_user["id"], capacity=capacity, rebuild=rebuild)
+    except MatchRunInProgress as e:
+        raise HTTPException(status_code=409, detail=f"A matching run is already in progress: {e.run_id}")
     
-    # Get all candidates and jobs
-    candidates = await db.users.find({"role": "candidate"}).to_list(length=1000)
-    jobs = await db.jobs.find({"status": "active"}).to_list(length=1000)
-    
-    if not candidates or not jobs:
-        return {
-            "success": True,
-            "data": {
-                "total_matches": 0,
-                "message": "No candidates or jobs found"
-            }
+    return {
+        "success": True,
+        "data": {
+            **run,
+            "message": "Matching run started"
         }
+    }
+
+@router.get("/run/{run_id}")
+async def get_matching_run(
+    run_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get status and progress of a matching run
+    """
+    if current_user["role"] != "recruiter":
+        raise HTTPException(status_code=403, detail="Only recruiters can view matching runs")
     
-    # Build bipartite graph
-    graph = build_bipartite_graph(candidates, jobs)
-    
-    # Find optimal matches
-    matches = find_optimal_matches(graph)
-    
-    # Store matches in database
-    match_docs = []
-    for candidate_id, job_id, score in matches:
-        match_doc = {
-            "id": str(uuid.uuid4()),
-            "user_id": candidate_id,
-            "job_id": job_id,
-            "match_score": int(score * 100),
-            "graph_edge_weight": score,
-            "status": "pending",
-            "created_at": datetime.utcnow()
-        }
-        match_docs.append(match_doc)
+    run = await get_match_run(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Matching run not found")
     
-    if match_docs:
-        await db.matches.delete_many({})  # Clear old matches
-        await db.matches.insert_many(match_docs)
+    return {
+        "success": True,
+        "data": run
+    }
+
+@router.post("/run/{run_id}/cancel")
+async def cancel_matching_run(
+    run_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Request cancellation of a queued or running matching run
+    """
+    if current_user["role"] != "recruiter":
+        raise HTTPException(status_code=403, detail="Only recruiters can cancel matching runs")
+    
+    run = await cancel_match_run(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="No active matching run with this id")
     
     return {
         "success": True,
-        "data": {
-            "total_matches": len(match_docs),
-            "message": "Matching algorithm completed successfully"
-        }
+        "data": run
     }
 
 @router.get("/candidates/{job_id}")
 async def get_candidates_for_job(
     job_id: str,
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
+    skip: int = Query(0, ge=0),
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Get ranked list of candidates for a specific job
+    Get a page of the ranked candidate list for a specific job
     """
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Only recruiters can view candidates")
@@ -82,18 +95,23 @@ async def get_candidates_for_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Get and rank candidates
-    ranked_candidates = await rank_candidates_for_job(job)
+    # Read the materialized ranking
+    ranked_candidates, total = await get_job_ranking(job["id"], limit=limit, skip=skip)
     
     return {
         "success": True,
-        "data": ranked_candidates[:limit]
+        "data": ranked_candidates,
+        "pagination": {
+            "skip": skip,
+            "limit": limit,
+            "total": total
+        }
     }
 
 @router.get("/score/{job_id}")
 async def get_match_score(
     job_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_profile)
 ):
     """
     Calculate match score between current user and job
@@ -118,18 +136,17 @@ async def get_match_score(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Calculate match score
-    user_skills = set([s.lower() for s in current_user.get("skills", [])])
-    job_skills = set([s.lower() for s in job.get("required_skills", [])])
-    
-    skill_overlap = user_skills & job_skills
-    match_score = len(skill_overlap) / len(job_skills) if job_skills else 0
+    # Calculate match score with the same formula as matching and rankings
+    scoring = get_scoring_function()
+    features = job_features(job)
+    weight, skill_overlap = scoring.score(*candidate_features(current_user), *features)
     
     return {
         "success": True,
         "data": {
-            "match_percentage": int(match_score * 100),
+            "match_percentage": to_percentage(weight),
             "matched_skills": list(skill_overlap),
-            "missing_skills": list(job_skills - user_skills)
+            "missing_skills": list(features[0] - skill_overlap),
+            "scoring_version": scoring.version
         }
     }
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends
-from routes.auth import get_current_user
+from routes.auth import get_current_user, get_current_user_profile
 from utils.db import get_database
 from services.bias_analysis import calculate_bias_metrics, analyze_skill_gaps
 
@@ -27,7 +27,7 @@ async def get_bias_report(current_user: dict = Depends(get_current_user)):
     }
 
 @router.get("/skill-gaps")
-async def get_skill_gaps(current_user: dict = Depends(get_current_user)):
+async def get_skill_gaps(current_user: dict = Depends(get_current_user_profile)):
     """
     Analyze skill gaps for a candidate
     """
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Depends
 from routes.auth import get_current_user
+from services.application_hydration import hydrate_applications
 from utils.db import get_database
+from utils.pagination import DEFAULT_PAGE_SIZE, NEWEST_FIRST, keyset_page
 from datetime import datetime
 from pydantic import BaseModel
 import uuid
@@ -75,30 +77,30 @@ async def create_application(
     }
 
 @router.get("/candidate")
-async def get_candidate_applications(current_user: dict = Depends(get_current_user)):
-    """Get applications for current candidate"""
+async def get_candidate_applications(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get applications for current candidate, newest first"""
     if current_user["role"] != "candidate":
         raise HTTPException(status_code=403, detail="Access denied")
     
     db = get_database()
     
-    # Get applications
-    cursor = db.applications.find({"user_id": current_user["id"]})
-    applications = await cursor.to_list(length=100)
+    # Get one page of applications
+    try:
+        applications, next_cursor = await keyset_page(db.applications, {"user_id": current_user["id"]}, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     
-    # Get job details for each application
-    for app in applications:
-        job = await db.jobs.find_one({"id": app["job_id"]})
-        if job:
-            job_copy = {k: v for k, v in job.items() if k != "_id"}
-            app["job"] = job_copy
-        app["id"] = str(app["_id"]) if "_id" in app else app["id"]
-        if "_id" in app:
-            del app["_id"]
+    # Attach job details with one batched query
+    await hydrate_applications(applications, with_candidate=False)
     
     return {
         "success": True,
-        "data": applications
+        "data": applications,
+        "next_cursor": next_cursor
     }
 
 @router.get("/recruiter/recent")
@@ -109,34 +111,16 @@ async def get_recent_applications(current_user: dict = Depends(get_current_user)
     
     db = get_database()
     
-    # Get jobs posted by the recruiter
-    cursor = db.jobs.find({"posted_by": current_user["id"]})
-    jobs = await cursor.to_list(length=100)
-    job_ids = [job["id"] for job in jobs]
+    # Ids of every job posted by the recruiter; details are only loaded for
+    # the jobs that appear in the result
+    job_ids = await db.jobs.distinct("id", {"posted_by": current_user["id"]})
     
     # Get recent applications for these jobs
-    cursor = db.applications.find({"job_id": {"$in": job_ids}}).sort("created_at", -1).limit(10)
+    cursor = db.applications.find({"job_id": {"$in": job_ids}}).sort(NEWEST_FIRST).limit(10)
     applications = await cursor.to_list(length=10)
     
-    # Get candidate and job details for each application
-    for app in applications:
-        # Add candidate info
-        candidate = await db.users.find_one({"id": app["user_id"]})
-        if candidate:
-            # Remove sensitive info
-            candidate_copy = {k: v for k, v in candidate.items() 
-                             if k not in ["_id", "password"]}
-            app["candidate"] = candidate_copy
-        
-        # Add job info
-        job = await db.jobs.find_one({"id": app["job_id"]})
-        if job:
-            job_copy = {k: v for k, v in job.items() if k != "_id"}
-            app["job"] = job_copy
-            
-        app["id"] = str(app["_id"]) if "_id" in app else app["id"]
-        if "_id" in app:
-            del app["_id"]
+    # Attach candidate and job details
+    await hydrate_applications(applications)
     
     return {
         "success": True,
@@ -151,9 +135,11 @@ async def test_endpoint():
 @router.get("/recruiter/{job_id}")
 async def get_job_applications(
     job_id: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """Get applications for a specific job"""
+    """Get applications for a specific job, newest first"""
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Access denied")
     
@@ -164,25 +150,19 @@ async def get_job_applications(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found or access denied")
     
-    # Get applications
-    cursor = db.applications.find({"job_id": job_id})
-    applications = await cursor.to_list(length=100)
-    
-    # Get candidate details for each application
-    for app in applications:
-        candidate = await db.users.find_one({"id": app["user_id"]})
-        if candidate:
-            # Remove sensitive info
-            candidate_copy = {k: v for k, v in candidate.items() 
-                             if k not in ["_id", "password"]}
-            app["candidate"] = candidate_copy
-        app["id"] = str(app["_id"]) if "_id" in app else app["id"]
-        if "_id" in app:
-            del app["_id"]
+    # Get one page of applications
+    try:
+        applications, next_cursor = await keyset_page(db.applications, {"job_id": job_id}, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    # Attach candidate details with one batched query
+    await hydrate_applications(applications, with_job=False)
     
     return {
         "success": True,
-        "data": applications
+        "data": applications,
+        "next_cursor": next_cursor
     }
 
 @router.put("/{application_id}/status")
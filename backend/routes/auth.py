@@ -2,6 +2,8 @@ from fastapi import APIRouter, HTTPException, Depends, Header
 from pydantic import BaseModel, EmailStr
 from utils.db import get_database
 from utils.auth import get_password_hash, verify_password, create_access_token, decode_access_token
+from services.change_hooks import on_candidate_saved
+from services.user_sessions import get_principal, invalidate_user_session, load_user_profile
 from typing import Optional
 from datetime import datetime
 import uuid
@@ -27,7 +29,11 @@ class UserProfile(BaseModel):
     phone: Optional[str] = None
 
 async def get_current_user(authorization: Optional[str] = Header(None)):
-    """Dependency to get current user from JWT token"""
+    """
+    Dependency to get the current user from the JWT token. Returns the cached
+    principal (id, role, email, name); use ``get_current_user_profile`` for
+    the full profile.
+    """
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Not authenticated")
     
@@ -37,8 +43,16 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    db = get_database()
-    user = await db.users.find_one({"id": payload.get("sub")})
+    user = await get_principal(payload.get("sub"))
+    
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    
+    return user
+
+async def get_current_user_profile(current_user: dict = Depends(get_current_user)):
+    """Dependency for endpoints that need the current user's full profile"""
+    user = await load_user_profile(current_user["id"])
     
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
@@ -118,7 +132,7 @@ async def login(data: LoginRequest):
     }
 
 @router.get("/me")
-async def get_profile(current_user: dict = Depends(get_current_user)):
+async def get_profile(current_user: dict = Depends(get_current_user_profile)):
     user_data = {k: v for k, v in current_user.items() if k != "password" and k != "_id"}
     return {
         "success": True,
@@ -141,9 +155,12 @@ async def update_profile(
         {"id": current_user["id"]},
         {"$set": update_data}
     )
+    invalidate_user_session(current_user["id"])
     
     # Get updated user
     updated_user = await db.users.find_one({"id": current_user["id"]})
+    if "skills" in update_data or "experience" in update_data:
+        await on_candidate_saved(updated_user)
     user_data = {k: v for k, v in updated_user.items() if k != "password" and k != "_id"}
     
     return {
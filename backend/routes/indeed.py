@@ -3,6 +3,8 @@ from routes.auth import get_current_user
 from typing import Optional
 from services import indeed_api
 from utils.db import get_database
+from services.change_hooks import on_job_saved
+from services.skill_matcher import register_skills
 from datetime import datetime
 import uuid
 
@@ -126,9 +128,12 @@ async def import_indeed_job(
         "status": "active"
     }
     
+    register_skills(job_doc["required_skills"])
+    
     # Save to database
     db = get_database()
     await db.jobs.insert_one(job_doc)
+    await on_job_saved(job_doc)
     
     # Remove MongoDB _id for response
     if "_id" in job_doc:
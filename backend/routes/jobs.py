@@ -1,10 +1,15 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
-from routes.auth import get_current_user
+from routes.auth import get_current_user, get_current_user_profile
 from utils.db import get_database
 from services.job_recommendation import get_recommendations_for_user
+from services.change_hooks import on_job_saved, on_job_deleted
+from services.skill_matcher import canonicalize_skills, register_skills
+from services.job_search import get_job_search_index
+from utils.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor, keyset_page
 from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel
+import re
 import uuid
 
 router = APIRouter()
@@ -27,29 +32,50 @@ async def search_jobs(
     query: Optional[str] = None,
     skills: Optional[str] = None,
     location: Optional[str] = None,
-    limit: int = 20
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None
 ):
     db = get_database()
+    skill_list = [s.strip() for s in skills.split(",")] if skills else []
+    index = get_job_search_index()
+    next_cursor = None
     
-    # Build search filter
-    search_filter = {"status": "active"}
-    
-    if query:
-        search_filter["$or"] = [
-            {"title": {"$regex": query, "$options": "i"}},
-            {"description": {"$regex": query, "$options": "i"}}
-        ]
-    
-    if skills:
-        skill_list = [s.strip() for s in skills.split(",")]
-        search_filter["required_skills"] = {"$in": skill_list}
-    
-    if location:
-        search_filter["location"] = {"$regex": location, "$options": "i"}
-    
-    # Execute search
-    cursor = db.jobs.find(search_filter).limit(limit)
-    jobs = await cursor.to_list(length=limit)
+    if query and index is not None:
+        # Ranked full-text search; Mongo only loads the page's jobs
+        try:
+            after = decode_cursor(cursor, float, str) if cursor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page, has_more = index.search(query, skill_list, location, after, limit)
+        ids = [job_id for _, job_id in page]
+        found = await db.jobs.find({"id": {"$in": ids}}).to_list(length=len(ids))
+        by_id = {job["id"]: job for job in found}
+        jobs = [by_id[job_id] for job_id in ids if job_id in by_id]
+        if has_more and page:
+            next_cursor = encode_cursor(*page[-1])
+    else:
+        # Build search filter
+        search_filter = {"status": "active"}
+        
+        if query:
+            # Index not built yet; match the literal text, never a user-supplied pattern
+            pattern = re.escape(query)
+            search_filter["$or"] = [
+                {"title": {"$regex": pattern, "$options": "i"}},
+                {"description": {"$regex": pattern, "$options": "i"}}
+            ]
+        
+        if skill_list:
+            search_filter["required_skills"] = {"$in": skill_list}
+        
+        if location:
+            search_filter["location"] = {"$regex": re.escape(location), "$options": "i"}
+        
+        # Newest first, one keyset page at a time
+        try:
+            jobs, next_cursor = await keyset_page(db.jobs, search_filter, cursor, limit)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
     
     # Convert _id to id
     for job in jobs:
@@ -59,17 +85,31 @@ async def search_jobs(
     
     return {
         "success": True,
-        "data": jobs
+        "data": jobs,
+        "next_cursor": next_cursor
     }
 
 @router.get("/recommendations")
-async def get_recommended_jobs(current_user: dict = Depends(get_current_user)):
+async def get_recommended_jobs(
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user_profile)
+):
+    try:
+        after = decode_cursor(cursor, float, str) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
     # Get AI recommendations
-    recommendations = await get_recommendations_for_user(current_user)
+    recommendations, has_more = await get_recommendations_for_user(current_user, after)
+    next_cursor = None
+    if has_more and recommendations:
+        last = recommendations[-1]
+        next_cursor = encode_cursor(last["match_score"], last["id"])
     
     return {
         "success": True,
-        "data": recommendations
+        "data": recommendations,
+        "next_cursor": next_cursor
     }
 
 @router.post("")
@@ -83,6 +123,11 @@ async def create_job(
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Only recruiters can post jobs")
     
+    # Normalise skill spellings
+    required_skills = canonicalize_skills(job_data.required_skills)
+    preferred_skills = canonicalize_skills(job_data.preferred_skills)
+    register_skills(required_skills + preferred_skills)
+    
     # Create job document
     job_id = str(uuid.uuid4())
     job_doc = {
@@ -90,8 +135,8 @@ async def create_job(
         "title": job_data.title,
         "company": job_data.company,
         "description": job_data.description,
-        "required_skills": job_data.required_skills,
-        "preferred_skills": job_data.preferred_skills,
+        "required_skills": required_skills,
+        "preferred_skills": preferred_skills,
         "location": job_data.location,
         "min_experience": job_data.min_experience,
         "max_experience": job_data.max_experience,
@@ -104,6 +149,7 @@ async def create_job(
     }
     
     await db.jobs.insert_one(job_doc)
+    await on_job_saved(job_doc)
     
     # Remove MongoDB _id and ensure proper serialization
     if "_id" in job_doc:
@@ -146,12 +192,19 @@ async def get_job(job_id: str):
     }
 
 @router.get("/recruiter/my-jobs")
-async def get_recruiter_jobs(current_user: dict = Depends(get_current_user)):
+async def get_recruiter_jobs(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Only recruiters can access this")
     
     db = get_database()
-    jobs = await db.jobs.find({"posted_by": current_user["id"]}).to_list(length=100)
+    try:
+        jobs, next_cursor = await keyset_page(db.jobs, {"posted_by": current_user["id"]}, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     
     for job in jobs:
         job["id"] = str(job["_id"]) if "_id" in job else job["id"]
@@ -161,7 +214,8 @@ async def get_recruiter_jobs(current_user: dict = Depends(get_current_user)):
     
     return {
         "success": True,
-        "data": jobs
+        "data": jobs,
+        "next_cursor": next_cursor
     }
 @router.put("/{job_id}")
 async def update_job(
@@ -194,13 +248,17 @@ async def update_job(
     if job["posted_by"] != current_user["id"]:
         raise HTTPException(status_code=403, detail="You can only update your own job postings")
     
+    required_skills = canonicalize_skills(job_data.required_skills)
+    preferred_skills = canonicalize_skills(job_data.preferred_skills)
+    register_skills(required_skills + preferred_skills)
+    
     # Update job data
     update_data = {
         "title": job_data.title,
         "company": job_data.company,
         "description": job_data.description,
-        "required_skills": job_data.required_skills,
-        "preferred_skills": job_data.preferred_skills,
+        "required_skills": required_skills,
+        "preferred_skills": preferred_skills,
         "location": job_data.location,
         "min_experience": job_data.min_experience,
         "max_experience": job_data.max_experience,
@@ -217,6 +275,7 @@ async def update_job(
     
     # Get updated job
     updated_job = await db.jobs.find_one(filter_query)
+    await on_job_saved(updated_job)
     
     # Format for response
     updated_job["id"] = str(updated_job.get("_id", updated_job.get("id", "")))
@@ -264,6 +323,7 @@ async def delete_job(
     
     # Delete the job
     await db.jobs.delete_one(filter_query)
+    await on_job_deleted(job.get("id", str(job["_id"])))
     
     return {
         "success": True,
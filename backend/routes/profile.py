@@ -3,6 +3,8 @@ from typing import Optional
 from pydantic import BaseModel
 from utils.db import get_database
 from routes.auth import get_current_user
+from services.change_hooks import on_candidate_saved
+from services.user_sessions import invalidate_user_session
 
 router = APIRouter()
 
@@ -80,6 +82,9 @@ async def update_profile(user_id: str, updates: ProfileUpdate, current_user: dic
         return {"success": True, "data": {"message": "No changes"}}
 
     await db.users.update_one({"id": user_id}, {"$set": update_data})
+    invalidate_user_session(user_id)
     user = await db.users.find_one({"id": user_id})
+    if "skills" in update_data or "experience" in update_data:
+        await on_candidate_saved(user)
     user_safe = {k: v for k, v in user.items() if k not in ("password", "_id")}
     return {"success": True, "data": user_safe}
@@ -1,11 +1,15 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from routes.auth import get_current_user
-from services.resume_parser import extract_text_from_pdf, parse_resume_with_ai
+from fastapi.concurrency import run_in_threadpool
+from routes.auth import get_current_user, get_current_user_profile
+from services.resume_pipeline import submit_parse_job, get_parse_job
+from services.bulk_ingest import BULK_RESUME_DIR, start_bulk_import, get_bulk_import
+from services.llm_output import parse_metrics
+from services.parse_cache import get_parse_cache
 from utils.db import get_database
+from pathlib import Path
+import hashlib
 import os
 import uuid
-from pathlib import Path
-from datetime import datetime
 
 router = APIRouter()
 
@@ -13,7 +17,39 @@ router = APIRouter()
 UPLOADS_DIR = Path(__file__).parent.parent / "uploads"
 UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 
-@router.post("/upload")
+MAX_RESUME_BYTES = 10 * 1024 * 1024  # 10MB
+MAX_BULK_BYTES = 2 * 1024 * 1024 * 1024  # 2GB
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+async def save_upload(file: UploadFile, file_path: Path, max_bytes: int = MAX_RESUME_BYTES) -> str:
+    """
+    Stream an upload to ``file_path`` chunk by chunk, hashing as it goes.
+    Aborts as soon as the size limit is crossed; returns the SHA-256.
+    """
+    part_path = file_path.with_name(file_path.name + ".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(part_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File size too large (max {max_bytes // (1024 * 1024)}MB)"
+                    )
+                digest.update(chunk)
+                f.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="File is empty")
+        # Replace the previous resume only once the new one is complete
+        os.replace(part_path, file_path)
+    finally:
+        if part_path.exists():
+            part_path.unlink()
+    return digest.hexdigest()
+
+@router.post("/upload", status_code=202)
 async def upload_resume(
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user)
@@ -26,123 +62,107 @@ async def upload_resume(
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
-    # Read file content first to validate size
-    content = await file.read()
-    
-    # Validate file size (limit to 10MB)
-    if len(content) == 0:
-        raise HTTPException(status_code=400, detail="File is empty")
-    
-    if len(content) > 10 * 1024 * 1024:  # 10MB
-        raise HTTPException(status_code=400, detail="File size too large (max 10MB)")
-    
     # Create user-specific directory
     user_dir = UPLOADS_DIR / current_user["id"]
     user_dir.mkdir(parents=True, exist_ok=True)
     
-    # Save file with original filename (overwrite previous resume)
-    file_path = user_dir / f"resume_{file.filename}"
+    # Save file with original filename (overwrite previous resume); size is
+    # enforced while streaming so an oversized upload is never held in memory
+    file_path = user_dir / f"resume_{Path(file.filename).name}"
+    content_hash = await save_upload(file, file_path)
     
-    with open(file_path, "wb") as f:
-        f.write(content)
+    # Parsing runs in the background; the client polls the parse job
+    job = await submit_parse_job(current_user["id"], str(file_path), file.filename, content_hash)
     
-    # Extract text from PDF
-    resume_text = extract_text_from_pdf(str(file_path))
+    return {
+        "success": True,
+        "data": {
+            "message": "Resume uploaded, parsing in progress",
+            "parse_job_id": job["id"],
+            "status": job["status"]
+        }
+    }
 
-    if not resume_text or resume_text.strip() == "":
-        # Clean up the uploaded file if text extraction fails
-        try:
-            os.remove(file_path)
-        except:
-            pass
-        raise HTTPException(
-            status_code=400, 
-            detail="Could not extract text from PDF. This may be an image-based PDF or the file may be corrupted. Please try uploading a text-based PDF or convert your document to text format."
-        )
+@router.get("/parse-jobs/{job_id}")
+async def get_resume_parse_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Status of a resume parse job: queued, extracting, parsing, done or failed"""
+    job = await get_parse_job(job_id, current_user["id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Parse job not found")
+    
+    return {
+        "success": True,
+        "data": job
+    }
 
-    # Get logger for this route
-    from utils.logger import get_logger
-    logger = get_logger("resume_route")
+@router.post("/bulk", status_code=202)
+async def bulk_import_resumes(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user)
+):
+    """Import a zip of PDF resumes as candidate profiles in the background"""
+    # Creates profiles for people who never signed up, so admins only
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Access denied")
     
-    # Import the OpenRouter detection function
-    from services.resume_parser import IS_OPENROUTER_API_KEY
+    if not file.filename or not file.filename.lower().endswith('.zip'):
+        raise HTTPException(status_code=400, detail="Upload a .zip file of PDF resumes")
     
-    # Parse resume with AI (service may be sync)
-    try:
-        parsed_data = await parse_resume_with_ai(resume_text) if callable(getattr(parse_resume_with_ai, "__await__", None)) else parse_resume_with_ai(resume_text)
-        
-        # Get the parsing method from the result
-        parsing_method = parsed_data.get("parsing_method", "ai")
-        parsing_method_msg = "OpenRouter AI" if "openrouter" in parsing_method else "Gemini AI"
-        
-        # Log successful parsing
-        logger.info(f"Resume parsed successfully using {parsing_method_msg}")
-        
-        # Update user profile with comprehensive parsed data
-        db = get_database()
-        update_data = {
-            "skills": parsed_data.get("skills", []),
-            "experience": parsed_data.get("experience_years", 0),
-            "education": parsed_data.get("education", []),
-            "achievements": parsed_data.get("achievements", []),
-            "job_titles": parsed_data.get("job_titles", []),
-            "resume_file": str(file_path),
-            "resume_filename": file.filename,
-            "resume_uploaded_at": datetime.now().isoformat(),
-            "profile_complete": True,
-            # Additional profile details from resume
-            "bio": parsed_data.get("summary", ""),
-            "phone": parsed_data.get("phone", ""),
-            "location": parsed_data.get("location", ""),
-            "certifications": parsed_data.get("certifications", []),
-            "languages": parsed_data.get("languages", []),
-            "projects": parsed_data.get("projects", [])
-        }
-        
-        await db.users.update_one(
-            {"id": current_user["id"]},
-            {"$set": update_data}
-        )
-        
-        return {
-            "success": True,
-            "data": {
-                "message": f"Resume uploaded and parsed successfully with {parsing_method_msg}",
-                "parsed_data": parsed_data,
-                "parsing_method": parsing_method
-            }
+    BULK_RESUME_DIR.mkdir(parents=True, exist_ok=True)
+    import_id = str(uuid.uuid4())
+    archive_path = BULK_RESUME_DIR / f"{import_id}.zip"
+    await save_upload(file, archive_path, MAX_BULK_BYTES)
+    
+    import_doc = await start_bulk_import(archive_path, current_user["id"], import_id)
+    
+    return {
+        "success": True,
+        "data": {
+            "import_id": import_doc["id"],
+            "status": import_doc["status"]
         }
-    except ValueError as e:
-        # Log the error
-        logger.error(f"AI parsing configuration error: {str(e)}")
-        
-        # Return a specific error for missing API key or configuration issues
-        api_type = "OpenRouter" if IS_OPENROUTER_API_KEY else "Gemini"
-        raise HTTPException(
-            status_code=503, 
-            detail=f"{api_type} API is required for resume parsing but is not properly configured. Please check your API key."
-        )
-    except Exception as e:
-        # Log the error
-        logger.error(f"Error in resume upload handler: {str(e)}")
-        
-        # Determine which AI service we're using for better error messages
-        api_type = "OpenRouter" if IS_OPENROUTER_API_KEY else "Gemini"
-        
-        # Return a more specific error based on the service
-        if "API" in str(e) or "key" in str(e).lower():
-            raise HTTPException(
-                status_code=503, 
-                detail=f"{api_type} API service is currently unavailable or improperly configured. Please check your API key."
-            )
-        else:
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Failed to process resume with {api_type} API: {str(e)}"
-            )
+    }
+
+@router.get("/bulk/{import_id}")
+async def get_bulk_import_status(
+    import_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Progress of a bulk import: counts, resumes/min and per-file failures"""
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    import_doc = await get_bulk_import(import_id)
+    if not import_doc:
+        raise HTTPException(status_code=404, detail="Import not found")
+    
+    return {
+        "success": True,
+        "data": import_doc
+    }
+
+@router.get("/parse-metrics")
+async def get_resume_parse_metrics(current_user: dict = Depends(get_current_user)):
+    """
+    LLM calls, repaired and wasted responses, wasted calls per successful
+    parse, and the parse cache's size and hits/misses per layer
+    """
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    # The first call sizes the cache directory, so keep it off the event loop
+    cache_stats = await run_in_threadpool(get_parse_cache().stats)
+    
+    return {
+        "success": True,
+        "data": {**parse_metrics.snapshot(), "cache": cache_stats}
+    }
 
 @router.get("/parsed-data")
-async def get_parsed_resume_data(current_user: dict = Depends(get_current_user)):
+async def get_parsed_resume_data(current_user: dict = Depends(get_current_user_profile)):
     return {
         "success": True,
         "data": {
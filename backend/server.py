@@ -1,4 +1,5 @@
 from fastapi import FastAPI, APIRouter, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.cors import CORSMiddleware
 import os
@@ -42,10 +43,77 @@ async def lifespan(app):
     except Exception as e:
         logger.error(f"Error initializing skill trie: {e}")
     
+    # Initialize inverted skill index used to prune match scoring; until it
+    # is built, scoring is not pruned and the refresh loop retries the build
+    from services.skill_index import initialize_skill_index_from_db, start_skill_index_refresh
+    try:
+        await initialize_skill_index_from_db()
+    except Exception as e:
+        logger.error(f"Error initializing skill index: {e}")
+    start_skill_index_refresh()
+    
+    from services.job_search import initialize_job_search_from_db
+    try:
+        await initialize_job_search_from_db()
+    except Exception as e:
+        logger.error(f"Error building job search index: {e}")
+    
+    from services.job_recommendation import get_recommendation_engine
+    try:
+        await get_recommendation_engine().load_catalog()
+    except Exception as e:
+        logger.error(f"Error loading recommendation catalog: {e}")
+    
+    from services.db_indexes import ensure_indexes
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        logger.error(f"Error creating database indexes: {e}")
+    
+    from services.resume_pipeline import recover_parse_jobs
+    try:
+        await recover_parse_jobs()
+    except Exception as e:
+        logger.error(f"Error re-queuing resume parse jobs: {e}")
+    
+    from services.bulk_ingest import recover_bulk_imports
+    try:
+        await recover_bulk_imports()
+    except Exception as e:
+        logger.error(f"Error resuming bulk imports: {e}")
+    
+    from services.match_runs import recover_match_runs
+    try:
+        await recover_match_runs()
+    except Exception as e:
+        logger.error(f"Error recovering matching runs: {e}")
+    
+    from services.resume_parser import gemini_models
+    from services.model_health import start_background_probes
+    start_background_probes(gemini_models)
+    
+    # Shared keep-alive connection pool for OpenRouter calls
+    from services.resume_parser import GEMINI_API_KEY, IS_OPENROUTER_API_KEY
+    from services.openrouter_client import start_openrouter_client
+    if IS_OPENROUTER_API_KEY:
+        await start_openrouter_client(GEMINI_API_KEY)
+    
     yield
     
     # Shutdown
     logger.info("AI Job Matching Platform shutting down...")
+    from services.match_runs import shutdown_executor
+    shutdown_executor()
+    from services.resume_pipeline import shutdown_workers
+    shutdown_workers()
+    from services.model_health import stop_background_probes
+    stop_background_probes()
+    from services.skill_index import stop_skill_index_refresh
+    stop_skill_index_refresh()
+    from services.pdf_extraction import shutdown_pdf_executor
+    shutdown_pdf_executor()
+    from services.openrouter_client import close_openrouter_client
+    await close_openrouter_client()
 
 # Create the main app with lifespan handler
 app = FastAPI(title="AI Job Matching Platform", version="1.0.0", lifespan=lifespan)
@@ -64,6 +132,19 @@ async def root():
 
 @api_router.get("/health")
 async def health_check():
+    # Probes run every few seconds, so only the index lists are read here;
+    # the usage statistics in index_report are for the startup log and benchmarks
+    from services.db_indexes import missing_indexes
+    try:
+        missing = await missing_indexes()
+    except Exception as e:
+        logger.error(f"Health check could not read indexes: {e}")
+        return JSONResponse(status_code=503, content={"status": "unhealthy", "error": "database unavailable"})
+    if missing:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unhealthy", "missing_indexes": missing}
+        )
     return {"status": "healthy"}
 
 # Include all route modules
@@ -107,6 +188,16 @@ async def log_requests(request: Request, call_next):
     except Exception as e:
         logger.error(f"Error processing {method} {path}: {str(e)}")
         raise
+
+# Reject oversized resume uploads before the multipart body is read
+@app.middleware("http")
+async def limit_resume_upload_size(request: Request, call_next):
+    if request.url.path == "/api/resume/upload":
+        content_length = request.headers.get("content-length")
+        # Allow for the multipart envelope around the file itself
+        if content_length and content_length.isdigit() and int(content_length) > resume.MAX_RESUME_BYTES + 64 * 1024:
+            return JSONResponse(status_code=400, content={"detail": "File size too large (max 10MB)"})
+    return await call_next(request)
         
 # CORS middleware
 app.add_middleware(
@@ -0,0 +1,57 @@
+"""
+Batched hydration of application listings.
+
+The listing endpoints attach the job and/or the candidate to each
+application. Instead of one ``find_one`` per application, the ids are
+collected and each collection is read once with an ``$in`` query, so a page
+costs a constant number of queries however many applications it holds.
+Candidate profiles are projected without ``password`` on the server.
+"""
+
+from utils.db import get_database
+
+JOB_PROJECTION = {"_id": 0}
+CANDIDATE_PROJECTION = {"_id": 0, "password": 0}
+
+
+async def _by_id(collection, ids: set, projection: dict) -> dict:
+    """``id -> document`` for ``ids`` in a single query"""
+    if not ids:
+        return {}
+    docs = {}
+    async for doc in collection.find({"id": {"$in": list(ids)}}, projection):
+        docs[doc["id"]] = doc
+    return docs
+
+
+async def hydrate_applications(
+    applications: list,
+    with_job: bool = True,
+    with_candidate: bool = True,
+    jobs: dict = None
+) -> list:
+    """
+    Attach ``job`` and ``candidate`` to each application in place and return
+    the list. ``jobs`` is an optional ``id -> job`` map already loaded by
+    the caller; only the jobs missing from it are fetched.
+    """
+    db = get_database()
+    jobs = dict(jobs or {})
+
+    if with_job:
+        missing = {app["job_id"] for app in applications} - set(jobs)
+        jobs.update(await _by_id(db.jobs, missing, JOB_PROJECTION))
+    candidates = {}
+    if with_candidate:
+        candidates = await _by_id(db.users, {app["user_id"] for app in applications}, CANDIDATE_PROJECTION)
+
+    for app in applications:
+        if with_job and app["job_id"] in jobs:
+            app["job"] = {k: v for k, v in jobs[app["job_id"]].items() if k != "_id"}
+        if with_candidate and app["user_id"] in candidates:
+            app["candidate"] = candidates[app["user_id"]]
+        # Keep the application's own id, which the status route looks up by
+        if "_id" in app:
+            app.setdefault("id", str(app["_id"]))
+            del app["_id"]
+    return applications
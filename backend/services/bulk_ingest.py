@@ -0,0 +1,311 @@
+"""
+Bulk resume ingestion.
+
+Imports a directory or zip of PDF resumes as candidate profiles, for
+onboarding partner agencies. Files are read, extracted and parsed by a
+bounded pool (``BULK_WORKERS`` in flight, at most ``BULK_LLM_CONCURRENCY``
+resumes at the LLM at once), and profiles are written with ``bulk_write`` in batches
+of ``BULK_BATCH_SIZE``. Candidates are keyed by the SHA-256 of their PDF, so
+re-importing a file updates the same profile.
+
+After each batch is written its files are appended to a JSON-lines
+checkpoint; a crashed import restarted with the same checkpoint skips the
+files already done. Used by ``POST /api/resume/bulk`` and by
+``bulk_import_resumes.py``.
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+from pymongo import UpdateOne
+
+from services.change_hooks import on_candidate_saved
+from services.local_resume_parser import is_confident, parse_resume_locally
+from services.parse_cache import sha256_hex
+from services.resume_parser import RESUME_TEXT_LIMIT, extract_text_cached, parse_resume_tiered
+from utils.db import get_database
+from utils.logger import get_logger
+
+logger = get_logger("bulk_ingest")
+
+BULK_WORKERS = int(os.environ.get("BULK_WORKERS", "8"))
+BULK_LLM_CONCURRENCY = int(os.environ.get("BULK_LLM_CONCURRENCY", "4"))
+BULK_BATCH_SIZE = 100
+# Only the first failures are kept on the import document
+MAX_REPORTED_FAILURES = 1000
+
+BULK_RESUME_DIR = Path(__file__).parent.parent / "uploads" / "bulk"
+
+
+@contextmanager
+def open_resume_sources(source: Path):
+    """Yield ``[(name, read_bytes)]`` for every PDF in a directory or zip, in a stable order"""
+    source = Path(source)
+    if source.is_dir():
+        yield [
+            (str(path.relative_to(source)), path.read_bytes)
+            for path in sorted(source.rglob("*"))
+            if path.is_file() and path.suffix.lower() == ".pdf"
+        ]
+    elif zipfile.is_zipfile(source):
+        # The archive stays open until every member has been read
+        with zipfile.ZipFile(source) as archive:
+            yield [
+                (info.filename, partial(archive.read, info))
+                for info in sorted(archive.infolist(), key=lambda i: i.filename)
+                if not info.is_dir() and info.filename.lower().endswith(".pdf")
+            ]
+    else:
+        raise ValueError(f"{source} is neither a directory nor a zip file")
+
+
+class Checkpoint:
+    """Append-only record of files already imported"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.done = set()
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line after a crash
+                    if entry.get("status") == "done":
+                        self.done.add(entry["file"])
+
+    def record(self, entries: list) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(e["file"] for e in entries if e["status"] == "done")
+
+
+def _profile_fields(parsed_data: dict, name: str, resume_path: Path) -> dict:
+    return {
+        "skills": parsed_data.get("skills", []),
+        "experience": parsed_data.get("experience_years", 0),
+        "education": parsed_data.get("education", []),
+        "achievements": parsed_data.get("achievements", []),
+        "job_titles": parsed_data.get("job_titles", []),
+        "bio": parsed_data.get("summary", ""),
+        "phone": parsed_data.get("phone", ""),
+        "location": parsed_data.get("location", ""),
+        "certifications": parsed_data.get("certifications", []),
+        "languages": parsed_data.get("languages", []),
+        "projects": parsed_data.get("projects", []),
+        "resume_file": str(resume_path),
+        "resume_filename": Path(name).name,
+        "resume_uploaded_at": datetime.now().isoformat(),
+        "profile_complete": True
+    }
+
+
+class BulkImporter:
+    def __init__(self, source: Path, checkpoint_path: Path, import_id: str = None, on_progress=None):
+        self.source = Path(source)
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.import_id = import_id or str(uuid.uuid4())
+        self.on_progress = on_progress
+        self.executor = ThreadPoolExecutor(max_workers=BULK_WORKERS, thread_name_prefix="bulk-ingest")
+        self.llm_slots = asyncio.Semaphore(BULK_LLM_CONCURRENCY)
+        self.pending = []
+        self.stats = {
+            "total": 0,
+            "skipped": len(self.checkpoint.done),
+            "processed": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "failures": [],
+            "resumes_per_minute": 0.0
+        }
+        self.started = None
+
+    def _fail(self, name: str, error: Exception) -> dict:
+        self.stats["failed"] += 1
+        if len(self.stats["failures"]) < MAX_REPORTED_FAILURES:
+            self.stats["failures"].append({"file": name, "error": str(error)})
+        logger.warning(f"Bulk import {self.import_id}: {name} failed: {error}")
+        return {"file": name, "status": "failed", "error": str(error)}
+
+    async def _process(self, name: str, read_bytes) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            data = await loop.run_in_executor(self.executor, read_bytes)
+            content_hash = sha256_hex(data)
+            resume_path = BULK_RESUME_DIR / f"{content_hash}.pdf"
+            await loop.run_in_executor(self.executor, self._store, resume_path, data)
+
+            text = await loop.run_in_executor(self.executor, extract_text_cached, data, RESUME_TEXT_LIMIT, content_hash)
+            if not text:
+                raise ValueError("Could not extract text from PDF")
+            # Only resumes the local parser cannot handle take an LLM slot;
+            # the tiered parse reuses the local result instead of redoing it
+            parsed_data = await loop.run_in_executor(self.executor, parse_resume_locally, text)
+            if not is_confident(parsed_data):
+                async with self.llm_slots:
+                    parsed_data = await loop.run_in_executor(
+                        self.executor, partial(parse_resume_tiered, text, local=parsed_data)
+                    )
+        except Exception as e:
+            self.checkpoint.record([self._fail(name, e)])
+            return
+
+        self.pending.append((name, content_hash, _profile_fields(parsed_data, name, resume_path)))
+
+    @staticmethod
+    def _store(path: Path, data: bytes) -> None:
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+
+    async def _flush(self) -> None:
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        db = get_database()
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"resume_sha256": content_hash},
+                {
+                    "$set": {**fields, "updated_at": now},
+                    "$setOnInsert": {
+                        "id": str(uuid.uuid4()),
+                        "role": "candidate",
+                        "full_name": Path(name).stem,
+                        "import_id": self.import_id,
+                        "created_at": now
+                    }
+                },
+                upsert=True
+            )
+            for name, content_hash, fields in batch
+        ]
+        await db.users.bulk_write(operations, ordered=False)
+
+        # Keep the skill index, match dirty set and rankings in sync
+        hashes = [content_hash for _, content_hash, _ in batch]
+        async for user in db.users.find({"resume_sha256": {"$in": hashes}}, {"_id": 0, "password": 0}):
+            await on_candidate_saved(user)
+
+        self.checkpoint.record([
+            {"file": name, "status": "done", "resume_sha256": content_hash}
+            for name, content_hash, _ in batch
+        ])
+        self.stats["succeeded"] += len(batch)
+
+    async def _report(self) -> None:
+        elapsed = time.monotonic() - self.started
+        if elapsed > 0:
+            self.stats["resumes_per_minute"] = round(self.stats["processed"] / elapsed * 60, 1)
+        if self.on_progress:
+            await self.on_progress(dict(self.stats))
+
+    async def run(self) -> dict:
+        """Import every file not yet in the checkpoint; returns the final stats"""
+        self.started = time.monotonic()
+        in_flight = set()
+        try:
+            with open_resume_sources(self.source) as sources:
+                self.stats["total"] = len(sources)
+                for name, read_bytes in sources:
+                    if name in self.checkpoint.done:
+                        continue
+                    in_flight.add(asyncio.create_task(self._process(name, read_bytes)))
+                    if len(in_flight) >= BULK_WORKERS:
+                        done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                        self.stats["processed"] += len(done)
+                        if len(self.pending) >= BULK_BATCH_SIZE:
+                            await self._flush()
+                            await self._report()
+                if in_flight:
+                    await asyncio.wait(in_flight)
+                    self.stats["processed"] += len(in_flight)
+                    in_flight = set()
+            await self._flush()
+            await self._report()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+        logger.info(
+            f"Bulk import {self.import_id}: {self.stats['succeeded']} imported, "
+            f"{self.stats['failed']} failed, {self.stats['skipped']} skipped, "
+            f"{self.stats['resumes_per_minute']} resumes/min"
+        )
+        return self.stats
+
+
+_tasks = {}
+
+
+async def _update_import(import_id: str, **fields) -> None:
+    db = get_database()
+    await db.bulk_imports.update_one({"id": import_id}, {"$set": fields})
+
+
+async def _execute(import_doc: dict) -> None:
+    import_id = import_doc["id"]
+
+    async def on_progress(stats: dict) -> None:
+        await _update_import(import_id, **stats)
+
+    try:
+        await _update_import(import_id, status="running", started_at=datetime.utcnow())
+        importer = BulkImporter(import_doc["source"], import_doc["checkpoint"], import_id, on_progress)
+        stats = await importer.run()
+        await _update_import(import_id, status="completed", finished_at=datetime.utcnow(), **stats)
+    except Exception as e:
+        logger.error(f"Bulk import {import_id} failed: {e}")
+        await _update_import(import_id, status="failed", error=str(e), finished_at=datetime.utcnow())
+    finally:
+        _tasks.pop(import_id, None)
+
+
+async def start_bulk_import(source: Path, requested_by: str, import_id: str = None) -> dict:
+    """Register an import of a stored zip or directory and run it in the background"""
+    db = get_database()
+    import_id = import_id or str(uuid.uuid4())
+    import_doc = {
+        "id": import_id,
+        "status": "queued",
+        "source": str(source),
+        "checkpoint": str(BULK_RESUME_DIR / f"{import_id}.checkpoint.jsonl"),
+        "requested_by": requested_by,
+        "created_at": datetime.utcnow()
+    }
+    await db.bulk_imports.insert_one(import_doc)
+    import_doc.pop("_id", None)
+    _tasks[import_id] = asyncio.create_task(_execute(import_doc))
+    return import_doc
+
+
+async def recover_bulk_imports() -> int:
+    """Resume imports interrupted by a restart from their checkpoints"""
+    db = get_database()
+    imports = await db.bulk_imports.find({"status": {"$in": ["queued", "running"]}}, {"_id": 0}).to_list(length=None)
+    for import_doc in imports:
+        _tasks[import_doc["id"]] = asyncio.create_task(_execute(import_doc))
+    if imports:
+        logger.info(f"Resuming {len(imports)} bulk imports")
+    return len(imports)
+
+
+async def get_bulk_import(import_id: str):
+    db = get_database()
+    return await db.bulk_imports.find_one({"id": import_id}, {"_id": 0, "source": 0, "checkpoint": 0})
@@ -0,0 +1,44 @@
+"""
+Write hooks for jobs and candidate profiles.
+
+Routes call these after writing a job or a candidate's skills/experience so
+every derived structure (skill index, search index, recommendation cache,
+match dirty set, materialized rankings, cached session) is kept in sync
+from one place.
+"""
+
+from services.incremental_matching import mark_candidate_dirty, mark_job_dirty
+from services.job_recommendation import get_recommendation_engine
+from services.job_search import index_job_text, remove_job_text
+from services.job_rankings import invalidate_candidate_rankings, invalidate_job_ranking
+from services.skill_index import index_candidate, index_job, remove_job
+from services.scoring_engine import entity_id
+from services.user_sessions import invalidate_user_session
+
+
+async def on_job_saved(job: dict) -> None:
+    """Call after a job is created, imported or updated"""
+    job_id = entity_id(job)
+    index_job(job)
+    index_job_text(job)
+    get_recommendation_engine().job_saved(job)
+    await mark_job_dirty(job_id)
+    await invalidate_job_ranking(job_id)
+
+
+async def on_job_deleted(job_id: str) -> None:
+    """Call after a job is deleted"""
+    remove_job(job_id)
+    remove_job_text(job_id)
+    get_recommendation_engine().job_deleted(job_id)
+    await mark_job_dirty(job_id)
+    await invalidate_job_ranking(job_id)
+
+
+async def on_candidate_saved(user: dict) -> None:
+    """Call after a user's skills or experience change"""
+    user_id = entity_id(user)
+    index_candidate(user)
+    invalidate_user_session(user_id)
+    await mark_candidate_dirty(user_id)
+    invalidate_candidate_rankings(user_id)
@@ -0,0 +1,176 @@
+"""
+Declared MongoDB indexes for every hot query pattern.
+
+``REQUIRED_INDEXES`` lists, per collection, the indexes the routes and
+services rely on. ``ensure_indexes`` (run from the lifespan) creates them;
+``create_indexes`` is idempotent, so this is a no-op once they exist.
+``index_report`` compares the live indexes with the declaration and lists
+the ones missing and the undeclared ones that have never been used.
+The health check only calls ``missing_indexes``, which reads the index
+lists without the ``$indexStats`` aggregation, and fails while any
+required index is missing.
+"""
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from utils.db import get_database
+from utils.logger import get_logger
+
+logger = get_logger("db_indexes")
+
+# Only documents with a string email take part, so imported candidates
+# without one do not collide on null
+_HAS_EMAIL = {"email": {"$type": "string"}}
+
+REQUIRED_INDEXES = {
+    "users": [
+        # get_current_user, profile routes, candidate hydration
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # login / signup
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True, partialFilterExpression=_HAS_EMAIL),
+        # candidate scans for matching, rankings and analytics counts
+        IndexModel([("role", ASCENDING)], name="role"),
+        # bulk import upserts
+        IndexModel([("resume_sha256", ASCENDING)], name="resume_sha256", sparse=True),
+    ],
+    "jobs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # recruiter job lists and counts, newest first
+        IndexModel(
+            [("posted_by", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="posted_by_created_at"
+        ),
+        # active job scans for search, recommendations and matching, and
+        # the newest-first pages of unranked search
+        IndexModel(
+            [("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="status_created_at"
+        ),
+    ],
+    "applications": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # duplicate-application check and the candidate's applications
+        IndexModel([("user_id", ASCENDING), ("job_id", ASCENDING)], name="user_id_job_id"),
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="user_id_created_at"
+        ),
+        # applications for a job or a recruiter's jobs, newest first
+        IndexModel(
+            [("job_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="job_id_created_at"
+        ),
+    ],
+    "matches": [
+        IndexModel([("user_id", ASCENDING), ("job_id", ASCENDING)], name="user_id_job_id"),
+        IndexModel([("job_id", ASCENDING)], name="job_id"),
+    ],
+    "match_edges": [
+        IndexModel([("user_id", ASCENDING), ("job_id", ASCENDING)], name="user_id_job_id"),
+        IndexModel([("job_id", ASCENDING)], name="job_id"),
+    ],
+    "job_rankings": [
+        # a ranking page is a single range read
+        IndexModel(
+            [("job_id", ASCENDING), ("score", DESCENDING), ("user_id", ASCENDING)],
+            name="job_id_score_user_id"
+        ),
+        IndexModel([("job_id", ASCENDING), ("user_id", ASCENDING)], name="job_id_user_id", unique=True),
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+    ],
+    "resume_parse_jobs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING)], name="status"),
+    ],
+    "bulk_imports": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING)], name="status"),
+    ],
+    "match_runs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+}
+
+
+def _key(spec) -> tuple:
+    """Comparable form of an index key, e.g. ``(("job_id", 1), ("score", -1))``"""
+    return tuple((field, int(direction)) for field, direction in dict(spec).items())
+
+
+async def ensure_indexes() -> dict:
+    """Create every declared index; returns the resulting ``index_report``"""
+    db = get_database()
+    for collection, indexes in REQUIRED_INDEXES.items():
+        try:
+            await db[collection].create_indexes(indexes)
+        except Exception as e:
+            # Fall back to one at a time so one bad index (e.g. duplicate
+            # values under a unique key) does not block the others
+            logger.error(f"Error creating indexes on {collection}: {e}")
+            for index in indexes:
+                try:
+                    await db[collection].create_indexes([index])
+                except Exception as e:
+                    logger.error(f"Could not create index {index.document['name']} on {collection}: {e}")
+
+    report = await index_report()
+    if report["missing"]:
+        logger.error(f"Missing required indexes: {report['missing']}")
+    else:
+        logger.info(f"All {sum(len(i) for i in REQUIRED_INDEXES.values())} required indexes present")
+    if report["unused"]:
+        logger.warning(f"Undeclared indexes never used since server start: {report['unused']}")
+    return report
+
+
+async def _index_usage(collection) -> dict:
+    """Index name -> operations since the server started, where supported"""
+    try:
+        stats = await collection.aggregate([{"$indexStats": {}}]).to_list(length=None)
+    except Exception:
+        return {}
+    return {s["name"]: s.get("accesses", {}).get("ops", 0) for s in stats}
+
+
+async def _live_indexes(collection) -> dict:
+    """Index key -> name for the indexes that exist on ``collection``"""
+    live = {}
+    async for index in collection.list_indexes():
+        live[_key(index["key"])] = index["name"]
+    return live
+
+
+def _missing(collection: str, live: dict) -> list:
+    return [
+        f"{collection}.{index.document['name']}"
+        for index in REQUIRED_INDEXES[collection]
+        if _key(index.document["key"]) not in live
+    ]
+
+
+async def missing_indexes() -> list:
+    """Declared indexes not present (``collection.name``), from ``list_indexes`` alone"""
+    db = get_database()
+    missing = []
+    for collection in REQUIRED_INDEXES:
+        missing.extend(_missing(collection, await _live_indexes(db[collection])))
+    return missing
+
+
+async def index_report() -> dict:
+    """
+    ``missing``: declared indexes not present (``collection.name``).
+    ``unused``: present, undeclared and with no recorded use.
+    """
+    db = get_database()
+    missing, unused = [], []
+    for collection, indexes in REQUIRED_INDEXES.items():
+        live = await _live_indexes(db[collection])
+        missing.extend(_missing(collection, live))
+        declared = {_key(index.document["key"]) for index in indexes}
+
+        usage = await _index_usage(db[collection])
+        for key, name in live.items():
+            if name != "_id_" and key not in declared and usage.get(name) == 0:
+                unused.append(f"{collection}.{name}")
+    return {"missing": missing, "unused": unused}
@@ -0,0 +1,323 @@
+"""
+Incremental candidate/job matching.
+
+Scored pairs above the match threshold are persisted in ``match_edges`` (the
+sparse score matrix). Writes to jobs and candidate profiles record the
+changed entity in ``match_dirty``; a run only rescores the dirty rows and
+columns, re-solves the assignment over the persisted edges, and applies the
+difference to ``matches`` with bulk upserts and deletes. Edges scored with a
+different scoring version are rebuilt from scratch.
+
+Per-edge work stays off the event loop: edges and matches are read in
+batches of ``EDGE_BATCH_SIZE``, the matrix build, the solve and the diff
+against ``matches`` run through ``RunContext.compute`` (a worker process for
+background runs), and write operations are built one batch at a time.
+"""
+
+from datetime import datetime
+import uuid
+
+from pymongo import DeleteMany, DeleteOne, InsertOne, UpdateOne
+from scipy import sparse
+
+from services.scoring_engine import SCORING_VERSION, MatchScorer, to_percentage
+from services.skill_index import can_prune, get_skill_index
+from utils.db import get_database
+from utils.graph_utils import solve_assignment
+from utils.logger import get_logger
+
+logger = get_logger("incremental_matching")
+
+MATCH_THRESHOLD = 0.3
+EDGE_BATCH_SIZE = 10000
+SCORE_CHUNK_SIZE = 4096
+
+CANDIDATE = "candidate"
+JOB = "job"
+
+CANDIDATE_PROJECTION = {"_id": 0, "id": 1, "skills": 1, "experience": 1}
+JOB_PROJECTION = {"_id": 0, "id": 1, "required_skills": 1, "min_experience": 1, "max_experience": 1}
+
+
+async def mark_dirty(kind: str, entity_id: str) -> None:
+    """Record that a candidate or job must be rescored on the next run"""
+    db = get_database()
+    await db.match_dirty.update_one(
+        {"_id": f"{kind}:{entity_id}"},
+        {"$set": {"kind": kind, "entity_id": entity_id, "marked_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+async def mark_candidate_dirty(user_id: str) -> None:
+    await mark_dirty(CANDIDATE, user_id)
+
+
+async def mark_job_dirty(job_id: str) -> None:
+    await mark_dirty(JOB, job_id)
+
+
+class RunContext:
+    """
+    Hooks a matching run calls between its phases. The default runs CPU work
+    inline and ignores progress; background runs override all three.
+    """
+
+    async def compute(self, func, *args):
+        return func(*args)
+
+    async def progress(self, **fields) -> None:
+        pass
+
+    async def checkpoint(self) -> None:
+        pass
+
+
+def score_edges(candidates: list, jobs: list) -> tuple:
+    """
+    Score a candidate chunk against jobs; runs in a worker process.
+    Returns the edges and the number of pairs that were actually evaluated.
+    """
+    scorer = MatchScorer(candidates, jobs)
+    edges = list(scorer.edges(threshold=MATCH_THRESHOLD))
+    return edges, scorer.pairs_evaluated
+
+
+def edge_matrix(edges: list) -> tuple:
+    """CSR matrix plus row/column id lists for ``match_edges`` documents"""
+    user_ids, job_ids = [], []
+    user_index, job_index = {}, {}
+    rows, cols, weights = [], [], []
+    for edge in edges:
+        row = user_index.get(edge["user_id"])
+        if row is None:
+            row = user_index[edge["user_id"]] = len(user_ids)
+            user_ids.append(edge["user_id"])
+        col = job_index.get(edge["job_id"])
+        if col is None:
+            col = job_index[edge["job_id"]] = len(job_ids)
+            job_ids.append(edge["job_id"])
+        rows.append(row)
+        cols.append(col)
+        weights.append(edge["weight"])
+
+    matrix = sparse.csr_matrix((weights, (rows, cols)), shape=(len(user_ids), len(job_ids)))
+    return matrix, user_ids, job_ids
+
+
+def solve_edges(edges: list, capacity: int) -> list:
+    """
+    Solve the assignment over ``match_edges`` documents; runs in a worker
+    process. Returns ``[(user_id, job_id, weight)]``.
+    """
+    matrix, user_ids, job_ids = edge_matrix(edges)
+    solution = solve_assignment(matrix, capacity=capacity, threshold=MATCH_THRESHOLD)
+    return [(user_ids[row], job_ids[col], weight) for row, col, weight in solution]
+
+
+def diff_matches(existing: list, assignment: list) -> tuple:
+    """
+    Compare the new assignment with the ``matches`` documents; runs in a
+    worker process. Returns the ``(user_id, job_id, weight)`` rows to upsert
+    and the ``_id`` of the matches to delete.
+    """
+    current = {(match.get("user_id"), match.get("job_id")): match for match in existing}
+    upserts = []
+    for user_id, job_id, weight in assignment:
+        match = current.pop((user_id, job_id), None)
+        if (
+            match is not None
+            and match.get("graph_edge_weight") == weight
+            and match.get("scoring_version") == SCORING_VERSION
+        ):
+            continue
+        upserts.append((user_id, job_id, weight))
+    return upserts, [match["_id"] for match in current.values()]
+
+
+async def _score_edges(ctx: RunContext, candidates: list, jobs: list, progress: dict) -> list:
+    """Score candidates against jobs chunk by chunk, reporting progress in between"""
+    edges = []
+    if not jobs:
+        return edges
+    for start in range(0, len(candidates), SCORE_CHUNK_SIZE):
+        await ctx.checkpoint()
+        chunk = candidates[start:start + SCORE_CHUNK_SIZE]
+        chunk_edges, evaluated = await ctx.compute(score_edges, chunk, jobs)
+        edges.extend(chunk_edges)
+        progress["pairs_scored"] += len(chunk) * len(jobs)
+        progress["pairs_evaluated"] += evaluated
+        await ctx.progress(pairs_scored=progress["pairs_scored"])
+    return edges
+
+
+async def _read_all(cursor) -> list:
+    """Read a cursor in ``EDGE_BATCH_SIZE`` batches, yielding to the loop in between"""
+    docs = []
+    while True:
+        batch = await cursor.to_list(length=EDGE_BATCH_SIZE)
+        if not batch:
+            return docs
+        docs.extend(batch)
+
+
+async def _write_batches(collection, rows: list, to_operation) -> None:
+    """Bulk write ``to_operation(row)`` for ``rows``, building one batch at a time"""
+    for start in range(0, len(rows), EDGE_BATCH_SIZE):
+        await collection.bulk_write(
+            [to_operation(row) for row in rows[start:start + EDGE_BATCH_SIZE]],
+            ordered=False
+        )
+
+
+def _edge_insert(edge: tuple) -> InsertOne:
+    user_id, job_id, weight = edge
+    return InsertOne({"user_id": user_id, "job_id": job_id, "weight": weight})
+
+
+async def _rescore_edges(db, ctx: RunContext, rebuild: bool) -> dict:
+    """Bring ``match_edges`` up to date and return what was rescored"""
+    state = await db.match_state.find_one({"_id": "edges"})
+    dirty = await db.match_dirty.find().to_list(length=None)
+    active_jobs = {"status": "active"}
+    progress = {"pairs_scored": 0, "pairs_evaluated": 0}
+
+    if rebuild or not state or state.get("scoring_version") != SCORING_VERSION:
+        candidates = await db.users.find({"role": CANDIDATE}, CANDIDATE_PROJECTION).to_list(length=None)
+        jobs = await db.jobs.find(active_jobs, JOB_PROJECTION).to_list(length=None)
+        await ctx.progress(phase="scoring", pairs_total=len(candidates) * len(jobs))
+        deletes = [DeleteMany({})]
+        edges = await _score_edges(ctx, candidates, jobs, progress)
+        stats = {
+            "mode": "full",
+            "rescored_candidates": len(candidates),
+            "rescored_jobs": len(jobs)
+        }
+    else:
+        dirty_candidates = [d["entity_id"] for d in dirty if d["kind"] == CANDIDATE]
+        dirty_jobs = [d["entity_id"] for d in dirty if d["kind"] == JOB]
+
+        # Dirty rows against the active jobs, and dirty columns against the
+        # candidates not already rescored; deleted or closed jobs lose their
+        # edges. The skill index narrows both sides to entities sharing a skill.
+        index = get_skill_index()
+        prune = can_prune(MATCH_THRESHOLD)
+        row_candidates, row_jobs, column_candidates, column_jobs = [], [], [], []
+        if dirty_candidates:
+            row_candidates = await db.users.find(
+                {"id": {"$in": dirty_candidates}, "role": CANDIDATE}, CANDIDATE_PROJECTION
+            ).to_list(length=None)
+            job_filter = dict(active_jobs)
+            if prune:
+                skills = [s for c in row_candidates for s in c.get("skills", [])]
+                job_filter["id"] = {"$in": list(index.jobs_for_skills(skills))}
+            row_jobs = await db.jobs.find(job_filter, JOB_PROJECTION).to_list(length=None)
+        if dirty_jobs:
+            column_jobs = await db.jobs.find(
+                {**active_jobs, "id": {"$in": dirty_jobs}}, JOB_PROJECTION
+            ).to_list(length=None)
+            candidate_filter = {"role": CANDIDATE, "id": {"$nin": dirty_candidates}}
+            if prune:
+                skills = [s for j in column_jobs for s in j.get("required_skills", [])]
+                candidate_filter["id"]["$in"] = list(index.candidates_for_skills(skills))
+            column_candidates = await db.users.find(candidate_filter, CANDIDATE_PROJECTION).to_list(length=None)
+
+        await ctx.progress(
+            phase="scoring",
+            pairs_total=len(row_candidates) * len(row_jobs) + len(column_candidates) * len(column_jobs)
+        )
+        deletes = []
+        if dirty_jobs:
+            deletes.append(DeleteMany({"job_id": {"$in": dirty_jobs}}))
+        if dirty_candidates:
+            deletes.append(DeleteMany({"user_id": {"$in": dirty_candidates}}))
+        edges = await _score_edges(ctx, row_candidates, row_jobs, progress)
+        edges.extend(await _score_edges(ctx, column_candidates, column_jobs, progress))
+        stats = {
+            "mode": "incremental",
+            "rescored_candidates": len(dirty_candidates),
+            "rescored_jobs": len(dirty_jobs)
+        }
+
+    # Nothing has been written so far, so a cancelled run leaves the edges intact
+    await ctx.checkpoint()
+    await ctx.progress(phase="writing_edges")
+    if deletes:
+        await db.match_edges.bulk_write(deletes)
+    await _write_batches(db.match_edges, edges, _edge_insert)
+    stats["pairs_scored"] = progress["pairs_scored"]
+    stats["pairs_evaluated"] = progress["pairs_evaluated"]
+
+    await db.match_state.update_one(
+        {"_id": "edges"},
+        {"$set": {"updated_at": datetime.utcnow(), "scoring_version": SCORING_VERSION}},
+        upsert=True
+    )
+
+    # Only clear the marks that were consumed; writes during the run stay dirty
+    if dirty:
+        await db.match_dirty.bulk_write([
+            DeleteOne({"_id": d["_id"], "marked_at": d["marked_at"]}) for d in dirty
+        ])
+
+    return stats
+
+
+async def _apply_matches(db, ctx: RunContext, assignment: list) -> dict:
+    """Diff the new assignment against ``matches`` and apply it in bulk"""
+    existing = await _read_all(
+        db.matches.find({}, {"_id": 1, "user_id": 1, "job_id": 1, "graph_edge_weight": 1, "scoring_version": 1})
+    )
+    upserts, stale_ids = await ctx.compute(diff_matches, existing, assignment)
+
+    now = datetime.utcnow()
+
+    def upsert(row: tuple) -> UpdateOne:
+        user_id, job_id, weight = row
+        return UpdateOne(
+            {"user_id": user_id, "job_id": job_id},
+            {
+                "$set": {
+                    "match_score": to_percentage(weight),
+                    "graph_edge_weight": weight,
+                    "scoring_version": SCORING_VERSION,
+                    "updated_at": now
+                },
+                "$setOnInsert": {
+                    "id": str(uuid.uuid4()),
+                    "status": "pending",
+                    "created_at": now
+                }
+            },
+            upsert=True
+        )
+
+    await _write_batches(db.matches, upserts, upsert)
+    await _write_batches(db.matches, stale_ids, lambda match_id: DeleteOne({"_id": match_id}))
+    return {"matches_upserted": len(upserts), "matches_deleted": len(stale_ids)}
+
+
+async def run_incremental_matching(capacity: int = 1, rebuild: bool = False, ctx: RunContext = None) -> dict:
+    """
+    Rescore dirty candidates/jobs, re-solve the assignment and update ``matches``.
+    Set ``rebuild`` to rescore every pair from scratch.
+    """
+    db = get_database()
+    ctx = ctx or RunContext()
+
+    stats = await _rescore_edges(db, ctx, rebuild)
+    logger.info(
+        f"Match edges updated ({stats['mode']}): {stats['rescored_candidates']} candidates, "
+        f"{stats['rescored_jobs']} jobs, {stats['pairs_scored']} pairs scored"
+    )
+
+    await ctx.checkpoint()
+    await ctx.progress(phase="solving")
+    edges = await _read_all(db.match_edges.find({}, {"_id": 0, "user_id": 1, "job_id": 1, "weight": 1}))
+    assignment = await ctx.compute(solve_edges, edges, capacity)
+
+    await ctx.checkpoint()
+    await ctx.progress(phase="writing_matches")
+    stats.update(await _apply_matches(db, ctx, assignment))
+    stats["total_matches"] = len(assignment)
+    return stats
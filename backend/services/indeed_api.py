@@ -8,6 +8,7 @@ import requests
 import json
 from typing import Dict, List, Optional
 from utils.logger import get_logger
+from services.skill_matcher import canonicalize_skills, find_skills
 
 # Get logger
 logger = get_logger("indeed_api")
@@ -225,11 +226,10 @@ def import_job_to_platform(job_data: Dict) -> Dict:
     """
     skills = []
     if "skills" in job_data:
-        skills = job_data.get("skills", [])
+        skills = canonicalize_skills(job_data.get("skills", []))
     elif "requirements" in job_data:
         # Try to extract skills from requirements text
-        from services.job_recommendation import extract_skills_from_text
-        skills = extract_skills_from_text(job_data.get("requirements", ""))
+        skills = find_skills(job_data.get("requirements", ""))
     
     formatted_job = {
         "title": job_data.get("title", ""),
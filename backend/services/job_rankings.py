@@ -0,0 +1,206 @@
+"""
+Materialized per-job candidate rankings.
+
+``job_rankings`` holds one row per (job, candidate) that passes the 30%
+cutoff, with the score and matched skills, indexed by
+``(job_id, score desc, user_id)`` (see ``services.db_indexes``) so a ranking
+page is a single range read.
+Rows are rebuilt for one job when its skills or experience bounds change,
+and for one candidate across the jobs sharing a skill when the profile
+changes. ``job_ranking_state`` records which jobs have been materialized and
+with which scoring version; jobs without current state are built on first read.
+
+Every write to a job's rows, from either kind of rebuild, holds that job's
+lock, so a job rebuild and a candidate rebuild never interleave on the same
+job. A candidate rebuild takes the locks of all the jobs it touches, in
+sorted order. Lock entries are dropped once nobody holds or waits on them.
+"""
+
+import asyncio
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import datetime
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+from services.ranking_engine import RANKING_PROJECTION, hydrate_ranked_candidates, score_candidate_for_job
+from services.scoring_engine import SCORING_VERSION, job_features
+from services.skill_index import can_prune, get_skill_index
+from utils.db import get_database
+from utils.logger import get_logger
+
+logger = get_logger("job_rankings")
+
+RANKING_CUTOFF = 30
+JOB_PROJECTION = {"_id": 0, "id": 1, "required_skills": 1, "min_experience": 1, "max_experience": 1, "status": 1}
+
+# job id -> [lock, holders and waiters]
+_job_locks = {}
+_background_tasks = set()
+
+
+@asynccontextmanager
+async def _job_lock(job_id: str):
+    entry = _job_locks.get(job_id)
+    if entry is None:
+        entry = _job_locks[job_id] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _job_locks[job_id]
+
+
+def _row_update(job_id: str, user_id: str, score: int, matched_skills: set, build_id: str, now) -> UpdateOne:
+    return UpdateOne(
+        {"job_id": job_id, "user_id": user_id},
+        {"$set": {
+            "score": score,
+            "matched_skills": sorted(matched_skills),
+            "scoring_version": SCORING_VERSION,
+            "build_id": build_id,
+            "updated_at": now
+        }},
+        upsert=True
+    )
+
+
+async def _rebuild_job_ranking_locked(job_id: str) -> int:
+    db = get_database()
+    job = await db.jobs.find_one({"id": job_id}, JOB_PROJECTION)
+    if not job or job.get("status") != "active":
+        await db.job_rankings.delete_many({"job_id": job_id})
+        await db.job_ranking_state.delete_one({"_id": job_id})
+        return 0
+
+    query = {"role": "candidate"}
+    if can_prune(RANKING_CUTOFF / 100):
+        query["id"] = {"$in": list(get_skill_index().candidates_for_skills(job.get("required_skills", [])))}
+
+    build_id = str(uuid.uuid4())
+    now = datetime.utcnow()
+    features = job_features(job)
+    operations = []
+    async for candidate in db.users.find(query, RANKING_PROJECTION):
+        score, matched = score_candidate_for_job(candidate, job, features)
+        if score > RANKING_CUTOFF:
+            operations.append(_row_update(job_id, candidate["id"], score, matched, build_id, now))
+
+    if operations:
+        await db.job_rankings.bulk_write(operations, ordered=False)
+    await db.job_rankings.delete_many({"job_id": job_id, "build_id": {"$ne": build_id}})
+    await db.job_ranking_state.update_one(
+        {"_id": job_id},
+        {"$set": {"built_at": now, "rows": len(operations), "scoring_version": SCORING_VERSION}},
+        upsert=True
+    )
+    return len(operations)
+
+
+async def rebuild_job_ranking(job_id: str) -> int:
+    """Recompute every ranking row for one job; returns the number of rows"""
+    async with _job_lock(job_id):
+        return await _rebuild_job_ranking_locked(job_id)
+
+
+async def rebuild_candidate_rankings(user_id: str) -> int:
+    """Recompute one candidate's rows across every active job sharing a skill"""
+    db = get_database()
+    projection = {**RANKING_PROJECTION, "role": 1}
+    candidate = await db.users.find_one({"id": user_id}, projection)
+
+    # Jobs that may gain a row, plus jobs holding one that may have to go
+    query = {"status": "active"}
+    if candidate and candidate.get("role") == "candidate":
+        if can_prune(RANKING_CUTOFF / 100):
+            query["id"] = {"$in": list(get_skill_index().jobs_for_skills(candidate.get("skills", [])))}
+        job_ids = {job["id"] async for job in db.jobs.find(query, {"_id": 0, "id": 1})}
+    else:
+        job_ids = set()
+    job_ids.update(await db.job_rankings.distinct("job_id", {"user_id": user_id}))
+
+    async with AsyncExitStack() as stack:
+        for job_id in sorted(job_ids):
+            await stack.enter_async_context(_job_lock(job_id))
+
+        # Read again under the locks so the rows written are current
+        candidate = await db.users.find_one({"id": user_id}, projection)
+        if not candidate or candidate.get("role") != "candidate":
+            await db.job_rankings.delete_many({"user_id": user_id, "job_id": {"$in": list(job_ids)}})
+            return 0
+
+        now = datetime.utcnow()
+        build_id = str(uuid.uuid4())
+        operations, kept = [], []
+        async for job in db.jobs.find({**query, "id": {"$in": list(job_ids)}}, JOB_PROJECTION):
+            score, matched = score_candidate_for_job(candidate, job)
+            if score > RANKING_CUTOFF:
+                operations.append(_row_update(job["id"], user_id, score, matched, build_id, now))
+                kept.append(job["id"])
+
+        if operations:
+            await db.job_rankings.bulk_write(operations, ordered=False)
+        await db.job_rankings.delete_many({
+            "user_id": user_id,
+            "job_id": {"$in": list(job_ids - set(kept))}
+        })
+        return len(operations)
+
+
+def _run_in_background(coro, description: str) -> None:
+    async def runner():
+        try:
+            await coro
+        except Exception as e:
+            logger.error(f"Error rebuilding rankings for {description}: {e}")
+
+    task = asyncio.create_task(runner())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def invalidate_job_ranking(job_id: str) -> None:
+    """Mark a job's ranking stale and rebuild it in the background"""
+    db = get_database()
+    await db.job_ranking_state.delete_one({"_id": job_id})
+    _run_in_background(rebuild_job_ranking(job_id), f"job {job_id}")
+
+
+async def wait_for_background_rebuilds() -> None:
+    """Wait for queued ranking rebuilds; for scripts that exit after writing"""
+    while _background_tasks:
+        await asyncio.gather(*list(_background_tasks), return_exceptions=True)
+
+
+def invalidate_candidate_rankings(user_id: str) -> None:
+    """Rebuild a candidate's ranking rows in the background"""
+    _run_in_background(rebuild_candidate_rankings(user_id), f"candidate {user_id}")
+
+
+async def get_job_ranking(job_id: str, limit: int = 20, skip: int = 0) -> tuple:
+    """
+    Read one page of a job's materialized ranking, building it first if needed.
+    Returns ``(ranked_page, total)``.
+    """
+    db = get_database()
+    current = {"_id": job_id, "scoring_version": SCORING_VERSION}
+    if not await db.job_ranking_state.find_one(current):
+        # Concurrent first reads wait for one build instead of each running one
+        async with _job_lock(job_id):
+            if not await db.job_ranking_state.find_one(current):
+                await _rebuild_job_ranking_locked(job_id)
+
+    cursor = db.job_rankings.find(
+        {"job_id": job_id},
+        {"_id": 0, "user_id": 1, "score": 1, "matched_skills": 1}
+    ).sort([("score", DESCENDING), ("user_id", ASCENDING)]).skip(skip).limit(limit)
+    rows = await cursor.to_list(length=limit)
+    total = await db.job_rankings.count_documents({"job_id": job_id})
+
+    ranked = await hydrate_ranked_candidates(
+        [(row["user_id"], row["score"], row["matched_skills"]) for row in rows]
+    )
+    return ranked, total
@@ -1,50 +1,254 @@
+"""
+Job recommendations for candidates.
+
+Active jobs are held in an in-memory catalog that is loaded once and kept in
+sync by the job write hooks, so recommendations consider every active job
+without scanning the collection per request. Each user's top recommendations
+are cached (TTL + LRU) under a key that includes the scoring version and a
+version of their skills and experience. A job write only updates the
+catalog and bumps its version; a cached entry is brought up to date with
+the jobs written since it was computed the next time it is read, so a write
+costs the same however many users are cached. Later pages, after a
+``(match_score, id)`` cursor, are ranked from the catalog on demand and not
+cached.
+"""
+
+import hashlib
+import heapq
+import time
+
+from cachetools import TTLCache
+
+from services.scoring_engine import (
+    SCORING_VERSION,
+    candidate_features,
+    get_scoring_function,
+    job_features,
+    to_percentage,
+)
+from services.skill_index import can_prune, get_skill_index
 from utils.db import get_database
+from utils.logger import get_logger
+
+logger = get_logger("job_recommendation")
+
+TOP_N = 10
+# One more than a page, so the cached first page knows whether more follow
+CACHED_RESULTS = TOP_N + 1
+CACHE_MAX_USERS = 10000
+CACHE_TTL_SECONDS = 600
+CATALOG_REFRESH_SECONDS = 900
+# Past this many distinct job writes the cache is dropped instead of patched
+MAX_TRACKED_CHANGES = 1000
 
-async def get_recommendations_for_user(user: dict) -> list:
+
+def profile_version(user: dict) -> str:
+    """Stable hash of the profile fields that affect recommendations"""
+    skills = sorted(set(skill.lower() for skill in user.get("skills", [])))
+    raw = "|".join(skills) + f"#{user.get('experience', 0)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def score_job_for_user(user: tuple, job: tuple):
     """
-    Generate job recommendations using skill matching
+    Return ``(match_percentage, matched_skills)`` for precomputed
+    ``candidate_features`` and ``job_features``
     """
-    db = get_database()
-    
-    user_skills = set([skill.lower() for skill in user.get("skills", [])])
-    user_experience = user.get("experience", 0)
-    
-    # Get all active jobs
-    all_jobs = await db.jobs.find({"status": "active"}).to_list(length=100)
-    
-    # Calculate match scores
-    scored_jobs = []
-    for job in all_jobs:
-        job_skills = set([skill.lower() for skill in job.get("required_skills", [])])
-        
-        # Calculate skill overlap
-        skill_intersection = user_skills & job_skills
-        skill_match_score = len(skill_intersection) / len(job_skills) if job_skills else 0
-        
-        # Calculate experience fit
-        min_exp = job.get("min_experience", 0)
-        max_exp = job.get("max_experience", 100)
-        
-        if min_exp <= user_experience <= max_exp:
-            exp_score = 1.0
-        elif user_experience < min_exp:
-            exp_score = max(0, 1 - (min_exp - user_experience) * 0.2)
+    weight, matched = get_scoring_function().score(*user, *job)
+    return to_percentage(weight), matched
+
+
+def _serialize_job(job: dict) -> dict:
+    job = {k: v for k, v in job.items() if k != "_id"}
+    job["id"] = job.get("id") or str(job.get("_id"))
+    if "posted_by" in job:
+        job["posted_by"] = str(job["posted_by"])
+    return job
+
+
+def _rank_key(job: dict) -> tuple:
+    return (-job["match_score"], job["id"])
+
+
+class CachedRecommendations:
+    """Top recommendations for one user plus what is needed to patch them"""
+    __slots__ = ("features", "jobs", "version")
+
+    def __init__(self, features: tuple, jobs: list, version: int):
+        self.features = features
+        self.jobs = jobs
+        self.version = version
+
+
+class RecommendationEngine:
+    def __init__(self):
+        self.catalog = {}
+        self.features = {}
+        self.catalog_loaded_at = None
+        # Catalog version and, per written job, the version of its last write
+        self.version = 0
+        self.changed = {}
+        self.cache = TTLCache(maxsize=CACHE_MAX_USERS, ttl=CACHE_TTL_SECONDS)
+        self.hits = 0
+        self.misses = 0
+
+    async def load_catalog(self) -> None:
+        """(Re)load every active job into memory and drop cached results"""
+        db = get_database()
+        catalog = {}
+        features = {}
+        async for job in db.jobs.find({"status": "active"}):
+            job = _serialize_job(job)
+            catalog[job["id"]] = job
+            features[job["id"]] = job_features(job)
+        self.catalog = catalog
+        self.features = features
+        self.catalog_loaded_at = time.monotonic()
+        self.cache.clear()
+        self.changed.clear()
+        logger.info(f"Recommendation catalog loaded with {len(catalog)} active jobs")
+
+    def _catalog_is_stale(self) -> bool:
+        return (
+            self.catalog_loaded_at is None
+            or time.monotonic() - self.catalog_loaded_at > CATALOG_REFRESH_SECONDS
+        )
+
+    def _compute(self, user: tuple, after: tuple = None) -> list:
+        """The ``CACHED_RESULTS`` best jobs, after the ``(match_score, id)`` key if given"""
+        if can_prune(0.3):
+            job_ids = get_skill_index().jobs_for_skills(user[0])
         else:
-            exp_score = max(0, 1 - (user_experience - max_exp) * 0.1)
-        
-        # Combined score (70% skills, 30% experience)
-        total_score = (skill_match_score * 0.7) + (exp_score * 0.3)
-        match_percentage = int(total_score * 100)
-        
-        if match_percentage > 30:  # Only include jobs with >30% match
-            job["id"] = str(job["_id"])
-            del job["_id"]
-            job["posted_by"] = str(job["posted_by"])
-            job["match_score"] = match_percentage
-            job["matched_skills"] = list(skill_intersection)
-            scored_jobs.append(job)
-    
-    # Sort by match score
-    scored_jobs.sort(key=lambda x: x["match_score"], reverse=True)
-    
-    return scored_jobs[:10]  # Return top 10
+            job_ids = self.catalog.keys()
+
+        after_key = (-after[0], after[1]) if after is not None else None
+        scored_jobs = []
+        for job_id in job_ids:
+            job = self.catalog.get(job_id)
+            if job is None:
+                continue
+            match_percentage, matched = score_job_for_user(user, self.features[job_id])
+            if match_percentage > 30:  # Only include jobs with >30% match
+                if after_key is not None and (-match_percentage, job_id) <= after_key:
+                    continue
+                scored_jobs.append({**job, "match_score": match_percentage, "matched_skills": list(matched)})
+
+        # Best first by match score, then id
+        return heapq.nsmallest(CACHED_RESULTS, scored_jobs, key=_rank_key)
+
+    async def get(self, user: dict, after: tuple = None) -> tuple:
+        """
+        One page of up to ``TOP_N`` recommendations, after the
+        ``(match_score, id)`` cursor position if given. Returns
+        ``(page, has_more)``; only the first page is cached.
+        """
+        if self._catalog_is_stale():
+            await self.load_catalog()
+
+        if after is not None:
+            jobs = self._compute(candidate_features(user), after)
+            return jobs[:TOP_N], len(jobs) > TOP_N
+
+        key = (SCORING_VERSION, user["id"], profile_version(user))
+        entry = self.cache.get(key)
+        if entry is not None and self._catch_up(entry):
+            self.hits += 1
+        else:
+            self.misses += 1
+            features = candidate_features(user)
+            entry = CachedRecommendations(features, self._compute(features), self.version)
+            self.cache[key] = entry
+        jobs = entry.jobs
+        return jobs[:TOP_N], len(jobs) > TOP_N
+
+    def _catch_up(self, entry: CachedRecommendations) -> bool:
+        """
+        Patch ``entry`` with the jobs written since it was computed. Returns
+        False when it has to be recomputed instead.
+        """
+        if entry.version == self.version:
+            return True
+        # Most recent writes last; stop at the first one the entry has seen
+        written = []
+        for job_id, version in reversed(self.changed.items()):
+            if version <= entry.version:
+                break
+            written.append(job_id)
+
+        jobs = entry.jobs
+        for job_id in written:
+            listed = any(j["id"] == job_id for j in jobs)
+            features = self.features.get(job_id)
+            if listed:
+                if features is None and len(jobs) < CACHED_RESULTS:
+                    # Every qualifying job was listed, so dropping one is exact
+                    jobs = [j for j in jobs if j["id"] != job_id]
+                    continue
+                # The job may now rank below jobs that were cut off
+                return False
+            if features is None:
+                continue
+            match_percentage, matched = score_job_for_user(entry.features, features)
+            if match_percentage <= 30:
+                continue
+            scored = {**self.catalog[job_id], "match_score": match_percentage, "matched_skills": list(matched)}
+            if len(jobs) == CACHED_RESULTS and _rank_key(scored) >= _rank_key(jobs[-1]):
+                continue
+            jobs = sorted(jobs + [scored], key=_rank_key)[:CACHED_RESULTS]
+
+        entry.jobs = jobs
+        entry.version = self.version
+        return True
+
+    def _record_change(self, job_id: str) -> None:
+        if len(self.changed) >= MAX_TRACKED_CHANGES:
+            # Cheaper to recompute on demand than to keep an unbounded log
+            self.cache.clear()
+            self.changed.clear()
+        self.version += 1
+        self.changed.pop(job_id, None)
+        self.changed[job_id] = self.version
+
+    def job_saved(self, job: dict) -> None:
+        """Apply a created or updated job to the catalog; cached results catch up when read"""
+        job = _serialize_job(job)
+        job_id = job["id"]
+        if job.get("status") != "active":
+            self.job_deleted(job_id)
+            return
+        self.catalog[job_id] = job
+        self.features[job_id] = job_features(job)
+        self._record_change(job_id)
+
+    def job_deleted(self, job_id: str) -> None:
+        """Drop a deleted or closed job from the catalog; cached results catch up when read"""
+        self.catalog.pop(job_id, None)
+        self.features.pop(job_id, None)
+        self._record_change(job_id)
+
+    def stats(self) -> dict:
+        return {
+            "cached_users": len(self.cache),
+            "catalog_jobs": len(self.catalog),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+_engine = None
+
+
+def get_recommendation_engine() -> RecommendationEngine:
+    """Get the global recommendation engine"""
+    global _engine
+    if _engine is None:
+        _engine = RecommendationEngine()
+    return _engine
+
+
+async def get_recommendations_for_user(user: dict, after: tuple = None) -> tuple:
+    """
+    Generate job recommendations using skill matching.
+    Returns ``(page, has_more)``.
+    """
+    return await get_recommendation_engine().get(user, after)
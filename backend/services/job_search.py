@@ -0,0 +1,260 @@
+"""
+In-process full-text search over active jobs.
+
+Titles, descriptions, required skills and company names are tokenized,
+stop words dropped and tokens reduced by a light suffix stemmer, then kept
+in an inverted index (term -> job -> weighted term frequency). Queries are
+ranked with BM25; title and skill matches count more than description
+matches. Skill and location filters are applied inside the index, so a page
+of results is computed without touching Mongo, which only hydrates the ids.
+
+Pages are ordered by ``(-score, job id)`` and continued with an opaque
+``utils.pagination`` cursor holding the last ``(score, id)`` seen. The index is built at startup
+and kept in sync by ``services.change_hooks``.
+"""
+
+import math
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+from services.scoring_engine import entity_id, normalize_skill
+from utils.db import get_database
+from utils.logger import get_logger
+
+logger = get_logger("job_search")
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+FIELD_WEIGHTS = {"title": 3, "required_skills": 2, "company": 1, "description": 1}
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the "
+    "to was were will with we you your our this they their".split()
+)
+
+
+@lru_cache(maxsize=100000)
+def stem(token: str) -> str:
+    """Light suffix stripping so plural and -ing/-ed forms share a term"""
+    if not token.isalpha() or len(token) <= 3:
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith(("sses", "shes", "ches", "xes", "zes")):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+    for suffix in ("ing", "ed"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[:-len(suffix)]
+            if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "lsz":
+                token = token[:-1]
+            break
+    if token.endswith("e") and len(token) > 4:
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list:
+    return [stem(token) for token in _TOKEN_RE.findall((text or "").lower()) if token not in STOP_WORDS]
+
+
+def _job_terms(job: dict) -> dict:
+    """Weighted term frequencies of a job's searchable fields"""
+    terms = defaultdict(int)
+    for field, weight in FIELD_WEIGHTS.items():
+        value = job.get(field) or ""
+        if isinstance(value, list):
+            value = " ".join(str(v) for v in value)
+        for term in tokenize(value):
+            terms[term] += weight
+    return terms
+
+
+class JobSearchIndex:
+    """
+    Postings are kept as dicts for cheap updates and compiled per term into
+    NumPy arrays on first use after a change, so scoring a query is a few
+    vectorized adds over a dense score array indexed by job slot.
+    """
+
+    def __init__(self):
+        self.slot_of = {}
+        self.ids = []
+        self.free_slots = []
+        self.lengths = np.zeros(0)
+        self.postings = defaultdict(dict)
+        self.compiled = {}
+        self.doc_terms = {}
+        self.doc_skills = {}
+        self.doc_location = {}
+        self.skill_slots = defaultdict(set)
+        self.location_slots = defaultdict(set)
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def _allocate(self, job_id: str) -> int:
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.ids[slot] = job_id
+        else:
+            slot = len(self.ids)
+            self.ids.append(job_id)
+            if slot >= len(self.lengths):
+                self.lengths = np.concatenate([self.lengths, np.zeros(max(1024, len(self.lengths)))])
+        self.slot_of[job_id] = slot
+        return slot
+
+    def add(self, job: dict) -> None:
+        """Index or re-index a job; inactive jobs are dropped"""
+        job_id = entity_id(job)
+        self.remove(job_id)
+        if job.get("status") != "active":
+            return
+        slot = self._allocate(job_id)
+        terms = _job_terms(job)
+        for term, tf in terms.items():
+            self.postings[term][slot] = tf
+            self.compiled.pop(term, None)
+        self.doc_terms[slot] = tuple(terms)
+        self.lengths[slot] = sum(terms.values())
+        self.total_length += self.lengths[slot]
+
+        skills = frozenset(normalize_skill(s) for s in job.get("required_skills") or [])
+        location = (job.get("location") or "").lower()
+        self.doc_skills[slot] = skills
+        self.doc_location[slot] = location
+        for skill in skills:
+            self.skill_slots[skill].add(slot)
+        self.location_slots[location].add(slot)
+
+    def remove(self, job_id: str) -> None:
+        slot = self.slot_of.pop(job_id, None)
+        if slot is None:
+            return
+        for term in self.doc_terms.pop(slot):
+            docs = self.postings[term]
+            docs.pop(slot, None)
+            self.compiled.pop(term, None)
+            if not docs:
+                del self.postings[term]
+        for skill in self.doc_skills.pop(slot):
+            self.skill_slots[skill].discard(slot)
+            if not self.skill_slots[skill]:
+                del self.skill_slots[skill]
+        location = self.doc_location.pop(slot)
+        self.location_slots[location].discard(slot)
+        if not self.location_slots[location]:
+            del self.location_slots[location]
+        self.total_length -= self.lengths[slot]
+        self.lengths[slot] = 0
+        self.ids[slot] = None
+        self.free_slots.append(slot)
+
+    def _postings_array(self, term: str):
+        arrays = self.compiled.get(term)
+        if arrays is None:
+            docs = self.postings[term]
+            arrays = (
+                np.fromiter(docs.keys(), dtype=np.int64, count=len(docs)),
+                np.fromiter(docs.values(), dtype=np.float64, count=len(docs))
+            )
+            self.compiled[term] = arrays
+        return arrays
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score per job slot, rounded so cursors compare exactly; 0 means no match"""
+        scores = np.zeros(len(self.ids))
+        n_docs = len(self.slot_of)
+        if not n_docs:
+            return scores
+        avg_length = self.total_length / n_docs
+        for term in set(tokenize(query)):
+            if term not in self.postings:
+                continue
+            slots, tfs = self._postings_array(term)
+            idf = math.log(1 + (n_docs - len(slots) + 0.5) / (len(slots) + 0.5))
+            norm = K1 * (1 - B + B * self.lengths[slots] / avg_length)
+            scores[slots] += idf * tfs * (K1 + 1) / (tfs + norm)
+        return np.round(scores, 6)
+
+    def _slots_mask(self, slots, size: int) -> np.ndarray:
+        mask = np.zeros(size, dtype=bool)
+        if slots:
+            mask[np.fromiter(slots, dtype=np.int64, count=len(slots))] = True
+        return mask
+
+    def search(self, query: str, skills: list = None, location: str = None, after: tuple = None, limit: int = 20) -> tuple:
+        """
+        One page of ``(score, job_id)`` best first, after the ``(score, id)``
+        cursor position if given. Returns ``(page, has_more)``.
+        """
+        scores = self.scores(query)
+        mask = scores > 0
+        if skills:
+            matching = set()
+            for skill in skills:
+                matching |= self.skill_slots.get(normalize_skill(skill), set())
+            mask &= self._slots_mask(matching, len(scores))
+        if location:
+            location = location.lower()
+            matching = set()
+            for name, slots in self.location_slots.items():
+                if location in name:
+                    matching |= slots
+            mask &= self._slots_mask(matching, len(scores))
+        if after is not None:
+            after_score, after_id = after
+            ties = [
+                slot for slot in np.flatnonzero(mask & (scores == after_score))
+                if self.ids[slot] > after_id
+            ]
+            mask &= scores < after_score
+            mask[ties] = True
+
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > limit + 1:
+            # Keep everything scoring at least the (limit+1)-th best, ties included
+            cut = len(candidates) - (limit + 1)
+            kth = np.partition(scores[candidates], cut)[cut]
+            candidates = candidates[scores[candidates] >= kth]
+        best = sorted((-scores[slot], self.ids[slot]) for slot in candidates)[:limit + 1]
+        return [(float(-neg_score), job_id) for neg_score, job_id in best[:limit]], len(best) > limit
+
+
+_index = None
+
+
+def get_job_search_index():
+    """The job search index, or None until it has been built"""
+    return _index
+
+
+def index_job_text(job: dict) -> None:
+    if _index is not None:
+        _index.add(job)
+
+
+def remove_job_text(job_id: str) -> None:
+    if _index is not None:
+        _index.remove(job_id)
+
+
+async def initialize_job_search_from_db() -> JobSearchIndex:
+    """Rebuild the search index from the active jobs in the database"""
+    global _index
+    db = get_database()
+    index = JobSearchIndex()
+    projection = {"id": 1, "title": 1, "description": 1, "required_skills": 1, "company": 1, "location": 1, "status": 1}
+    async for job in db.jobs.find({"status": "active"}, projection):
+        index.add(job)
+    _index = index
+    logger.info(f"Job search index built: {len(index)} jobs, {len(index.postings)} terms")
+    return index
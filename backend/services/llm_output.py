@@ -0,0 +1,332 @@
+"""
+Validation and repair of the JSON the LLM parsers return.
+
+``repair_json`` makes one tolerant pass over the model output: it starts at
+the first ``{``, ignores anything after the object closes, quotes bare keys
+and single-quoted strings (unescaping ``\\'``), drops trailing commas,
+inserts missing ones between items, and closes strings, arrays and objects
+left open by a truncated response. The result is validated against
+``ParsedResume``, which coerces the usual type slips (``"5+ years"``, a
+string where a list is expected).
+
+Fields the model left out can be asked for again with ``reask_prompt``
+instead of repeating the whole parse. ``parse_metrics`` counts LLM calls
+whose output could not be used, per successful parse.
+"""
+
+import json
+import re
+import threading
+from typing import List, Union
+
+from pydantic import BaseModel, ValidationError, field_validator
+
+REQUIRED_FIELDS = ["skills", "experience_years", "education", "job_titles"]
+
+
+class Education(BaseModel):
+    degree: str = ""
+    institution: str = ""
+    year: str = ""
+
+    @field_validator("degree", "institution", "year", mode="before")
+    @classmethod
+    def _as_text(cls, value):
+        return "" if value is None else str(value)
+
+
+class Project(BaseModel):
+    name: str = ""
+    description: str = ""
+    technologies: List[str] = []
+
+    @field_validator("name", "description", mode="before")
+    @classmethod
+    def _as_text(cls, value):
+        return "" if value is None else str(value)
+
+    @field_validator("technologies", mode="before")
+    @classmethod
+    def _as_list(cls, value):
+        return _string_list(value)
+
+
+def _string_list(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",") if part.strip()]
+    if not isinstance(value, (list, tuple)):
+        raise ValueError("Expected a list")
+    return [str(item).strip() for item in value if item is not None and str(item).strip()]
+
+
+class ParsedResume(BaseModel):
+    skills: List[str] = []
+    experience_years: Union[int, float] = 0
+    education: List[Education] = []
+    achievements: List[str] = []
+    job_titles: List[str] = []
+    summary: str = ""
+    phone: str = ""
+    location: str = ""
+    certifications: List[str] = []
+    languages: List[str] = []
+    projects: List[Project] = []
+
+    @field_validator("skills", "achievements", "job_titles", "certifications", "languages", mode="before")
+    @classmethod
+    def _as_list(cls, value):
+        return _string_list(value)
+
+    @field_validator("experience_years", mode="before")
+    @classmethod
+    def _as_years(cls, value):
+        if value is None or value == "":
+            return 0
+        if isinstance(value, str):
+            match = re.search(r"\d+(?:\.\d+)?", value)
+            return float(match.group(0)) if match else 0
+        return value
+
+    @field_validator("summary", "phone", "location", mode="before")
+    @classmethod
+    def _as_text(cls, value):
+        return "" if value is None else str(value)
+
+    @field_validator("education", mode="before")
+    @classmethod
+    def _as_education(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, (str, dict)):
+            value = [value]
+        if not isinstance(value, (list, tuple)):
+            raise ValueError("Expected a list")
+        return [{"degree": item} if isinstance(item, str) else item for item in value]
+
+    @field_validator("projects", mode="before")
+    @classmethod
+    def _as_projects(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, (str, dict)):
+            value = [value]
+        if not isinstance(value, (list, tuple)):
+            raise ValueError("Expected a list")
+        return [{"name": item} if isinstance(item, str) else item for item in value]
+
+
+SCHEMA_FIELDS = list(ParsedResume.model_fields)
+
+
+_CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
+
+def _drop_trailing_comma(out: list) -> None:
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _last_significant(out: list) -> str:
+    for token in reversed(out):
+        if not token.isspace():
+            return token
+    return ""
+
+
+def _ends_value(out: list) -> bool:
+    """True when the last token closes a string, number, literal, object or array"""
+    last = _last_significant(out)[-1:]
+    return last in ('"', "}", "]") or last.isalnum() or last == "."
+
+
+def repair_json(text: str) -> str:
+    """Best-effort repair of an LLM's JSON object into text ``json.loads`` accepts"""
+    start = text.find("{")
+    if start < 0:
+        raise ValueError("No JSON object in LLM output")
+
+    out, stack = [], []
+    in_string = escape = string_is_key = awaiting_colon = False
+    quote = '"'
+    i = start
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            if escape:
+                escape = False
+                out.append(char)
+            elif char == "\\" and text[i + 1:i + 2] == "'":
+                # \' is not a JSON escape; the quote needs none inside "..."
+                out.append("'")
+                i += 2
+                continue
+            elif char == "\\":
+                escape = True
+                out.append(char)
+            elif char == quote:
+                in_string = False
+                awaiting_colon = string_is_key
+                out.append('"')
+            elif char == '"':
+                out.append('\\"')
+            elif char == "\n":
+                out.append("\\n")
+            else:
+                out.append(char)
+            i += 1
+            continue
+
+        in_object = bool(stack) and stack[-1] == "}"
+        # Missing comma: a new key or array item right after a value. Bare
+        # words and numbers are copied a character at a time, so they only
+        # start a new item after whitespace.
+        if in_object:
+            starts_item = char in "\"'" or ((char.isalpha() or char == "_") and out[-1].isspace())
+        else:
+            starts_item = char in "\"'{[" or ((char.isalnum() or char == "-") and out[-1].isspace())
+        if starts_item and not awaiting_colon and _ends_value(out):
+            out.append(",")
+        if char in "\"'":
+            string_is_key = in_object and _last_significant(out) in ("{", ",")
+            in_string, quote = True, char
+            out.append('"')
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+            out.append(char)
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if stack:
+                out.append(stack.pop())
+            if not stack:
+                break
+        elif in_object and (char.isalpha() or char == "_") and _last_significant(out) in ("{", ","):
+            # Bare key
+            end = i
+            while end < len(text) and (text[end].isalnum() or text[end] in "_-"):
+                end += 1
+            out.append(f'"{text[i:end]}"')
+            awaiting_colon = True
+            i = end
+            continue
+        else:
+            if char == ":":
+                awaiting_colon = False
+            out.append(char)
+        i += 1
+
+    # Truncated output: close whatever is still open
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+        awaiting_colon = string_is_key
+    if stack:
+        _drop_trailing_comma(out)
+        if awaiting_colon:
+            out.append(": null")
+        elif _last_significant(out) == ":":
+            out.append(" null")
+        while stack:
+            _drop_trailing_comma(out)
+            out.append(stack.pop())
+    return "".join(out)
+
+
+def parse_llm_json(text: str) -> dict:
+    """Parse model output as a JSON object, repairing it if needed; raises ValueError"""
+    text = _CODE_FENCE_RE.sub("", text.strip())
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        try:
+            data = json.loads(repair_json(text))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Unrepairable JSON in LLM output: {e}")
+        parse_metrics.record(repaired=1)
+    if not isinstance(data, dict):
+        raise ValueError("LLM output is not a JSON object")
+    return data
+
+
+def validate_resume(data: dict, fields: list = None) -> tuple:
+    """
+    Validate parsed data against ``ParsedResume``.
+
+    Returns ``(parsed_data, missing)``: every schema field with a valid value
+    or its default, and the required fields the model left out or got wrong.
+    With ``fields`` only those are checked and returned.
+    """
+    fields = fields or SCHEMA_FIELDS
+    # A null (e.g. from a truncated answer) counts as left out
+    data = {field: data[field] for field in fields if data.get(field) is not None}
+    while True:
+        try:
+            validated = ParsedResume.model_validate(data).model_dump()
+            break
+        except ValidationError as e:
+            # Drop the fields that cannot be coerced and treat them as missing
+            bad = {error["loc"][0] for error in e.errors() if error["loc"]}
+            if not bad & set(data):
+                raise ValueError(f"Parsed resume failed validation: {e}")
+            data = {k: v for k, v in data.items() if k not in bad}
+
+    missing = [field for field in REQUIRED_FIELDS if field in fields and field not in data]
+    return {field: validated[field] for field in fields}, missing
+
+
+def reask_prompt(resume_text: str, fields: list) -> str:
+    """Prompt asking only for the fields a previous answer left out"""
+    example = {field: ParsedResume.model_fields[field].default for field in fields}
+    return f"""Extract only these fields from this resume text: {", ".join(fields)}.
+
+Resume text:
+{resume_text}
+
+Return ONLY a JSON object with exactly these keys:
+{json.dumps(example)}
+
+For missing information use empty strings or empty arrays. Return valid JSON only, no explanations."""
+
+
+def parse_resume_output(text: str, fields: list = None) -> tuple:
+    """``parse_llm_json`` followed by ``validate_resume``"""
+    return validate_resume(parse_llm_json(text), fields)
+
+
+def apply_reask(parsed_data: dict, missing: list, text: str) -> dict:
+    """Fill ``missing`` fields of ``parsed_data`` from the answer to ``reask_prompt``"""
+    parse_metrics.record(llm_calls=1, reasks=1)
+    try:
+        extra, _ = parse_resume_output(text, missing)
+    except ValueError:
+        parse_metrics.record(wasted_llm_calls=1)
+        return parsed_data
+    parsed_data.update(extra)
+    return parsed_data
+
+
+class ParseMetrics:
+    """Counts of LLM calls and how many of them were wasted"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {"llm_calls": 0, "wasted_llm_calls": 0, "repaired": 0, "reasks": 0, "successful_parses": 0}
+
+    def record(self, **increments: int) -> None:
+        with self.lock:
+            for name, amount in increments.items():
+                self.counts[name] += amount
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            counts = dict(self.counts)
+        successes = counts["successful_parses"]
+        counts["wasted_llm_calls_per_parse"] = round(counts["wasted_llm_calls"] / successes, 3) if successes else 0.0
+        return counts
+
+
+parse_metrics = ParseMetrics()
@@ -0,0 +1,223 @@
+"""
+Local deterministic resume parser.
+
+The first tier of resume parsing: sections are found by their headings,
+skills by the Aho–Corasick automaton over the skill vocabulary, and titles,
+dates, degrees and contact details by precompiled regexes. It returns the
+same shape as the LLM parsers plus a ``confidence`` score and the required
+fields it could not fill, so ``parse_resume_tiered`` only calls the LLM when
+the local result is not good enough.
+"""
+
+import os
+import re
+from datetime import datetime
+
+from services.skill_matcher import AhoCorasick, find_skills
+
+LOCAL_CONFIDENCE_THRESHOLD = float(os.environ.get("LOCAL_CONFIDENCE_THRESHOLD", "0.75"))
+REQUIRED_FIELDS = ["skills", "experience_years", "job_titles", "education"]
+MAX_SKILLS = 30
+MAX_TITLES = 5
+
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "objective", "about me"],
+    "skills": ["skills", "technical skills", "core competencies", "technologies", "tools"],
+    "experience": ["experience", "work experience", "professional experience", "work history", "employment", "employment history"],
+    "education": ["education", "academic background", "qualifications"],
+    "projects": ["projects", "personal projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses"],
+    "achievements": ["achievements", "accomplishments", "awards", "honors"],
+    "languages": ["languages"],
+}
+_HEADING_TO_SECTION = {h: section for section, headings in SECTION_HEADINGS.items() for h in headings}
+_HEADING_RE = re.compile(
+    r"^\s*(" + "|".join(sorted(map(re.escape, _HEADING_TO_SECTION), key=len, reverse=True)) + r")\s*:?\s*$",
+    re.IGNORECASE
+)
+
+_TITLE_WORDS = r"(?:Engineer|Developer|Scientist|Analyst|Manager|Designer|Administrator|Architect|Lead|Director|VP|CTO|CEO)"
+_TITLE_PATTERNS = [
+    re.compile(r"^[ \t]*([A-Za-z/ ]+" + _TITLE_WORDS + r")(?=[ \t]*(?:\||\sat\s|[-–—@,(]|\d{4}|$))", re.IGNORECASE | re.MULTILINE),
+    re.compile(r"^[ \t]*(?:Title|Position|Role):[ \t]*([A-Za-z/ ]+" + _TITLE_WORDS + r")", re.IGNORECASE | re.MULTILINE),
+]
+COMMON_TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Software Developer",
+    "Full Stack Developer", "Frontend Developer", "Backend Developer",
+    "DevOps Engineer", "Data Scientist", "Data Engineer", "Machine Learning Engineer",
+    "Product Manager", "Project Manager", "Technical Lead", "Team Lead",
+    "Engineering Manager", "CTO", "CEO", "Director", "VP of Engineering",
+    "QA Engineer", "UI/UX Designer", "Database Administrator", "System Administrator",
+    "Cloud Engineer", "Security Engineer", "Mobile Developer", "Android Developer",
+    "iOS Developer", "Web Developer", "Network Engineer"
+]
+_title_automaton = AhoCorasick({title: title for title in COMMON_TITLES})
+
+_YEARS_OF_EXPERIENCE_RE = re.compile(
+    r"(\d{1,2})\s*\+?\s*years?\s+(?:of\s+)?(?:\w+\s+)?experience|experience\s+(?:of\s+)?(\d{1,2})\s*\+?\s*years?",
+    re.IGNORECASE
+)
+_MONTH = r"(?:[A-Za-z]{3,9}\.?\s+|\d{1,2}/)?"
+_YEAR_RANGE_RE = re.compile(
+    _MONTH + r"((?:19|20)\d{2})\s*(?:-|–|—|to)\s*" + _MONTH + r"((?:19|20)\d{2}|present|current|now)\b",
+    re.IGNORECASE
+)
+_YEAR_RE = re.compile(r"\b((?:19|20)\d{2})\b")
+_DEGREE_RE = re.compile(
+    r"\b(Bachelor(?:'s)?(?: of [A-Za-z ]+)?|Master(?:'s)?(?: of [A-Za-z ]+)?|Associate(?: of [A-Za-z ]+)?|"
+    r"Ph\.?D\.?(?: in [A-Za-z ]+)?|Doctorate|MBA|B\.?Sc?\.?|M\.?Sc?\.?|B\.?Tech|M\.?Tech|B\.?E\.|M\.?E\.|B\.?A\.|M\.?A\.|Diploma)"
+    r"(?:\s+in\s+[A-Za-z ]+)?",
+    re.IGNORECASE
+)
+_INSTITUTION_RE = re.compile(r"((?:[A-Z][A-Za-z.&' ]*\s)?(?:University|College|Institute|School|Academy)(?: of [A-Z][A-Za-z ]+)?)")
+_PHONE_RE = re.compile(r"(?<!\d)(\+?\(?\d[\d\s().-]{7,}\d)(?!\d)")
+_LOCATION_RE = re.compile(r"^\s*(?:Location|Address|Based in)\s*:\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+_BULLET_RE = re.compile(r"^\s*[-•*▪●◦]\s*")
+
+
+def split_sections(text: str) -> dict:
+    """Map section name -> its lines; lines before the first heading go to ``header``"""
+    sections = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        match = _HEADING_RE.match(line)
+        if match:
+            current = _HEADING_TO_SECTION[match.group(1).lower()]
+            sections.setdefault(current, [])
+        elif line.strip():
+            sections[current].append(line.strip())
+    return sections
+
+
+def section_blocks(text: str) -> list:
+    """``[(section, raw_text)]`` in document order, each block starting with its heading line"""
+    blocks = [["header", []]]
+    for line in text.splitlines():
+        match = _HEADING_RE.match(line)
+        if match:
+            blocks.append([_HEADING_TO_SECTION[match.group(1).lower()], []])
+        blocks[-1][1].append(line)
+    return [(section, "\n".join(lines).strip()) for section, lines in blocks if "".join(lines).strip()]
+
+
+def _strip_bullet(line: str) -> str:
+    return _BULLET_RE.sub("", line).strip()
+
+
+def extract_skills(text: str) -> list:
+    return find_skills(text)[:MAX_SKILLS]
+
+
+def extract_job_titles(text: str) -> list:
+    found = []
+    for pattern in _TITLE_PATTERNS:
+        found.extend(m.strip() for m in pattern.findall(text) if m.strip())
+    found.extend(_title_automaton.find(text))
+
+    # Longest first, so a title is dropped when it is part of one already kept
+    kept, seen = [], ""
+    for title in sorted(dict.fromkeys(found), key=len, reverse=True):
+        if title.lower() not in seen:
+            kept.append(title)
+            seen += "\n" + title.lower()
+    return kept[:MAX_TITLES]
+
+
+def extract_experience_years(text: str) -> int:
+    """Stated years of experience, or the span covered by the year ranges"""
+    stated = [int(a or b) for a, b in _YEARS_OF_EXPERIENCE_RE.findall(text)]
+
+    current_year = datetime.now().year
+    intervals = []
+    for start, end in _YEAR_RANGE_RE.findall(text):
+        end_year = current_year if not end[0].isdigit() else int(end)
+        start_year = int(start)
+        if start_year <= current_year and start_year < end_year:
+            intervals.append((start_year, min(end_year, current_year)))
+
+    # Overlapping jobs are counted once
+    covered, last_end = 0, None
+    for start, end in sorted(intervals):
+        if last_end is not None and start < last_end:
+            start = last_end
+        if end > start:
+            covered += end - start
+            last_end = end
+
+    return max(stated + [covered])
+
+
+def extract_education(lines: list) -> list:
+    education = []
+    for line in lines:
+        degree = _DEGREE_RE.search(line)
+        institution = _INSTITUTION_RE.search(line)
+        years = _YEAR_RE.findall(line)
+        if degree:
+            education.append({"degree": degree.group(0).strip(), "institution": "", "year": ""})
+        elif not education or not (institution or years):
+            continue
+        entry = education[-1]
+        if institution and not entry["institution"]:
+            entry["institution"] = institution.group(1).strip()
+        if years and not entry["year"]:
+            entry["year"] = years[-1]
+    return education
+
+
+def extract_projects(lines: list) -> list:
+    projects = []
+    for line in lines:
+        if _BULLET_RE.match(line) and projects:
+            projects[-1]["description"] = (projects[-1]["description"] + " " + _strip_bullet(line)).strip()
+        else:
+            projects.append({"name": _strip_bullet(line), "description": "", "technologies": []})
+    for project in projects:
+        project["technologies"] = find_skills(project["name"] + " " + project["description"])
+    return projects
+
+
+def _listed_items(lines: list) -> list:
+    items = []
+    for line in lines:
+        items.extend(part.strip() for part in _strip_bullet(line).split(",") if part.strip())
+    return items
+
+
+def parse_resume_locally(text: str) -> dict:
+    """Parse resume text without the LLM; adds ``confidence`` and ``missing_fields``"""
+    sections = split_sections(text)
+    experience_text = "\n".join(sections["experience"]) if "experience" in sections else text
+    title_text = "\n".join(sections["header"] + sections.get("experience", []))
+
+    phone = _PHONE_RE.search("\n".join(sections["header"])) or _PHONE_RE.search(text)
+    location = _LOCATION_RE.search(text)
+
+    parsed_data = {
+        "skills": extract_skills(text),
+        "experience_years": extract_experience_years(experience_text),
+        "education": extract_education(sections.get("education", [])),
+        "achievements": [_strip_bullet(line) for line in sections.get("achievements", [])],
+        "job_titles": extract_job_titles(title_text or text),
+        "summary": " ".join(sections.get("summary", []))[:500],
+        "phone": phone.group(1).strip() if phone else "",
+        "location": location.group(1).strip() if location else "",
+        "certifications": [_strip_bullet(line) for line in sections.get("certifications", [])],
+        "languages": _listed_items(sections.get("languages", [])),
+        "projects": extract_projects(sections.get("projects", [])),
+        "parsing_method": "local"
+    }
+
+    missing = [field for field in REQUIRED_FIELDS if not parsed_data[field]]
+    confidence = (len(REQUIRED_FIELDS) - len(missing)) / len(REQUIRED_FIELDS)
+    # Without recognisable headings the section-based fields are guesses
+    found_sections = len(sections) - 1
+    if found_sections < 2:
+        confidence *= 0.7
+    parsed_data["confidence"] = round(confidence, 2)
+    parsed_data["missing_fields"] = missing
+    return parsed_data
+
+
+def is_confident(parsed_data: dict) -> bool:
+    return not parsed_data["missing_fields"] and parsed_data["confidence"] >= LOCAL_CONFIDENCE_THRESHOLD
@@ -0,0 +1,207 @@
+"""
+Background matching runs.
+
+``POST /api/ai-match/run`` only registers a run and returns its id. The run
+itself is an asyncio task that does its database I/O on the event loop and
+ships every CPU-heavy step (pair scoring, the assignment solver) to a process
+pool, so other requests keep being served while a large match computes.
+Progress and cancellation go through the ``match_runs`` collection, and a
+lock document in ``match_state`` keeps two runs from overlapping. Runs
+interrupted by a restart are failed and the lock released at startup.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from services.incremental_matching import RunContext, run_incremental_matching
+from utils.db import get_database
+from utils.logger import get_logger
+
+logger = get_logger("match_runs")
+
+MATCH_WORKERS = int(os.environ.get("MATCH_WORKERS", "1"))
+# A lock older than this is assumed to belong to a crashed process
+LOCK_TIMEOUT = timedelta(hours=2)
+LOCK_ID = "run_lock"
+
+_executor = None
+_tasks = {}
+
+
+class MatchRunCancelled(Exception):
+    """Raised at a checkpoint when cancellation was requested"""
+
+
+class MatchRunInProgress(Exception):
+    """Raised when another matching run holds the lock"""
+
+    def __init__(self, run_id: str):
+        super().__init__(f"Matching run {run_id} is already in progress")
+        self.run_id = run_id
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool, creating it on first use. Workers are
+    spawned rather than forked: the server already runs Motor, logging and
+    thread-pool threads, and a forked child can inherit one of their locks
+    held and deadlock on it.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=MATCH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Cancel running tasks and stop the worker processes"""
+    global _executor
+    for task in _tasks.values():
+        task.cancel()
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class BackgroundRunContext(RunContext):
+    """Runs CPU work in the process pool and records progress on the run document"""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+
+    async def compute(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), func, *args)
+
+    async def progress(self, **fields) -> None:
+        db = get_database()
+        fields["updated_at"] = datetime.utcnow()
+        await db.match_runs.update_one({"id": self.run_id}, {"$set": fields})
+
+    async def checkpoint(self) -> None:
+        db = get_database()
+        run = await db.match_runs.find_one({"id": self.run_id}, {"cancel_requested": 1})
+        if run and run.get("cancel_requested"):
+            raise MatchRunCancelled()
+
+
+async def _acquire_lock(db, run_id: str) -> None:
+    stale = datetime.utcnow() - LOCK_TIMEOUT
+    try:
+        await db.match_state.find_one_and_update(
+            {"_id": LOCK_ID, "$or": [{"run_id": None}, {"acquired_at": {"$lt": stale}}]},
+            {"$set": {"run_id": run_id, "acquired_at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        lock = await db.match_state.find_one({"_id": LOCK_ID})
+        raise MatchRunInProgress(lock.get("run_id") if lock else "unknown")
+
+
+async def _release_lock(db, run_id: str) -> None:
+    await db.match_state.update_one(
+        {"_id": LOCK_ID, "run_id": run_id},
+        {"$set": {"run_id": None, "acquired_at": None}}
+    )
+
+
+async def _execute(run_id: str, capacity: int, rebuild: bool) -> None:
+    db = get_database()
+    ctx = BackgroundRunContext(run_id)
+    try:
+        await ctx.progress(status="running", phase="loading", started_at=datetime.utcnow())
+        result = await run_incremental_matching(capacity=capacity, rebuild=rebuild, ctx=ctx)
+        await ctx.progress(status="completed", phase="done", result=result, finished_at=datetime.utcnow())
+        logger.info(f"Matching run {run_id} completed: {result['total_matches']} matches")
+    except (MatchRunCancelled, asyncio.CancelledError):
+        await ctx.progress(status="cancelled", finished_at=datetime.utcnow())
+        logger.info(f"Matching run {run_id} cancelled")
+    except Exception as e:
+        await ctx.progress(status="failed", error=str(e), finished_at=datetime.utcnow())
+        logger.error(f"Matching run {run_id} failed: {e}")
+    finally:
+        await _release_lock(db, run_id)
+        _tasks.pop(run_id, None)
+
+
+async def start_match_run(requested_by: str, capacity: int = 1, rebuild: bool = False) -> dict:
+    """
+    Register a matching run and start it in the background.
+    Raises MatchRunInProgress if another run holds the lock.
+    """
+    db = get_database()
+    run_id = str(uuid.uuid4())
+    await _acquire_lock(db, run_id)
+
+    run_doc = {
+        "id": run_id,
+        "status": "queued",
+        "phase": "queued",
+        "capacity": capacity,
+        "rebuild": rebuild,
+        "pairs_scored": 0,
+        "pairs_total": None,
+        "cancel_requested": False,
+        "requested_by": requested_by,
+        "created_at": datetime.utcnow()
+    }
+    try:
+        await db.match_runs.insert_one(run_doc)
+    except Exception:
+        await _release_lock(db, run_id)
+        raise
+    run_doc.pop("_id", None)
+
+    _tasks[run_id] = asyncio.create_task(_execute(run_id, capacity, rebuild))
+    return run_doc
+
+
+async def recover_match_runs() -> int:
+    """
+    Fail the runs a previous process left queued or running and release the
+    lock, so a new run can start right after a restart
+    """
+    db = get_database()
+    result = await db.match_runs.update_many(
+        {"status": {"$in": ["queued", "running"]}},
+        {"$set": {
+            "status": "failed",
+            "error": "Interrupted by a server restart",
+            "finished_at": datetime.utcnow()
+        }}
+    )
+    await db.match_state.update_one(
+        {"_id": LOCK_ID},
+        {"$set": {"run_id": None, "acquired_at": None}}
+    )
+    if result.modified_count:
+        logger.info(f"Marked {result.modified_count} interrupted matching runs as failed")
+    return result.modified_count
+
+
+async def get_match_run(run_id: str):
+    """Get a run's status document, or None"""
+    db = get_database()
+    return await db.match_runs.find_one({"id": run_id}, {"_id": 0})
+
+
+async def cancel_match_run(run_id: str):
+    """Request cooperative cancellation; the run stops at its next checkpoint"""
+    db = get_database()
+    return await db.match_runs.find_one_and_update(
+        {"id": run_id, "status": {"$in": ["queued", "running"]}},
+        {"$set": {"cancel_requested": True}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
@@ -0,0 +1,143 @@
+"""
+Health registry for the Gemini models used by the resume parser.
+
+Parsing no longer probes every model before each resume. The registry keeps
+the last model that answered (cached for ``MODEL_CACHE_TTL`` seconds) and a
+circuit breaker per model: each failure opens the circuit for an
+exponentially growing backoff, and open models are skipped until a
+background probe finds them answering again. In the steady state a resume
+costs a single LLM call.
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+from utils.logger import get_logger
+
+logger = get_logger("model_health")
+
+MODEL_CACHE_TTL = float(os.environ.get("MODEL_CACHE_TTL", "3600"))
+BACKOFF_BASE_SECONDS = 30.0
+BACKOFF_MAX_SECONDS = 3600.0
+PROBE_INTERVAL_SECONDS = 60.0
+
+
+class ModelState:
+    __slots__ = ("failures", "open_until", "last_error")
+
+    def __init__(self):
+        self.failures = 0
+        self.open_until = 0.0
+        self.last_error = None
+
+
+class ModelHealthRegistry:
+    """Thread-safe; parses run in worker threads"""
+
+    def __init__(self, models: list, probe=None):
+        self.models = list(dict.fromkeys(models))
+        self.probe = probe
+        self.states = {model: ModelState() for model in self.models}
+        self.working_model = None
+        self.working_until = 0.0
+        self._lock = threading.Lock()
+
+    def _is_open(self, model: str, now: float) -> bool:
+        return self.states[model].open_until > now
+
+    def candidates(self) -> list:
+        """Models to try in order: the cached working model, then closed circuits"""
+        now = time.monotonic()
+        with self._lock:
+            ordered = []
+            if self.working_model and self.working_until > now and not self._is_open(self.working_model, now):
+                ordered.append(self.working_model)
+            ordered.extend(m for m in self.models if m not in ordered and not self._is_open(m, now))
+            return ordered
+
+    def record_success(self, model: str) -> None:
+        with self._lock:
+            state = self.states[model]
+            state.failures = 0
+            state.open_until = 0.0
+            state.last_error = None
+            if self.working_model != model:
+                logger.info(f"Using Gemini model: {model}")
+            self.working_model = model
+            self.working_until = time.monotonic() + MODEL_CACHE_TTL
+
+    def record_failure(self, model: str, error: Exception) -> None:
+        with self._lock:
+            state = self.states[model]
+            state.failures += 1
+            backoff = min(BACKOFF_BASE_SECONDS * 2 ** (state.failures - 1), BACKOFF_MAX_SECONDS)
+            state.open_until = time.monotonic() + backoff
+            state.last_error = str(error)
+            if self.working_model == model:
+                self.working_model = None
+            logger.warning(f"Gemini model {model} marked unhealthy for {backoff:.0f}s: {error}")
+
+    def due_for_probe(self) -> list:
+        """Models that have never answered or whose backoff has expired"""
+        now = time.monotonic()
+        with self._lock:
+            if self.working_model and self.working_until > now:
+                return []
+            return [m for m in self.models if not self._is_open(m, now)]
+
+    def probe_once(self) -> str:
+        """Probe models in order until one answers; blocking"""
+        for model in self.due_for_probe():
+            try:
+                self.probe(model)
+            except Exception as e:
+                self.record_failure(model, e)
+                continue
+            self.record_success(model)
+            return model
+        return None
+
+    def status(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "working_model": self.working_model if self.working_until > now else None,
+                "models": {
+                    model: {
+                        "healthy": not self._is_open(model, now),
+                        "failures": state.failures,
+                        "retry_in_seconds": max(0, round(state.open_until - now)),
+                        "last_error": state.last_error
+                    }
+                    for model, state in self.states.items()
+                }
+            }
+
+
+_probe_task = None
+
+
+async def _probe_loop(registry: ModelHealthRegistry) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, registry.probe_once)
+        except Exception as e:
+            logger.error(f"Gemini model probe failed: {e}")
+        await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+
+
+def start_background_probes(registry: ModelHealthRegistry) -> None:
+    """Resolve the working model off the request path and keep it fresh"""
+    global _probe_task
+    if _probe_task is None and registry.probe is not None:
+        _probe_task = asyncio.create_task(_probe_loop(registry))
+
+
+def stop_background_probes() -> None:
+    global _probe_task
+    if _probe_task is not None:
+        _probe_task.cancel()
+        _probe_task = None
@@ -0,0 +1,179 @@
+"""
+Async OpenRouter chat completions client.
+
+One ``httpx.AsyncClient`` with a keep-alive connection pool is shared by all
+calls. Each request has its own timeout, and connection errors, timeouts,
+429 and 5xx answers are retried with exponential backoff and full jitter.
+
+``first_successful`` runs attempts (e.g. one per model) in preference order.
+With ``OPENROUTER_HEDGE_AFTER`` set, the next attempt is fired when the
+current one has not answered within that many seconds, and whichever
+succeeds first wins; the other is cancelled.
+
+The shared client lives on the server's event loop (``start_openrouter_client``
+in the lifespan). Blocking callers running in worker threads use ``run_sync``,
+which hands the coroutine to that loop; scripts without a running server get
+a temporary client instead.
+"""
+
+import asyncio
+import os
+import random
+
+import httpx
+
+from utils.logger import get_logger
+
+logger = get_logger("openrouter_client")
+
+# Point at tests/fake_llm_server.py to parse without a real provider
+OPENROUTER_BASE_URL = os.environ.get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+OPENROUTER_TIMEOUT = float(os.environ.get("OPENROUTER_TIMEOUT", "30"))
+OPENROUTER_MAX_RETRIES = int(os.environ.get("OPENROUTER_MAX_RETRIES", "2"))
+OPENROUTER_BACKOFF = float(os.environ.get("OPENROUTER_BACKOFF", "0.5"))
+# Seconds before the next model is raced against a slow one; 0 disables hedging
+OPENROUTER_HEDGE_AFTER = float(os.environ.get("OPENROUTER_HEDGE_AFTER", "0"))
+OPENROUTER_MAX_CONNECTIONS = int(os.environ.get("OPENROUTER_MAX_CONNECTIONS", "20"))
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class RetryableStatus(Exception):
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code} from {response.request.url}")
+        self.response = response
+
+
+class OpenRouterClient:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = OPENROUTER_BASE_URL,
+        timeout: float = OPENROUTER_TIMEOUT,
+        max_retries: int = OPENROUTER_MAX_RETRIES,
+        backoff: float = OPENROUTER_BACKOFF,
+        hedge_after: float = OPENROUTER_HEDGE_AFTER,
+        max_connections: int = OPENROUTER_MAX_CONNECTIONS
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.hedge_after = hedge_after
+        self.http = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 10.0)),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    def _delay(self, attempt: int, error: Exception) -> float:
+        delay = random.uniform(0, self.backoff * 2 ** attempt)
+        if isinstance(error, RetryableStatus):
+            retry_after = error.response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+        return delay
+
+    async def chat(self, model: str, messages: list, max_tokens: int = 1024, timeout: float = None) -> str:
+        """Send one chat completion and return the message content"""
+        payload = {"model": model, "messages": messages, "max_tokens": max_tokens}
+        request_timeout = httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.http.post("/chat/completions", json=payload, timeout=request_timeout)
+                if response.status_code in RETRYABLE_STATUS:
+                    raise RetryableStatus(response)
+                response.raise_for_status()
+                result = response.json()
+                if not result.get("choices"):
+                    raise ValueError(f"No choices in response from {model}")
+                return result["choices"][0].get("message", {}).get("content", "")
+            except (httpx.TransportError, RetryableStatus) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._delay(attempt, e)
+                logger.warning(f"OpenRouter request for {model} failed ({e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def first_successful(self, attempts: list):
+        """
+        Run zero-argument coroutine functions in order until one succeeds.
+        With hedging, at most two run at once and the first success wins.
+        """
+        queue = list(attempts)
+        pending = set()
+        last_error = None
+
+        def launch():
+            pending.add(asyncio.ensure_future(queue.pop(0)()))
+
+        launch()
+        try:
+            while pending:
+                hedge = self.hedge_after > 0 and queue and len(pending) < 2
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_after if hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.info(f"No answer after {self.hedge_after}s; hedging with the next model")
+                    launch()
+                    continue
+                for task in done:
+                    pending.discard(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                if not pending and queue:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise last_error
+
+
+_client = None
+_loop = None
+
+
+async def start_openrouter_client(api_key: str) -> OpenRouterClient:
+    """Create the shared client on the running loop"""
+    global _client, _loop
+    if _client is None:
+        _client = OpenRouterClient(api_key)
+        _loop = asyncio.get_running_loop()
+    return _client
+
+
+async def close_openrouter_client() -> None:
+    global _client, _loop
+    if _client is not None:
+        await _client.aclose()
+        _client, _loop = None, None
+
+
+def run_sync(coroutine_function, api_key: str):
+    """
+    Run ``coroutine_function(client)`` from blocking code and return its result.
+    Uses the shared client on the server loop when called from another thread.
+    """
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if _client is not None and _loop is not None and _loop.is_running() and running is not _loop:
+        return asyncio.run_coroutine_threadsafe(coroutine_function(_client), _loop).result()
+    if running is not None:
+        raise RuntimeError("run_sync cannot be called from the event loop thread; await the coroutine instead")
+
+    async def with_temporary_client():
+        client = OpenRouterClient(api_key)
+        try:
+            return await coroutine_function(client)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(with_temporary_client())
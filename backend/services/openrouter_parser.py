@@ -1,16 +1,21 @@
-import requests
-import json
-import os
-import logging
+from functools import partial
 from utils.logger import get_logger
 from utils.env_utils import get_api_key, is_openrouter_key
+from services.llm_output import apply_reask, parse_metrics, parse_resume_output, reask_prompt
+from services.openrouter_client import OpenRouterClient, run_sync
 
 # Get logger
 logger = get_logger("openrouter_parser")
 
 # Configure OpenRouter API
-OPENROUTER_API_KEY = get_api_key('GEMINI_API_KEY')  # Using the same env var for simplicity
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+OPENROUTER_API_KEY = get_api_key('GEMINI_API_KEY')
+# Models to try in order (from fastest to most capable)
+OPENROUTER_MODELS = [
+    "google/gemini-1.5-pro",
+    "anthropic/claude-3-sonnet",
+    "anthropic/claude-3-haiku",
+    "mistralai/mixtral-8x7b-instruct"
+]
 
 def parse_resume_with_openrouter(resume_text: str) -> dict:
     """
@@ -25,14 +30,11 @@ def parse_resume_with_openrouter(resume_text: str) -> dict:
         logger.error("Not a valid OpenRouter API key. Keys should start with 'sk-or-'")
         raise ValueError("Invalid OpenRouter API key format.")
     
-    # Truncate resume text if too long
-    resume_text_truncated = resume_text[:2000] if len(resume_text) > 2000 else resume_text
-    
     # Create an enhanced prompt for comprehensive resume parsing
     prompt = f"""Extract key information from this resume text.
         
 Resume text:
-{resume_text_truncated}
+{resume_text}
 
 Extract and return ONLY a JSON object with this exact structure:
 {{
@@ -63,75 +65,51 @@ Extract and return ONLY a JSON object with this exact structure:
 
 Format your entire response as valid JSON only. No explanations, no other text."""
     
+    messages = [
+        {"role": "system", "content": "You are a resume parser that extracts structured data from resumes."},
+        {"role": "user", "content": prompt}
+    ]
     try:
-        # Models to try in order (from fastest to most capable)
-        models_to_try = [
-            "google/gemini-1.5-pro",
-            "anthropic/claude-3-sonnet",
-            "anthropic/claude-3-haiku",
-            "mistralai/mixtral-8x7b-instruct"
-        ]
-        
-        for model in models_to_try:
-            try:
-                # Make request to OpenRouter API
-                headers = {
-                    "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                    "Content-Type": "application/json"
-                }
-                
-                data = {
-                    "model": model,
-                    "messages": [
-                        {"role": "system", "content": "You are a resume parser that extracts structured data from resumes."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": 1024
-                }
-                
-                logger.info(f"Attempting to use OpenRouter with model: {model}")
-                response = requests.post(
-                    f"{OPENROUTER_BASE_URL}/chat/completions", 
-                    headers=headers, 
-                    json=data,
-                    timeout=30
-                )
-                
-                # Check if the request was successful
-                response.raise_for_status()
-                
-                # Parse the response
-                result = response.json()
-                
-                if "choices" in result and len(result["choices"]) > 0:
-                    content = result["choices"][0].get("message", {}).get("content", "")
-                    
-                    # Try to extract JSON from the content
-                    try:
-                        # Try to extract JSON if it's wrapped in code blocks
-                        if "```json" in content:
-                            json_text = content.split("```json")[1].split("```")[0].strip()
-                        elif "```" in content:
-                            json_text = content.split("```")[1].split("```")[0].strip()
-                        else:
-                            json_text = content.strip()
-                            
-                        parsed_data = json.loads(json_text)
-                        parsed_data["parsing_method"] = f"openrouter_{model.split('/')[-1]}"
-                        logger.info(f"Successfully parsed resume using OpenRouter with model {model}")
-                        return parsed_data
-                    
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Failed to parse JSON from OpenRouter response with model {model}: {e}")
-                        continue
-                    
-            except Exception as e:
-                logger.warning(f"Failed to use OpenRouter with model {model}: {e}")
-                continue
-        
-        # If we get here, all models failed
-        raise ValueError("All OpenRouter models failed to parse the resume")
-        
+        return run_sync(lambda client: _parse_with_models(client, resume_text, messages), OPENROUTER_API_KEY)
     except Exception as e:
         logger.error(f"OpenRouter parsing error: {str(e)}")
-        raise ValueError(f"Failed to parse resume with OpenRouter: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Failed to parse resume with OpenRouter: {str(e)}")
+
+async def _parse_with_model(client: OpenRouterClient, model: str, messages: list) -> dict:
+    logger.info(f"Attempting to use OpenRouter with model: {model}")
+    try:
+        content = await client.chat(model, messages, max_tokens=1024)
+    except Exception as e:
+        logger.warning(f"Failed to use OpenRouter with model {model}: {e}")
+        raise
+    
+    parse_metrics.record(llm_calls=1)
+    try:
+        parsed_data, missing = parse_resume_output(content)
+    except ValueError as e:
+        parse_metrics.record(wasted_llm_calls=1)
+        logger.warning(f"Failed to parse JSON from OpenRouter response with model {model}: {e}")
+        raise
+    return model, parsed_data, missing
+
+async def _parse_with_models(client: OpenRouterClient, resume_text: str, messages: list) -> dict:
+    try:
+        model, parsed_data, missing = await client.first_successful([
+            partial(_parse_with_model, client, model, messages) for model in OPENROUTER_MODELS
+        ])
+    except Exception as e:
+        raise ValueError(f"All OpenRouter models failed to parse the resume: {e}")
+    
+    # Ask the same model again only for the fields its answer left out
+    if missing:
+        logger.info(f"OpenRouter response missing {missing}; asking for those fields")
+        try:
+            content = await client.chat(model, [messages[0], {"role": "user", "content": reask_prompt(resume_text, missing)}])
+            parsed_data = apply_reask(parsed_data, missing, content)
+        except Exception as e:
+            parse_metrics.record(llm_calls=1, reasks=1, wasted_llm_calls=1)
+            logger.warning(f"Re-ask for missing fields failed: {e}")
+    
+    parsed_data["parsing_method"] = f"openrouter_{model.split('/')[-1]}"
+    logger.info(f"Successfully parsed resume using OpenRouter with model {model}")
+    return parsed_data
@@ -0,0 +1,157 @@
+"""
+Content-addressed cache for resume parsing.
+
+Two layers, both stored as JSON files under ``RESUME_CACHE_DIR``:
+
+* ``text``: SHA-256 of the PDF bytes -> extracted text, so re-uploading the
+  same file skips PDF extraction.
+* ``parsed``: SHA-256 of the normalized text, the prompt version and the
+  model identity -> parsed resume, so the same content never pays for a
+  second LLM call (even when the PDF bytes differ).
+
+The store is bounded by ``RESUME_CACHE_MAX_BYTES``; least recently used
+entries (by file mtime, refreshed on every hit) are evicted first.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+from utils.logger import get_logger
+
+logger = get_logger("parse_cache")
+
+RESUME_CACHE_DIR = Path(os.environ.get("RESUME_CACHE_DIR", Path(__file__).parent.parent / "cache" / "resume_parse"))
+RESUME_CACHE_MAX_BYTES = int(os.environ.get("RESUME_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Evict down to this fraction of the limit so eviction does not run on every write
+EVICT_TO_FRACTION = 0.9
+
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path, chunk_size: int = 1024 * 1024) -> str:
+    """Hash a file without loading it whole"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace-insensitive form of extracted text used for cache keys"""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def parsed_key(resume_text: str, prompt_version: str, model: str) -> str:
+    raw = f"{prompt_version}\n{model}\n{normalize_text(resume_text)}"
+    return sha256_hex(raw.encode("utf-8"))
+
+
+class DiskCache:
+    """Size-bounded JSON file store; safe to use from worker threads"""
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.total_bytes = None
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def _path(self, layer: str, key: str) -> Path:
+        return self.directory / layer / key[:2] / f"{key}.json"
+
+    def _count(self, layer: str, outcome: str) -> None:
+        counts = self.metrics.setdefault(layer, {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+    def _files(self):
+        return [p for p in self.directory.rglob("*.json") if p.is_file()]
+
+    def _scan(self) -> None:
+        if self.total_bytes is None:
+            self.total_bytes = sum(p.stat().st_size for p in self._files())
+
+    def get(self, layer: str, key: str):
+        path = self._path(layer, key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self._count(layer, "misses")
+            return None
+        with self._lock:
+            self._count(layer, "hits")
+        return value
+
+    def set(self, layer: str, key: str, value) -> None:
+        path = self._path(layer, key)
+        payload = json.dumps(value, default=str).encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            previous = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write parse cache entry {layer}/{key}: {e}")
+            return
+
+        with self._lock:
+            self._scan()
+            self.total_bytes += len(payload) - previous
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        target = self.max_bytes * EVICT_TO_FRACTION
+        entries = []
+        for p in self._files():
+            try:
+                stat = p.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, p))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        self.total_bytes = total
+        logger.info(f"Parse cache evicted {evicted} entries, {total} bytes remain")
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._scan()
+            return {
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "layers": {layer: dict(counts) for layer, counts in self.metrics.items()}
+            }
+
+
+_cache = None
+
+
+def get_parse_cache() -> DiskCache:
+    """Get the global parse cache"""
+    global _cache
+    if _cache is None:
+        _cache = DiskCache(RESUME_CACHE_DIR, RESUME_CACHE_MAX_BYTES)
+    return _cache
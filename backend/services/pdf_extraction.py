@@ -0,0 +1,155 @@
+"""
+PDF text extraction.
+
+Pages are extracted lazily and extraction stops as soon as ``max_chars`` of
+text has been collected, since the parser only uses a bounded prefix. Large
+uploads (many pages and bytes) are split into page ranges extracted in a
+process pool; ranges are submitted one wave at a time so the budget still
+stops work early. Page texts are joined once at the end.
+
+Sources may be in-memory bytes or a file path. Files are memory-mapped rather
+than read into memory, and pool workers map the file themselves instead of
+receiving a copy of its bytes.
+"""
+
+import io
+import mmap
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import PyPDF2
+
+from utils.logger import get_logger
+
+logger = get_logger("pdf_extraction")
+
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Below either limit the process hop costs more than it saves
+PARALLEL_MIN_PAGES = 8
+PARALLEL_MIN_BYTES = 1024 * 1024
+PAGES_PER_TASK = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """
+    Get the shared extraction process pool, creating it on first use. It is
+    first requested from resume worker threads, so creation is locked, and
+    workers are spawned because forking a threaded server can hand the child
+    a lock another thread holds.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def shutdown_pdf_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def is_bytes(source) -> bool:
+    return isinstance(source, (bytes, bytearray, memoryview))
+
+
+@contextmanager
+def open_source(source):
+    """Yield a seekable binary stream over in-memory bytes or a memory-mapped file"""
+    if is_bytes(source):
+        yield io.BytesIO(source)
+        return
+    with open(source, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield io.BytesIO(b"")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield view
+
+
+def source_size(source) -> int:
+    return len(source) if is_bytes(source) else os.path.getsize(source)
+
+
+def iter_page_texts(reader: PyPDF2.PdfReader, start: int = 0, stop: int = None):
+    """Yield page texts one page at a time"""
+    stop = len(reader.pages) if stop is None else stop
+    for i in range(start, stop):
+        page_text = reader.pages[i].extract_text() or ""
+        logger.debug(f"Page {i + 1} extracted {len(page_text)} characters")
+        yield page_text
+
+
+def _extract_page_range(source, start: int, stop: int) -> list:
+    """Extract pages ``start:stop``; runs in a worker process"""
+    with open_source(source) as stream:
+        reader = PyPDF2.PdfReader(stream)
+        return list(iter_page_texts(reader, start, stop))
+
+
+def _collect_sequential(reader, max_chars) -> tuple:
+    parts, size = [], 0
+    for page_text in iter_page_texts(reader):
+        parts.append(page_text)
+        size += len(page_text) + 1
+        if max_chars is not None and size >= max_chars:
+            return parts, True
+    return parts, False
+
+
+def _collect_parallel(source, n_pages: int, max_chars) -> tuple:
+    executor = get_pdf_executor()
+    ranges = [(start, min(start + PAGES_PER_TASK, n_pages)) for start in range(0, n_pages, PAGES_PER_TASK)]
+    parts, size = [], 0
+    for wave in range(0, len(ranges), PDF_WORKERS):
+        futures = [
+            executor.submit(_extract_page_range, source, start, stop)
+            for start, stop in ranges[wave:wave + PDF_WORKERS]
+        ]
+        for future in futures:
+            for page_text in future.result():
+                parts.append(page_text)
+                size += len(page_text) + 1
+                if max_chars is not None and size >= max_chars:
+                    for pending in futures:
+                        pending.cancel()
+                    return parts, True
+    return parts, False
+
+
+def extract_pdf_text(source, max_chars: int = None) -> tuple:
+    """
+    Extract text from a PDF given as bytes or a path.
+
+    Returns ``(text, truncated)``; ``truncated`` is True when extraction
+    stopped early because ``max_chars`` was reached.
+    """
+    if is_bytes(source):
+        source = bytes(source)
+    with open_source(source) as stream:
+        reader = PyPDF2.PdfReader(stream)
+        n_pages = len(reader.pages)
+
+        if n_pages >= PARALLEL_MIN_PAGES and source_size(source) >= PARALLEL_MIN_BYTES and PDF_WORKERS > 1:
+            parts, truncated = _collect_parallel(source, n_pages, max_chars)
+        else:
+            parts, truncated = _collect_sequential(reader, max_chars)
+
+    text = "\n".join(parts).strip()
+    logger.debug(
+        f"Extracted {len(text)} characters from {len(parts)} of {n_pages} pages"
+        + (" (budget reached)" if truncated else "")
+    )
+    return text, truncated
@@ -1,62 +1,41 @@
-import heapq
 from utils.db import get_database
+from services.scoring_engine import candidate_features, get_scoring_function, job_features, to_percentage
 
-async def rank_candidates_for_job(job: dict) -> list:
+# Only the fields needed to score a candidate are streamed from Mongo
+RANKING_PROJECTION = {"_id": 0, "id": 1, "skills": 1, "experience": 1}
+
+def score_candidate_for_job(candidate: dict, job: dict, features: tuple = None) -> tuple:
+    """
+    Score one candidate for a job. Returns ``(match_percentage, matched_skills)``.
+    Pass the job's precomputed ``job_features`` when scoring many candidates.
     """
-    Rank candidates using priority queue (max heap)
+    if features is None:
+        features = job_features(job)
+    weight, skill_overlap = get_scoring_function().score(*candidate_features(candidate), *features)
+    return to_percentage(weight), skill_overlap
+
+async def hydrate_ranked_candidates(entries: list) -> list:
+    """
+    Attach full profiles (without password) to ``(user_id, score, matched_skills)``
+    entries with a single query, preserving their order.
     """
     db = get_database()
-    
-    # Get all candidates
-    candidates = await db.users.find({"role": "candidate"}).to_list(length=1000)
-    
-    # Create max heap (use negative scores for max heap)
-    heap = []
-    
-    job_skills = set([s.lower() for s in job.get("required_skills", [])])
-    
-    for candidate in candidates:
-        candidate_skills = set([s.lower() for s in candidate.get("skills", [])])
-        
-        # Calculate match score
-        skill_overlap = candidate_skills & job_skills
-        skill_score = len(skill_overlap) / len(job_skills) if job_skills else 0
-        
-        # Experience score
-        candidate_exp = candidate.get("experience", 0)
-        min_exp = job.get("min_experience", 0)
-        max_exp = job.get("max_experience", 100)
-        
-        if min_exp <= candidate_exp <= max_exp:
-            exp_score = 1.0
-        else:
-            exp_score = max(0, 1 - abs(candidate_exp - min_exp) * 0.15)
-        
-        # Total score
-        total_score = (skill_score * 0.7) + (exp_score * 0.3)
-        match_percentage = int(total_score * 100)
-        
-        if match_percentage > 30:
-            # Push to heap (negative score for max heap)
-            candidate_copy = candidate.copy()
-            candidate_copy["id"] = str(candidate_copy["_id"])
-            del candidate_copy["_id"]
-            if "password" in candidate_copy:
-                del candidate_copy["password"]
-            heapq.heappush(heap, (
-                -match_percentage,  # Negative for max heap
-                candidate_copy["id"],
-                {
-                    **candidate_copy,
-                    "match_score": match_percentage,
-                    "matched_skills": list(skill_overlap)
-                }
-            ))
-    
-    # Extract ranked candidates
+    profiles = {}
+    cursor = db.users.find(
+        {"id": {"$in": [user_id for user_id, _, _ in entries]}},
+        {"_id": 0, "password": 0}
+    )
+    async for profile in cursor:
+        profiles[profile["id"]] = profile
+
     ranked = []
-    while heap:
-        score, candidate_id, candidate_data = heapq.heappop(heap)
-        ranked.append(candidate_data)
-    
+    for user_id, score, matched_skills in entries:
+        profile = profiles.get(user_id)
+        if profile is None:
+            continue
+        ranked.append({
+            **profile,
+            "match_score": score,
+            "matched_skills": matched_skills
+        })
     return ranked
@@ -0,0 +1,160 @@
+"""
+Token-budget chunking of resume text for the LLM parsers.
+
+Instead of sending only the first characters of a resume, the text is split
+into its sections (experience, education, skills, projects, ...) and the
+sections are packed in document order into chunks of at most
+``CHUNK_TOKEN_BUDGET`` tokens; a section larger than the budget is split on
+line boundaries. Chunks are parsed concurrently and the partial results are
+merged in chunk order, so the same text always gives the same result.
+``experience_years`` is not merged from the chunks: a chunk sees only part
+of a long work history, so it is computed once over the full text from the
+union of its date ranges.
+
+Each chunk goes through the parse cache on its own, keyed by the chunk's
+text, so editing one section only re-parses the chunk that contains it.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from services.local_resume_parser import extract_experience_years, section_blocks
+from utils.logger import get_logger
+
+logger = get_logger("resume_chunking")
+
+CHUNK_TOKEN_BUDGET = int(os.environ.get("CHUNK_TOKEN_BUDGET", "1500"))
+CHUNK_CONCURRENCY = int(os.environ.get("CHUNK_CONCURRENCY", "4"))
+# Rough average for English prose; only used to size chunks
+CHARS_PER_TOKEN = 4
+
+_executor = None
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _split_oversized(text: str, budget: int) -> list:
+    pieces, current = [], []
+    for line in text.splitlines():
+        # A single line over budget is cut hard
+        while estimate_tokens(line) > budget:
+            if current:
+                pieces.append("\n".join(current))
+                current = []
+            pieces.append(line[:budget * CHARS_PER_TOKEN])
+            line = line[budget * CHARS_PER_TOKEN:]
+        if current and estimate_tokens("\n".join(current + [line])) > budget:
+            pieces.append("\n".join(current))
+            current = []
+        current.append(line)
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def chunk_resume(text: str, budget: int = None) -> list:
+    """Pack the resume's sections into chunks of at most ``budget`` tokens"""
+    budget = budget or CHUNK_TOKEN_BUDGET
+    if estimate_tokens(text) <= budget:
+        return [text]
+
+    chunks, current = [], ""
+    for _, block in section_blocks(text):
+        for piece in _split_oversized(block, budget) if estimate_tokens(block) > budget else [block]:
+            candidate = f"{current}\n\n{piece}" if current else piece
+            if current and estimate_tokens(candidate) > budget:
+                chunks.append(current)
+                candidate = piece
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _identity(value) -> str:
+    return json.dumps(value, sort_keys=True).lower() if not isinstance(value, str) else value.strip().lower()
+
+
+def merge_parsed_chunks(results: list) -> dict:
+    """
+    Merge partial parses in chunk order: lists are concatenated without
+    duplicates and text fields take the first non-empty one.
+    ``experience_years`` is left to ``experience_years_for``.
+    """
+    merged = {}
+    seen = {}
+    for result in results:
+        for field, value in result.items():
+            if isinstance(value, list):
+                items = merged.setdefault(field, [])
+                keys = seen.setdefault(field, set())
+                for item in value:
+                    key = _identity(item)
+                    if item and key not in keys:
+                        keys.add(key)
+                        items.append(item)
+            elif field == "experience_years":
+                continue
+            elif value and not merged.get(field):
+                merged[field] = value
+            else:
+                merged.setdefault(field, value)
+    return merged
+
+
+def experience_years_for(text: str, chunks: list, results: list):
+    """
+    Years of experience for the whole resume: the union of the date ranges
+    in the full text. Without any, the largest answer from a chunk that holds
+    the experience section, so chunks without work history cannot add one.
+    """
+    years = extract_experience_years(text)
+    if years:
+        return years
+    answers = []
+    for chunk, result in zip(chunks, results):
+        if result is None or not any(section == "experience" for section, _ in section_blocks(chunk)):
+            continue
+        try:
+            answers.append(float(result.get("experience_years") or 0))
+        except (TypeError, ValueError):
+            continue
+    best = max(answers, default=0)
+    return int(best) if best.is_integer() else best
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=CHUNK_CONCURRENCY, thread_name_prefix="resume-chunk")
+    return _executor
+
+
+def parse_in_chunks(text: str, parse_chunk) -> dict:
+    """
+    Parse ``text`` with ``parse_chunk(chunk_text) -> dict`` one chunk at a
+    time, concurrently. Chunks that fail are left out of the merge; if every
+    chunk fails the first error is raised.
+    """
+    chunks = chunk_resume(text)
+    if len(chunks) == 1:
+        return parse_chunk(chunks[0])
+
+    logger.info(f"Parsing resume in {len(chunks)} chunks of up to {CHUNK_TOKEN_BUDGET} tokens")
+    futures = [_get_executor().submit(parse_chunk, chunk) for chunk in chunks]
+    results, errors = [], []
+    for i, future in enumerate(futures):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            logger.warning(f"Resume chunk {i + 1}/{len(chunks)} failed: {e}")
+            results.append(None)
+            errors.append(e)
+    if len(errors) == len(chunks):
+        raise errors[0]
+    merged = merge_parsed_chunks([result for result in results if result is not None])
+    merged["experience_years"] = experience_years_for(text, chunks, results)
+    return merged
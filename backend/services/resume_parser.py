@@ -1,12 +1,19 @@
 import google.generativeai as genai
 import os
-import json
-import PyPDF2
 import logging
-import re
 from utils.logger import get_logger
 from utils.env_utils import get_api_key, is_openrouter_key
 from services.openrouter_parser import parse_resume_with_openrouter
+from services.llm_output import apply_reask, parse_metrics, parse_resume_output, reask_prompt
+from services.local_resume_parser import (
+    LOCAL_CONFIDENCE_THRESHOLD, REQUIRED_FIELDS,
+    extract_experience_years, extract_job_titles, extract_skills, is_confident, parse_resume_locally
+)
+from services.model_health import ModelHealthRegistry
+from services.skill_matcher import canonicalize_skills
+from services.parse_cache import get_parse_cache, parsed_key, sha256_file, sha256_hex
+from services.pdf_extraction import extract_pdf_text, is_bytes
+from services.resume_chunking import parse_in_chunks
 
 # Get logger
 logger = get_logger("resume_parser")
@@ -21,6 +28,11 @@ IS_OPENROUTER_API_KEY = is_openrouter_key(GEMINI_API_KEY)
 if IS_OPENROUTER_API_KEY:
     logger.info("Detected OpenRouter API key - will use OpenRouter integration")
 
+# Bump when the parsing prompts change so cached results are not reused
+PROMPT_VERSION = "2"
+# Extraction budget; the LLM parsers receive the text in token-sized chunks
+RESUME_TEXT_LIMIT = int(os.environ.get("RESUME_TEXT_LIMIT", "20000"))
+
 # List of models to try in order if the configured one fails
 FALLBACK_MODELS = [
     'gemini-pro', 
@@ -41,6 +53,56 @@ if GEMINI_API_KEY:
 else:
     logger.warning("GEMINI_API_KEY not found in environment variables. Resume parsing will use manual extraction.")
 
+def _safety_settings():
+    """Relaxed safety settings to improve success rate, if the SDK supports them"""
+    try:
+        from google.generativeai.types import HarmCategory, HarmBlockThreshold
+        return {
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+        }
+    except Exception:
+        return None
+
+def probe_gemini_model(model_name: str) -> None:
+    """Cheap request that raises if the model cannot be used"""
+    genai.GenerativeModel(model_name).generate_content(
+        "Return the text 'OK'",
+        safety_settings=_safety_settings(),
+        request_options={"timeout": 10}
+    )
+
+# Tracks which model works so parsing does not probe on every resume
+gemini_models = ModelHealthRegistry(
+    [GEMINI_MODEL] + FALLBACK_MODELS,
+    probe=probe_gemini_model if GEMINI_API_KEY and not IS_OPENROUTER_API_KEY else None
+)
+
+def _generate_with_gemini(prompt: str, safety_settings) -> str:
+    """Send ``prompt`` to the first working Gemini model and return the response text"""
+    # The cached working model comes first; models with an open circuit are skipped
+    last_error = None
+    for model_name in gemini_models.candidates():
+        try:
+            logger.info(f"Sending request to Gemini API ({model_name})")
+            response = genai.GenerativeModel(model_name).generate_content(
+                prompt,
+                safety_settings=safety_settings,
+                generation_config={"temperature": 0},  # Lower temperature for more deterministic results
+                request_options={"timeout": 30}
+            )
+            gemini_models.record_success(model_name)
+            return response.text
+        except Exception as e:
+            gemini_models.record_failure(model_name, e)
+            last_error = e
+    
+    # If no models worked, raise error
+    logger.error(f"All models failed. Last error: {last_error}")
+    raise ValueError(f"No working Gemini models found: {last_error}")
+
 def parse_resume_with_ai(resume_text: str) -> dict:
     """
     Parse resume text using Gemini AI or OpenRouter API to extract structured data.
@@ -61,59 +123,13 @@ def parse_resume_with_ai(resume_text: str) -> dict:
     
     # Otherwise use Gemini API (Google's API)
     try:
-        # Setup for safety settings to improve success rate
-        try:
-            from google.generativeai.types import HarmCategory, HarmBlockThreshold
-            safety_settings = {
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-            }
-        except Exception:
-            safety_settings = None
-            
-        # First, try the configured model
-        all_models_to_try = [GEMINI_MODEL] + [m for m in FALLBACK_MODELS if m != GEMINI_MODEL]
-        
-        model = None
-        model_name = None
-        last_error = None
-        
-        for model_name_to_try in all_models_to_try:
-            try:
-                logger.info(f"Attempting to use model: {model_name_to_try}")
-                model = genai.GenerativeModel(model_name_to_try)
-                
-                # Quick test to see if model works
-                test_response = model.generate_content(
-                    "Return the text 'OK'",
-                    safety_settings=safety_settings,
-                    request_options={"timeout": 10}
-                )
-                
-                # If we get here without error, model works
-                logger.info(f"Successfully connected to model: {model_name_to_try}")
-                model_name = model_name_to_try
-                break
-                
-            except Exception as e:
-                logger.warning(f"Failed to use model {model_name_to_try}: {e}")
-                last_error = e
-        
-        # If no models worked, raise error
-        if model is None:
-            logger.error(f"All models failed. Last error: {last_error}")
-            raise ValueError(f"No working Gemini models found: {last_error}")
+        safety_settings = _safety_settings()
             
-        # Truncate resume text if too long (keep first 2000 chars)
-        resume_text_truncated = resume_text[:2000] if len(resume_text) > 2000 else resume_text
-        
         # Create an enhanced prompt to extract comprehensive profile information
         prompt = f"""Extract key information from this resume text.
         
 Resume text:
-{resume_text_truncated}
+{resume_text}
 
 Extract and return ONLY a JSON object with this exact structure:
 {{
@@ -153,48 +169,24 @@ Instructions:
 - For missing fields, use empty strings or empty arrays
 - Return valid JSON only, no explanations."""
         
-        logger.info("Sending request to Gemini API")
-        
-        # Use request_options to set shorter timeout to avoid hanging
-        # No try-except - let any errors propagate up
-        response = model.generate_content(
-            prompt,
-            safety_settings=safety_settings,
-            generation_config={"temperature": 0},  # Lower temperature for more deterministic results
-            request_options={"timeout": 30}
-        )
-        
-        # Parse JSON response
-        response_text = response.text.strip()
-        
-        # Try to find JSON in response (handle markdown code blocks)
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
-        
-        # Additional clean-up: Find anything that looks like JSON with curly braces
-        json_pattern = r'({[\s\S]*})'
-        json_match = re.search(json_pattern, response_text)
-        if json_match:
-            response_text = json_match.group(1)
-            
+        response_text = _generate_with_gemini(prompt, safety_settings)
+        parse_metrics.record(llm_calls=1)
+        try:
+            parsed_data, missing = parse_resume_output(response_text)
+        except ValueError:
+            parse_metrics.record(wasted_llm_calls=1)
+            raise
         logger.debug(f"Gemini response received and processed")
         
-        # No fallback - let JSON parsing errors propagate up
-        parsed_data = json.loads(response_text)
-        
-        # Validate and clean data
-        if "skills" not in parsed_data:
-            parsed_data["skills"] = []
-        if "experience_years" not in parsed_data:
-            parsed_data["experience_years"] = 0
-        if "education" not in parsed_data:
-            parsed_data["education"] = []
-        if "achievements" not in parsed_data:
-            parsed_data["achievements"] = []
-        if "job_titles" not in parsed_data:
-            parsed_data["job_titles"] = []
+        # Ask again only for the fields the answer left out
+        if missing:
+            logger.info(f"Gemini response missing {missing}; asking for those fields")
+            try:
+                reask_text = _generate_with_gemini(reask_prompt(resume_text, missing), safety_settings)
+                parsed_data = apply_reask(parsed_data, missing, reask_text)
+            except Exception as e:
+                parse_metrics.record(llm_calls=1, reasks=1, wasted_llm_calls=1)
+                logger.warning(f"Re-ask for missing fields failed: {e}")
             
         # Add parsing method info
         parsed_data["parsing_method"] = "gemini_ai"
@@ -208,132 +200,121 @@ Instructions:
         raise  # Re-raise the exception to be handled by the caller
 
 def extract_skills_fallback(text: str) -> list:
-    """Fallback skill extraction using keywords"""
-    common_skills = [
-        "Python", "Java", "JavaScript", "TypeScript", "React", "Angular", "Vue",
-        "Node.js", "Express", "Django", "Flask", "FastAPI",
-        "SQL", "PostgreSQL", "MySQL", "MongoDB", "Redis",
-        "AWS", "Azure", "GCP", "Docker", "Kubernetes",
-        "Git", "CI/CD", "Jenkins", "GitHub Actions",
-        "Machine Learning", "AI", "Data Science", "TensorFlow", "PyTorch",
-        "HTML", "CSS", "REST API", "GraphQL",
-        "Agile", "Scrum", "Project Management", "Leadership",
-        "Communication", "Problem Solving", "Team Collaboration"
-    ]
-    
-    text_lower = text.lower()
-    found_skills = []
-    
-    for skill in common_skills:
-        if skill.lower() in text_lower:
-            found_skills.append(skill)
-    
-    # Remove duplicates and return top 15
-    return list(set(found_skills))[:15]
+    """Fallback skill extraction using the skill vocabulary automaton"""
+    return extract_skills(text)[:15]
 
 def extract_job_titles_fallback(text: str) -> list:
     """Fallback job title extraction using regex patterns and common job titles"""
-    common_titles = [
-        "Software Engineer", "Senior Software Engineer", "Software Developer", 
-        "Full Stack Developer", "Frontend Developer", "Backend Developer",
-        "DevOps Engineer", "Data Scientist", "Data Engineer", "Machine Learning Engineer",
-        "Product Manager", "Project Manager", "Technical Lead", "Team Lead",
-        "Engineering Manager", "CTO", "CEO", "Director", "VP of Engineering",
-        "QA Engineer", "UI/UX Designer", "Database Administrator", "System Administrator",
-        "Cloud Engineer", "Security Engineer", "Mobile Developer", "Android Developer",
-        "iOS Developer", "Web Developer", "Network Engineer"
-    ]
-    
-    # Patterns to extract job titles from typical resume formats
-    patterns = [
-        r'(?:^|\n)([A-Za-z\s]+(?:Engineer|Developer|Scientist|Analyst|Manager|Designer|Administrator|Architect|Lead|Director|VP|CTO|CEO))(?:\s*\||\sat\s|\n)',
-        r'(?:^|\n)(?:Title|Position|Role):\s*([A-Za-z\s]+(?:Engineer|Developer|Scientist|Analyst|Manager|Designer|Administrator|Architect|Lead|Director|VP|CTO|CEO))',
-        r'(?:^|\n)([A-Za-z\s]+(?:Engineer|Developer|Scientist|Analyst|Manager|Designer|Administrator|Architect|Lead|Director|VP|CTO|CEO))\s*\d{4}\s*-',
-    ]
-    
-    found_titles = []
-    
-    # Extract from patterns
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        found_titles.extend([match.strip() for match in matches if match.strip()])
-    
-    # Look for known job titles
-    for title in common_titles:
-        if title.lower() in text.lower():
-            found_titles.append(title)
-    
-    # Remove duplicates and similar titles (keep longest)
-    unique_titles = []
-    for title in sorted(found_titles, key=len, reverse=True):
-        is_unique = True
-        for unique_title in unique_titles:
-            if title.lower() in unique_title.lower() or unique_title.lower() in title.lower():
-                is_unique = False
-                break
-        if is_unique:
-            unique_titles.append(title)
-    
-    return unique_titles[:5]  # Return top 5 job titles
+    return extract_job_titles(text)
 
 def extract_experience_fallback(text: str) -> int:
     """Fallback experience extraction"""
-    import re
-    
-    # Look for patterns like "5 years", "5+ years", "2020-2024", etc.
-    patterns = [
-        r'(\d+)\s*(?:\+)?\s*years?\s+(?:of\s+)?experience',
-        r'experience\s+(?:of\s+)?(\d+)\s*(?:\+)?\s*years?',
-        r'(\d{4})\s*-\s*(\d{4})',  # Year ranges like 2020-2024
-        r'(\d{4})\s*-\s*present',  # 2020-present
-    ]
-    
-    years = []
-    
-    # Try to find year patterns
-    for pattern in patterns[:2]:
-        matches = re.findall(pattern, text.lower())
-        for match in matches:
-            if isinstance(match, str):
-                years.append(int(match))
-    
-    # Try to find year ranges
-    year_range_pattern = r'(\d{4})\s*-\s*(\d{4}|present)'
-    year_ranges = re.findall(year_range_pattern, text.lower())
-    current_year = 2025  # Setting to 2025 for future-proofing
-    for start, end in year_ranges:
-        end_year = current_year if end.lower() == 'present' else int(end)
-        start_year = int(start)
-        if start_year <= current_year and start_year < end_year:  # Validate years
-            years.append(end_year - start_year)
-    
-    return max(years) if years else 0
+    return extract_experience_years(text)
 
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text content from PDF file"""
+def extract_text_from_pdf(source, max_chars: int = None) -> str:
+    """Extract text content from a PDF file path or in-memory bytes"""
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            
-            # Log PDF information for debugging
-            logger = get_logger("resume_parser")
-            logger.info(f"PDF has {len(pdf_reader.pages)} pages")
-            
-            for i, page in enumerate(pdf_reader.pages):
-                page_text = page.extract_text()
-                logger.info(f"Page {i+1} extracted {len(page_text)} characters")
-                text += page_text + "\n"
-            
-            # Clean up the text
-            text = text.strip()
-            logger.info(f"Total extracted text length: {len(text)}")
-            
-            if len(text) == 0:
-                logger.warning("No text could be extracted from PDF - may be image-based or corrupted")
-            
-            return text
+        text, _ = extract_pdf_text(source, max_chars)
+        if len(text) == 0:
+            logger.warning("No text could be extracted from PDF - may be image-based or corrupted")
+        return text
     except Exception as e:
-        logger = get_logger("resume_parser")
         logger.error(f"Error extracting PDF text: {e}")
         return ""
+
+def parser_identity() -> str:
+    """Which provider/model produces parsed results, for cache keys"""
+    if IS_OPENROUTER_API_KEY:
+        return "openrouter"
+    return f"gemini:{GEMINI_MODEL}"
+
+def extract_text_cached(source, max_chars: int = RESUME_TEXT_LIMIT, content_hash: str = None) -> str:
+    """
+    ``extract_text_from_pdf`` behind the content-addressed text cache.
+    ``source`` is PDF bytes or a file path; pass ``content_hash`` when the
+    SHA-256 is already known (e.g. computed while the upload streamed in).
+    """
+    key = content_hash or (sha256_hex(source) if is_bytes(source) else sha256_file(source))
+    cache = get_parse_cache()
+    cached = cache.get("text", key)
+    # A prefix cached under a smaller budget cannot serve a larger one
+    if cached is not None and (not cached.get("truncated") or len(cached["text"]) >= (max_chars or float("inf"))):
+        return cached["text"]
+
+    try:
+        text, truncated = extract_pdf_text(source, max_chars)
+    except Exception as e:
+        logger.error(f"Error extracting PDF text: {e}")
+        return ""
+    if text:
+        cache.set("text", key, {"text": text, "truncated": truncated})
+    else:
+        logger.warning("No text could be extracted from PDF - may be image-based or corrupted")
+    return text
+
+def parse_resume_cached(resume_text: str) -> dict:
+    """``parse_resume_with_ai`` behind the content-addressed parse cache"""
+    key = parsed_key(resume_text, PROMPT_VERSION, parser_identity())
+    cache = get_parse_cache()
+    cached = cache.get("parsed", key)
+    if cached is not None:
+        logger.info("Resume parse cache hit")
+        return cached
+
+    parsed_data = parse_resume_with_ai(resume_text)
+    cache.set("parsed", key, parsed_data)
+    return parsed_data
+
+def parse_resume_chunked(resume_text: str) -> dict:
+    """LLM parse of the whole resume: section chunks parsed concurrently, each cached on its own"""
+    return parse_in_chunks(resume_text, parse_resume_cached)
+
+def parse_resume_tiered(resume_text: str, local: dict = None) -> dict:
+    """
+    Parse with the local parser first and call the LLM only when needed.
+
+    - A confident local result (no required field missing and confidence
+      at or above ``LOCAL_CONFIDENCE_THRESHOLD``) is returned as is; the
+      LLM is not called.
+    - Otherwise the resume goes to the chunked LLM parse. If the local
+      confidence still reaches the threshold, only required fields were
+      missing: the local result is kept and the LLM fills its empty fields.
+      Below the threshold the LLM result wins and local values fill its
+      gaps. Skills are canonicalized and ``parsing_method`` becomes
+      ``local+<llm method>``.
+    - If the LLM fails, the local result is returned, unless it found none
+      of the required fields, in which case the error is raised.
+
+    Pass ``local`` when the caller has already run ``parse_resume_locally``
+    on the same text.
+    """
+    local = dict(local) if local is not None else parse_resume_locally(resume_text)
+    confident = is_confident(local)
+    confidence = local.pop("confidence")
+    missing = local.pop("missing_fields")
+    if confident:
+        logger.info(f"Resume parsed locally (confidence {confidence})")
+        return local
+
+    logger.info(f"Local parse not sufficient (confidence {confidence}, missing {missing}); calling LLM")
+    try:
+        llm = parse_resume_chunked(resume_text)
+    except Exception as e:
+        if len(missing) == len(REQUIRED_FIELDS):
+            raise
+        logger.warning(f"LLM parsing failed, keeping local result: {e}")
+        return local
+    # Once per resume, however many chunks and re-asks it took
+    parse_metrics.record(successful_parses=1)
+
+    if confidence >= LOCAL_CONFIDENCE_THRESHOLD:
+        primary, secondary = local, llm
+    else:
+        primary, secondary = llm, local
+    parsed_data = dict(primary)
+    for field, value in secondary.items():
+        if not parsed_data.get(field):
+            parsed_data[field] = value
+    parsed_data["skills"] = canonicalize_skills(parsed_data.get("skills", []))
+    parsed_data["parsing_method"] = f"local+{llm.get('parsing_method', 'ai')}"
+    return parsed_data
@@ -0,0 +1,226 @@
+"""
+Background resume parsing.
+
+``POST /api/resume/upload`` only stores the PDF and registers a parse job in
+``resume_parse_jobs``. A fixed number of worker tasks take jobs from a queue
+and run the blocking steps (PDF extraction, the LLM call) in a thread pool of
+the same size, so slow LLM responses never stall the event loop and at most
+``RESUME_PARSE_WORKERS`` parses run at once. Each job moves through
+``queued -> extracting -> parsing -> done`` (or ``failed``); unfinished jobs
+are re-queued on startup.
+"""
+
+import asyncio
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from services.change_hooks import on_candidate_saved
+from services.resume_parser import IS_OPENROUTER_API_KEY, RESUME_TEXT_LIMIT, extract_text_cached, parse_resume_tiered
+from utils.db import get_database
+from utils.logger import get_logger
+
+logger = get_logger("resume_pipeline")
+
+RESUME_PARSE_WORKERS = int(os.environ.get("RESUME_PARSE_WORKERS", "4"))
+
+QUEUED = "queued"
+EXTRACTING = "extracting"
+PARSING = "parsing"
+DONE = "done"
+FAILED = "failed"
+UNFINISHED = [QUEUED, EXTRACTING, PARSING]
+
+_queue = None
+_workers = []
+_executor = None
+
+
+class ParseFailed(Exception):
+    """A parse failure with the HTTP status the upload used to answer with"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _api_type() -> str:
+    return "OpenRouter" if IS_OPENROUTER_API_KEY else "Gemini"
+
+
+def _as_failure(e: Exception) -> ParseFailed:
+    if isinstance(e, ParseFailed):
+        return e
+    if isinstance(e, ValueError):
+        return ParseFailed(
+            503,
+            f"{_api_type()} API is required for resume parsing but is not properly configured. Please check your API key."
+        )
+    if "API" in str(e) or "key" in str(e).lower():
+        return ParseFailed(
+            503,
+            f"{_api_type()} API service is currently unavailable or improperly configured. Please check your API key."
+        )
+    return ParseFailed(500, f"Failed to process resume with {_api_type()} API: {str(e)}")
+
+
+def _profile_update(parsed_data: dict, job: dict) -> dict:
+    return {
+        "skills": parsed_data.get("skills", []),
+        "experience": parsed_data.get("experience_years", 0),
+        "education": parsed_data.get("education", []),
+        "achievements": parsed_data.get("achievements", []),
+        "job_titles": parsed_data.get("job_titles", []),
+        "resume_file": job["file_path"],
+        "resume_filename": job["filename"],
+        "resume_uploaded_at": datetime.now().isoformat(),
+        "profile_complete": True,
+        # Additional profile details from resume
+        "bio": parsed_data.get("summary", ""),
+        "phone": parsed_data.get("phone", ""),
+        "location": parsed_data.get("location", ""),
+        "certifications": parsed_data.get("certifications", []),
+        "languages": parsed_data.get("languages", []),
+        "projects": parsed_data.get("projects", [])
+    }
+
+
+async def _set_status(job_id: str, status: str, **fields) -> None:
+    db = get_database()
+    await db.resume_parse_jobs.update_one(
+        {"id": job_id},
+        {"$set": {"status": status, "updated_at": datetime.utcnow(), **fields}}
+    )
+
+
+async def _process(job: dict) -> None:
+    db = get_database()
+    loop = asyncio.get_running_loop()
+    job_id = job["id"]
+
+    await _set_status(job_id, EXTRACTING, started_at=datetime.utcnow())
+    resume_text = await loop.run_in_executor(
+        _executor, extract_text_cached, job["file_path"], RESUME_TEXT_LIMIT, job.get("content_hash")
+    )
+    if not resume_text or resume_text.strip() == "":
+        try:
+            os.remove(job["file_path"])
+        except OSError:
+            pass
+        raise ParseFailed(
+            400,
+            "Could not extract text from PDF. This may be an image-based PDF or the file may be corrupted. Please try uploading a text-based PDF or convert your document to text format."
+        )
+
+    await _set_status(job_id, PARSING)
+    parsed_data = await loop.run_in_executor(_executor, parse_resume_tiered, resume_text)
+    parsing_method = parsed_data.get("parsing_method", "ai")
+    if parsing_method == "local":
+        parsing_method_msg = "the local parser"
+    else:
+        parsing_method_msg = "OpenRouter AI" if "openrouter" in parsing_method else "Gemini AI"
+
+    update_data = _profile_update(parsed_data, job)
+    await db.users.update_one({"id": job["user_id"]}, {"$set": update_data})
+    user = await db.users.find_one({"id": job["user_id"]}, {"_id": 0, "password": 0})
+    if user:
+        await on_candidate_saved(user)
+
+    await _set_status(
+        job_id,
+        DONE,
+        message=f"Resume uploaded and parsed successfully with {parsing_method_msg}",
+        parsed_data=parsed_data,
+        parsing_method=parsing_method,
+        finished_at=datetime.utcnow()
+    )
+    logger.info(f"Resume parse job {job_id} parsed using {parsing_method_msg}")
+
+
+async def _worker() -> None:
+    while True:
+        job = await _queue.get()
+        try:
+            await _process(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            failure = _as_failure(e)
+            logger.error(f"Resume parse job {job['id']} failed: {e}")
+            await _set_status(
+                job["id"],
+                FAILED,
+                error=failure.detail,
+                error_status=failure.status_code,
+                finished_at=datetime.utcnow()
+            )
+        finally:
+            _queue.task_done()
+
+
+def _ensure_workers() -> None:
+    global _queue, _executor
+    if _workers:
+        return
+    _queue = asyncio.Queue()
+    _executor = ThreadPoolExecutor(max_workers=RESUME_PARSE_WORKERS, thread_name_prefix="resume-parse")
+    for _ in range(RESUME_PARSE_WORKERS):
+        _workers.append(asyncio.create_task(_worker()))
+
+
+def shutdown_workers() -> None:
+    """Stop the workers; unfinished jobs are picked up again on next startup"""
+    global _executor
+    for worker in _workers:
+        worker.cancel()
+    _workers.clear()
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def submit_parse_job(user_id: str, file_path: str, filename: str, content_hash: str = None) -> dict:
+    """Register a parse job for a stored PDF and queue it"""
+    db = get_database()
+    now = datetime.utcnow()
+    job = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "status": QUEUED,
+        "file_path": file_path,
+        "filename": filename,
+        "content_hash": content_hash,
+        "created_at": now,
+        "updated_at": now
+    }
+    await db.resume_parse_jobs.insert_one(job)
+    job.pop("_id", None)
+
+    _ensure_workers()
+    await _queue.put(job)
+    return job
+
+
+async def recover_parse_jobs() -> int:
+    """Re-queue jobs left unfinished by a previous process"""
+    db = get_database()
+    jobs = await db.resume_parse_jobs.find({"status": {"$in": UNFINISHED}}, {"_id": 0}).to_list(length=None)
+    if not jobs:
+        return 0
+    _ensure_workers()
+    for job in jobs:
+        await _set_status(job["id"], QUEUED)
+        await _queue.put(job)
+    logger.info(f"Re-queued {len(jobs)} unfinished resume parse jobs")
+    return len(jobs)
+
+
+async def get_parse_job(job_id: str, user_id: str):
+    """Get a parse job's status document for its owner, or None"""
+    db = get_database()
+    return await db.resume_parse_jobs.find_one(
+        {"id": job_id, "user_id": user_id},
+        {"_id": 0, "file_path": 0}
+    )
@@ -0,0 +1,281 @@
+"""
+Candidate x job scoring shared by every matcher.
+
+The 70/30 skill/experience formula lives in one versioned ``ScoringFunction``
+with a scalar entry point (one pair of pre-normalized skill sets) and array
+entry points used by ``MatchScorer`` for dense NumPy blocks and sparse CSR
+blocks. Skills are encoded once into a shared vocabulary and whole blocks of
+candidates are scored with a single sparse matrix product.
+
+The active version is chosen with ``SCORING_VERSION`` and is stored on every
+persisted score (match edges, matches, job rankings) and in the
+recommendation cache key, so switching versions invalidates old scores.
+"""
+
+import os
+
+import numpy as np
+from scipy import sparse
+
+SKILL_WEIGHT = 0.7
+EXPERIENCE_WEIGHT = 0.3
+EXPERIENCE_PENALTY = 0.1
+DEFAULT_BLOCK_SIZE = 1024
+
+
+def normalize_skill(skill: str) -> str:
+    """Normalize a skill name for comparison"""
+    return skill.lower()
+
+
+def skill_set(skills) -> frozenset:
+    """Normalized skill set; compute once per document and reuse across pairs"""
+    return frozenset(normalize_skill(skill) for skill in skills or [])
+
+
+def _number(value, default) -> float:
+    return float(default if value is None else value)
+
+
+def candidate_features(candidate: dict) -> tuple:
+    """``(skill_set, experience)`` for a candidate document"""
+    return skill_set(candidate.get("skills", [])), _number(candidate.get("experience"), 0)
+
+
+def job_features(job: dict) -> tuple:
+    """``(skill_set, min_experience, max_experience)`` for a job document"""
+    return (
+        skill_set(job.get("required_skills", [])),
+        _number(job.get("min_experience"), 0),
+        _number(job.get("max_experience"), 100)
+    )
+
+
+def to_percentage(weight: float) -> int:
+    """Integer match percentage shown to users"""
+    return int(weight * 100)
+
+
+class ScoringFunction:
+    """
+    One version of the skill/experience formula.
+
+    Candidates inside ``[min_experience, max_experience]`` get full experience
+    credit; otherwise credit drops by ``experience_penalty`` per year away from
+    ``min_experience``.
+    """
+
+    def __init__(self, version: str, skill_weight: float, experience_weight: float, experience_penalty: float):
+        self.version = version
+        self.skill_weight = skill_weight
+        self.experience_weight = experience_weight
+        self.experience_penalty = experience_penalty
+
+    def score(self, candidate_skills: frozenset, experience, job_skills: frozenset, min_exp, max_exp) -> tuple:
+        """Scalar entry point; returns ``(weight, matched_skills)``"""
+        overlap = candidate_skills & job_skills
+        skill_score = len(overlap) / len(job_skills) if job_skills else 0
+
+        if min_exp <= experience <= max_exp:
+            exp_score = 1.0
+        else:
+            exp_score = max(0, 1 - abs(experience - min_exp) * self.experience_penalty)
+
+        return (skill_score * self.skill_weight) + (exp_score * self.experience_weight), overlap
+
+    def score_docs(self, candidate: dict, job: dict) -> tuple:
+        """Score raw documents; in loops, compute the features once and call ``score``"""
+        return self.score(*candidate_features(candidate), *job_features(job))
+
+    def score_arrays(self, overlap, job_skill_counts, experience, min_exp, max_exp) -> np.ndarray:
+        """Batch entry point over broadcastable NumPy arrays"""
+        skill_score = np.divide(
+            overlap,
+            job_skill_counts,
+            out=np.zeros(np.broadcast(overlap, job_skill_counts).shape, dtype=np.float64),
+            where=job_skill_counts > 0
+        )
+
+        in_range = (min_exp <= experience) & (experience <= max_exp)
+        penalty = np.maximum(0.0, 1 - np.abs(experience - min_exp) * self.experience_penalty)
+        exp_score = np.where(in_range, 1.0, penalty)
+
+        return (skill_score * self.skill_weight) + (exp_score * self.experience_weight)
+
+
+SCORING_FUNCTIONS = {
+    "v1": ScoringFunction("v1", SKILL_WEIGHT, EXPERIENCE_WEIGHT, EXPERIENCE_PENALTY),
+}
+
+SCORING_VERSION = os.getenv("SCORING_VERSION", "v1")
+
+
+def register_scoring_function(function: ScoringFunction) -> None:
+    """Make another formula version selectable through ``SCORING_VERSION``"""
+    SCORING_FUNCTIONS[function.version] = function
+
+
+def get_scoring_function(version: str = None) -> ScoringFunction:
+    """Get a scoring function by version, defaulting to the configured one"""
+    version = version or SCORING_VERSION
+    if version not in SCORING_FUNCTIONS:
+        raise ValueError(f"Unknown scoring version: {version}")
+    return SCORING_FUNCTIONS[version]
+
+
+def entity_id(doc: dict) -> str:
+    """Return the application-level id of a candidate or job document"""
+    return doc["id"] if "id" in doc else str(doc["_id"])
+
+
+class SkillVocabulary:
+    """Maps normalized skill names to matrix column indices"""
+
+    def __init__(self):
+        self.index = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def encode(self, skills: list) -> list:
+        """Return the sorted, de-duplicated column indices for a skill list"""
+        columns = set()
+        for skill in skills or []:
+            key = normalize_skill(skill)
+            column = self.index.get(key)
+            if column is None:
+                column = len(self.index)
+                self.index[key] = column
+            columns.add(column)
+        return sorted(columns)
+
+
+def build_skill_matrix(encoded: list, n_skills: int) -> sparse.csr_matrix:
+    """Build a binary CSR matrix from per-row column index lists"""
+    indptr = np.zeros(len(encoded) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(columns) for columns in encoded])
+    indices = np.fromiter(
+        (column for columns in encoded for column in columns),
+        dtype=np.int32,
+        count=int(indptr[-1])
+    )
+    data = np.ones(len(indices), dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(encoded), n_skills))
+
+
+class MatchScorer:
+    """
+    Holds the encoded candidate and job sides and computes edge weights.
+    """
+
+    def __init__(self, candidates: list, jobs: list, scoring: ScoringFunction = None):
+        self.scoring = scoring or get_scoring_function()
+        self.pairs_evaluated = 0
+        self.vocabulary = SkillVocabulary()
+        self.candidate_ids = [entity_id(c) for c in candidates]
+        self.job_ids = [entity_id(j) for j in jobs]
+
+        candidate_rows = [self.vocabulary.encode(c.get("skills", [])) for c in candidates]
+        job_rows = [self.vocabulary.encode(j.get("required_skills", [])) for j in jobs]
+        n_skills = len(self.vocabulary)
+
+        self.candidate_matrix = build_skill_matrix(candidate_rows, n_skills)
+        # Transposed once so every block product is (block x V) @ (V x jobs)
+        self.job_matrix_t = build_skill_matrix(job_rows, n_skills).T.tocsc()
+
+        self.candidate_experience = np.array(
+            [_number(c.get("experience"), 0) for c in candidates], dtype=np.float64
+        )
+        self.job_skill_counts = np.array([len(row) for row in job_rows], dtype=np.float64)
+        self.job_min_experience = np.array(
+            [_number(j.get("min_experience"), 0) for j in jobs], dtype=np.float64
+        )
+        self.job_max_experience = np.array(
+            [_number(j.get("max_experience"), 100) for j in jobs], dtype=np.float64
+        )
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self.candidate_ids), len(self.job_ids))
+
+    def weight_block(self, start: int, stop: int) -> np.ndarray:
+        """Dense weights for candidate rows ``start:stop`` against every job"""
+        overlap = (self.candidate_matrix[start:stop] @ self.job_matrix_t).toarray()
+        return self.scoring.score_arrays(
+            overlap,
+            self.job_skill_counts,
+            self.candidate_experience[start:stop, None],
+            self.job_min_experience,
+            self.job_max_experience
+        )
+
+    def iter_blocks(self, block_size: int = DEFAULT_BLOCK_SIZE):
+        """Yield ``(start, weights)`` row blocks covering every candidate"""
+        n_candidates = len(self.candidate_ids)
+        for start in range(0, n_candidates, block_size):
+            stop = min(start + block_size, n_candidates)
+            yield start, self.weight_block(start, stop)
+
+    def weight_matrix(self) -> np.ndarray:
+        """Full dense candidate x job weight matrix"""
+        if not self.candidate_ids:
+            return np.zeros(self.shape, dtype=np.float64)
+        return np.vstack([block for _, block in self.iter_blocks()])
+
+    def pair_weights(self, rows: np.ndarray, cols: np.ndarray, overlap: np.ndarray) -> np.ndarray:
+        """Weights for individual (candidate row, job column) pairs with known overlap"""
+        return self.scoring.score_arrays(
+            overlap,
+            self.job_skill_counts[cols],
+            self.candidate_experience[rows],
+            self.job_min_experience[cols],
+            self.job_max_experience[cols]
+        )
+
+    def sparse_block(self, start: int, stop: int, threshold: float = 0.3) -> sparse.csr_matrix:
+        """
+        Weights above ``threshold`` for candidate rows ``start:stop``.
+
+        When a pair without any shared skill cannot pass the threshold, only the
+        non-zero entries of the sparse overlap product are scored.
+        """
+        if threshold < self.scoring.experience_weight:
+            block = self.weight_block(start, stop)
+            return sparse.csr_matrix(np.where(block > threshold, block, 0.0))
+
+        overlap = (self.candidate_matrix[start:stop] @ self.job_matrix_t).tocsr()
+        overlap.sort_indices()
+        rows = np.repeat(np.arange(stop - start), np.diff(overlap.indptr))
+        cols = overlap.indices
+        weights = self.pair_weights(rows + start, cols, overlap.data)
+        self.pairs_evaluated += len(weights)
+
+        keep = weights > threshold
+        return sparse.csr_matrix(
+            (weights[keep], (rows[keep], cols[keep])),
+            shape=(stop - start, len(self.job_ids))
+        )
+
+    def iter_sparse_blocks(self, threshold: float = 0.3, block_size: int = DEFAULT_BLOCK_SIZE):
+        """Yield ``(start, csr weights above threshold)`` row blocks"""
+        n_candidates = len(self.candidate_ids)
+        for start in range(0, n_candidates, block_size):
+            stop = min(start + block_size, n_candidates)
+            yield start, self.sparse_block(start, stop, threshold)
+
+    def sparse_weights(self, threshold: float = 0.3, block_size: int = DEFAULT_BLOCK_SIZE) -> sparse.csr_matrix:
+        """Weights strictly above ``threshold`` as a CSR matrix, built block by block"""
+        blocks = [block for _, block in self.iter_sparse_blocks(threshold, block_size)]
+        if not blocks:
+            return sparse.csr_matrix(self.shape, dtype=np.float64)
+        return sparse.vstack(blocks, format="csr")
+
+    def edges(self, threshold: float = 0.3, block_size: int = DEFAULT_BLOCK_SIZE):
+        """Yield ``(candidate_id, job_id, weight)`` for every pair above ``threshold``"""
+        for start, block in self.iter_sparse_blocks(threshold, block_size):
+            block.sort_indices()
+            for row in range(block.shape[0]):
+                candidate_id = self.candidate_ids[start + row]
+                lo, hi = block.indptr[row], block.indptr[row + 1]
+                for col, weight in zip(block.indices[lo:hi].tolist(), block.data[lo:hi].tolist()):
+                    yield candidate_id, self.job_ids[col], weight
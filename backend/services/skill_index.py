@@ -0,0 +1,182 @@
+"""
+In-memory inverted index from normalized skill to candidate ids and active
+job ids. A pair with no shared skill scores at most the experience weight,
+so whenever the match threshold is at or above it the index yields exactly
+the pairs worth scoring.
+
+The index only exists in this process. Until it has been built,
+``can_prune`` is False and callers score every pair. Writes from other
+processes (``bulk_import_resumes.py``) call ``mark_skill_index_stale``, and
+the server's refresh loop rebuilds the index when it sees the marker, or
+retries a build that failed at startup.
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+
+from services.scoring_engine import entity_id, get_scoring_function, normalize_skill
+from utils.db import get_database
+from utils.logger import get_logger
+
+logger = get_logger("skill_index")
+
+REFRESH_INTERVAL_SECONDS = 60
+STATE_ID = "skill_index"
+
+
+def can_prune(threshold: float) -> bool:
+    """
+    True when the index is built and pairs without a shared skill can never
+    pass ``threshold``
+    """
+    return _skill_index is not None and threshold >= get_scoring_function().experience_weight
+
+
+class SkillIndex:
+    def __init__(self):
+        self.built_at = datetime.utcnow()
+        self.candidate_skills = {}
+        self.job_skills = {}
+        self.candidates_by_skill = defaultdict(set)
+        self.jobs_by_skill = defaultdict(set)
+
+    @staticmethod
+    def _update(owner_skills: dict, by_skill: dict, owner_id: str, skills) -> None:
+        old = owner_skills.pop(owner_id, frozenset())
+        new = frozenset(normalize_skill(s) for s in skills or [])
+        for skill in old - new:
+            owners = by_skill[skill]
+            owners.discard(owner_id)
+            if not owners:
+                del by_skill[skill]
+        for skill in new - old:
+            by_skill[skill].add(owner_id)
+        if new:
+            owner_skills[owner_id] = new
+
+    def update_candidate(self, user_id: str, skills: list) -> None:
+        self._update(self.candidate_skills, self.candidates_by_skill, user_id, skills)
+
+    def remove_candidate(self, user_id: str) -> None:
+        self._update(self.candidate_skills, self.candidates_by_skill, user_id, [])
+
+    def update_job(self, job_id: str, skills: list) -> None:
+        self._update(self.job_skills, self.jobs_by_skill, job_id, skills)
+
+    def remove_job(self, job_id: str) -> None:
+        self._update(self.job_skills, self.jobs_by_skill, job_id, [])
+
+    def candidates_for_skills(self, skills) -> set:
+        """Candidate ids sharing at least one of ``skills``"""
+        found = set()
+        for skill in skills or []:
+            found |= self.candidates_by_skill.get(normalize_skill(skill), set())
+        return found
+
+    def jobs_for_skills(self, skills) -> set:
+        """Active job ids sharing at least one of ``skills``"""
+        found = set()
+        for skill in skills or []:
+            found |= self.jobs_by_skill.get(normalize_skill(skill), set())
+        return found
+
+
+_skill_index = None
+_refresh_task = None
+
+
+def get_skill_index():
+    """The skill index, or None until it has been built"""
+    return _skill_index
+
+
+def index_candidate(user: dict) -> None:
+    """Index or re-index a user after a profile write; non-candidates are dropped"""
+    index = get_skill_index()
+    if index is None:
+        return
+    if user.get("role") == "candidate":
+        index.update_candidate(entity_id(user), user.get("skills", []))
+    else:
+        index.remove_candidate(entity_id(user))
+
+
+def index_job(job: dict) -> None:
+    """Index or re-index a job after a write; inactive jobs are dropped"""
+    index = get_skill_index()
+    if index is None:
+        return
+    if job.get("status") == "active":
+        index.update_job(entity_id(job), job.get("required_skills", []))
+    else:
+        index.remove_job(entity_id(job))
+
+
+def remove_job(job_id: str) -> None:
+    if _skill_index is not None:
+        _skill_index.remove_job(job_id)
+
+
+async def initialize_skill_index_from_db() -> SkillIndex:
+    """Rebuild the skill index from the database"""
+    global _skill_index
+    db = get_database()
+    index = SkillIndex()
+
+    async for user in db.users.find({"role": "candidate"}, {"_id": 0, "id": 1, "skills": 1}):
+        index.update_candidate(user["id"], user.get("skills", []))
+
+    async for job in db.jobs.find({"status": "active"}, {"_id": 0, "id": 1, "required_skills": 1}):
+        index.update_job(job["id"], job.get("required_skills", []))
+
+    _skill_index = index
+    logger.info(
+        f"Skill index built: {len(index.candidate_skills)} candidates, "
+        f"{len(index.job_skills)} jobs, "
+        f"{len(set(index.candidates_by_skill) | set(index.jobs_by_skill))} skills"
+    )
+    return index
+
+
+async def mark_skill_index_stale() -> None:
+    """Tell running servers to rebuild their index; for writes made out of process"""
+    db = get_database()
+    await db.index_state.update_one(
+        {"_id": STATE_ID},
+        {"$set": {"changed_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+async def refresh_skill_index() -> bool:
+    """Build the index if it is missing or older than the stale marker; True if rebuilt"""
+    if _skill_index is not None:
+        db = get_database()
+        state = await db.index_state.find_one({"_id": STATE_ID})
+        if not state or state["changed_at"] <= _skill_index.built_at:
+            return False
+    await initialize_skill_index_from_db()
+    return True
+
+
+async def _refresh_loop() -> None:
+    while True:
+        await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+        try:
+            await refresh_skill_index()
+        except Exception as e:
+            logger.error(f"Error refreshing skill index: {e}")
+
+
+def start_skill_index_refresh() -> None:
+    global _refresh_task
+    if _refresh_task is None:
+        _refresh_task = asyncio.create_task(_refresh_loop())
+
+
+def stop_skill_index_refresh() -> None:
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        _refresh_task = None
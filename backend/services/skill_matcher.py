@@ -0,0 +1,264 @@
+"""
+Aho–Corasick matching of the skill vocabulary against free text.
+
+The automaton is built once from the skill trie's vocabulary (the skills
+``initialize_trie_from_db`` loads) plus ``SKILL_ALIASES``, and finds every
+known skill in a single pass over the text, instead of one substring scan
+per skill. Matching only accepts whole words, so "Java" is not found inside
+"JavaScript" nor "AI" inside "maintain". It is case-insensitive except for
+terms that are also ordinary words or too short to tell apart ("Go", "R",
+"Swift", "ML"): in free text those only match their exact spelling, so
+"go ahead" is not tagged as Go. ``canonicalize_skills`` works on fields that
+are known to be skills and ignores case throughout.
+
+When the vocabulary grows a new automaton is built in a background thread
+and swapped in atomically; readers keep using the previous one until then.
+"""
+
+import threading
+from collections import deque
+
+from services.trie_search import get_skill_trie
+from utils.logger import get_logger
+
+logger = get_logger("skill_matcher")
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class AhoCorasick:
+    def __init__(self, patterns: dict, exact_case: set = frozenset()):
+        """
+        ``patterns`` maps the text to look for to the value reported on a
+        match; patterns in ``exact_case`` must match with the same case
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern, value in patterns.items():
+            self._add(pattern.lower(), value, pattern if pattern in exact_case else None)
+        self._link()
+
+    def __len__(self):
+        return sum(len(out) for out in self.output)
+
+    def _add(self, pattern: str, value, exact: str = None) -> None:
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            nxt = self.goto[state].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = nxt
+        self.output[state].append((len(pattern), value, exact))
+
+    def _link(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0)
+                if self.fail[nxt] == nxt:
+                    self.fail[nxt] = 0
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def iter_matches(self, text: str, ignore_case: bool = False):
+        """
+        Yield ``(start, end, value)`` for every whole-word occurrence;
+        ``ignore_case`` also relaxes the exact-case patterns
+        """
+        lowered = text.lower()
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for end, char in enumerate(lowered, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value, exact in output[state]:
+                start = end - length
+                if exact is not None and not ignore_case and text[start:end] != exact:
+                    continue
+                if start > 0 and _is_word_char(lowered[start - 1]) and _is_word_char(lowered[start]):
+                    continue
+                if end < len(lowered) and _is_word_char(lowered[end]) and _is_word_char(lowered[end - 1]):
+                    continue
+                yield start, end, value
+
+    def find(self, text: str) -> list:
+        """Distinct matched values in order of first occurrence"""
+        return list(dict.fromkeys(value for _, _, value in self.iter_matches(text)))
+
+
+# Alternative spellings reported as the canonical skill
+SKILL_ALIASES = {
+    "JS": "JavaScript",
+    "ES6": "JavaScript",
+    "TS": "TypeScript",
+    "k8s": "Kubernetes",
+    "Node": "Node.js",
+    "NodeJS": "Node.js",
+    "ReactJS": "React",
+    "React.js": "React",
+    "VueJS": "Vue",
+    "Vue.js": "Vue",
+    "AngularJS": "Angular",
+    "NextJS": "Next.js",
+    "Postgres": "PostgreSQL",
+    "Mongo": "MongoDB",
+    "Golang": "Go",
+    "ML": "Machine Learning",
+    "Amazon Web Services": "AWS",
+    "Google Cloud": "GCP",
+    "Google Cloud Platform": "GCP",
+    "Microsoft Azure": "Azure",
+    "CI / CD": "CI/CD",
+    "REST": "REST API",
+    "RESTful API": "REST API",
+    "RESTful APIs": "REST API",
+}
+
+# Skills that are also everyday words, with the spelling that marks them as
+# the skill in free text
+AMBIGUOUS_SKILLS = {
+    skill.lower(): skill
+    for skill in [
+        "Go", "R", "C", "Swift", "Rust", "Ruby", "Dart", "Julia", "Scheme",
+        "Spring", "Express", "Flask", "Ember", "Meteor", "Chef", "Puppet",
+        "Spark", "Hive", "Pig", "Storm", "Shell", "Less", "Make",
+        "Excel", "Access", "Word"
+    ]
+}
+# Terms this short are matched with their exact spelling too ("ML", "JS", "AI")
+SHORT_SKILL_LENGTH = 2
+
+_automaton = None
+_vocabulary_size = None
+_rebuild_lock = threading.Lock()
+_rebuilding = False
+
+
+def _snapshot_vocabulary(trie) -> list:
+    # The trie may be written to from the event loop while a thread reads it
+    for _ in range(3):
+        try:
+            return trie.skills()
+        except RuntimeError:
+            continue
+    return trie.skills()
+
+
+def _exact_spelling(term: str):
+    """The spelling ``term`` must have in free text, or None if any case matches"""
+    if term.lower() in AMBIGUOUS_SKILLS:
+        return AMBIGUOUS_SKILLS[term.lower()]
+    if len(term) <= SHORT_SKILL_LENGTH:
+        return term.upper() if term.islower() else term
+    return None
+
+
+def build_skill_automaton(skills: list) -> AhoCorasick:
+    """Automaton over ``skills`` plus the aliases, reporting each skill's vocabulary spelling"""
+    canonical = {}
+    for skill in skills:
+        canonical.setdefault(skill.lower(), skill)
+    patterns = {skill: skill for skill in canonical.values()}
+    for alias, target in SKILL_ALIASES.items():
+        if alias.lower() not in canonical:
+            patterns[alias] = canonical.get(target.lower(), target)
+
+    # Ambiguous terms are looked for under their marked spelling
+    exact_case = set()
+    for pattern in list(patterns):
+        spelling = _exact_spelling(pattern)
+        if spelling is not None:
+            patterns[spelling] = patterns.pop(pattern)
+            exact_case.add(spelling)
+    return AhoCorasick(patterns, exact_case)
+
+
+def rebuild_skill_automaton() -> AhoCorasick:
+    """Build a new automaton from the trie and swap it in with a single assignment"""
+    global _automaton, _vocabulary_size
+    trie = get_skill_trie()
+    size = trie.size
+    automaton = build_skill_automaton(_snapshot_vocabulary(trie))
+    _automaton, _vocabulary_size = automaton, size
+    logger.info(f"Skill matcher built with {len(automaton)} patterns")
+    return automaton
+
+
+def _rebuild_in_background() -> None:
+    global _rebuilding
+    try:
+        rebuild_skill_automaton()
+    except Exception as e:
+        logger.error(f"Error rebuilding skill matcher: {e}")
+    finally:
+        with _rebuild_lock:
+            _rebuilding = False
+
+
+def schedule_skill_automaton_rebuild() -> None:
+    """Rebuild in a background thread; callers keep using the current automaton meanwhile"""
+    global _rebuilding
+    with _rebuild_lock:
+        if _rebuilding:
+            return
+        _rebuilding = True
+    threading.Thread(target=_rebuild_in_background, name="skill-matcher-rebuild", daemon=True).start()
+
+
+def get_skill_automaton() -> AhoCorasick:
+    """Current automaton; a vocabulary change triggers a background rebuild"""
+    if _automaton is None:
+        return rebuild_skill_automaton()
+    if _vocabulary_size != get_skill_trie().size:
+        schedule_skill_automaton_rebuild()
+    return _automaton
+
+
+def find_skills(text: str) -> list:
+    """Known skills mentioned in ``text``, with their canonical spelling"""
+    if not text:
+        return []
+    return get_skill_automaton().find(text)
+
+
+def register_skills(skills: list) -> None:
+    """Add skills to the vocabulary; the matcher picks them up on its next rebuild"""
+    trie = get_skill_trie()
+    for skill in skills:
+        trie.insert(skill)
+
+
+def canonicalize_skills(skills: list) -> list:
+    """
+    Normalise user-entered skills: aliases and case variants map to the
+    vocabulary spelling, unknown skills are kept as entered, duplicates dropped.
+    """
+    automaton = get_skill_automaton()
+    result = []
+    for skill in skills:
+        skill = skill.strip()
+        if not skill:
+            continue
+        match = next(
+            (
+                value for start, end, value in automaton.iter_matches(skill, ignore_case=True)
+                if start == 0 and end == len(skill)
+            ),
+            None
+        )
+        result.append(match or skill)
+    return list(dict.fromkeys(result))
@@ -7,6 +7,7 @@ class TrieNode:
 class Trie:
     def __init__(self):
         self.root = TrieNode()
+        self.size = 0
     
     def insert(self, skill: str) -> None:
         """Insert a skill into the trie"""
@@ -15,6 +16,8 @@ class Trie:
             if char not in node.children:
                 node.children[char] = TrieNode()
             node = node.children[char]
+        if not node.is_end:
+            self.size += 1
         node.is_end = True
         node.skill = skill
     
@@ -30,6 +33,12 @@ class Trie:
         self._collect_skills(node, results)
         return results
     
+    def skills(self) -> list:
+        """Every skill in the trie"""
+        results = []
+        self._collect_skills(self.root, results)
+        return results
+    
     def _collect_skills(self, node: TrieNode, results: list) -> None:
         """Collect all skills from the current node and its children"""
         if node.is_end:
@@ -37,6 +46,18 @@ class Trie:
         for child in node.children.values():
             self._collect_skills(child, results)
 
+COMMON_SKILLS = [
+    "JavaScript", "Python", "React", "Node.js", "MongoDB",
+    "FastAPI", "Machine Learning", "Data Science", "AWS",
+    "Docker", "Kubernetes", "TypeScript", "Next.js", "Java",
+    "C#", "SQL", "PostgreSQL", "Git", "DevOps", "Agile",
+    "Project Management", "Communication", "Leadership",
+    "Angular", "Vue", "Express", "Django", "Flask",
+    "MySQL", "Redis", "Azure", "GCP", "CI/CD", "Jenkins", "GitHub Actions",
+    "AI", "TensorFlow", "PyTorch", "HTML", "CSS", "REST API", "GraphQL",
+    "Scrum", "Problem Solving", "Team Collaboration"
+]
+
 _skill_trie = None
 
 def get_skill_trie() -> Trie:
@@ -44,14 +65,7 @@ def get_skill_trie() -> Trie:
     global _skill_trie
     if _skill_trie is None:
         _skill_trie = Trie()
-        common_skills = [
-            "JavaScript", "Python", "React", "Node.js", "MongoDB",
-            "FastAPI", "Machine Learning", "Data Science", "AWS",
-            "Docker", "Kubernetes", "TypeScript", "Next.js", "Java",
-            "C#", "SQL", "PostgreSQL", "Git", "DevOps", "Agile",
-            "Project Management", "Communication", "Leadership"
-        ]
-        for skill in common_skills:
+        for skill in COMMON_SKILLS:
             _skill_trie.insert(skill)
     return _skill_trie
 
@@ -63,17 +77,21 @@ async def initialize_trie_from_db():
     trie = get_skill_trie()
     
     # Get skills from jobs
-    jobs = await db.jobs.find().to_list(length=None)
+    jobs = await db.jobs.find({}, {"_id": 0, "required_skills": 1}).to_list(length=None)
     for job in jobs:
         for skill in job.get("required_skills", []):
             trie.insert(skill)
     
     # Get skills from users
-    users = await db.users.find().to_list(length=None)
+    users = await db.users.find({}, {"_id": 0, "skills": 1}).to_list(length=None)
     for user in users:
         for skill in user.get("skills", []):
             trie.insert(skill)
     
+    # Recompile the skill matcher over the new vocabulary
+    from services.skill_matcher import schedule_skill_automaton_rebuild
+    schedule_skill_automaton_rebuild()
+    
     return trie
 
 def search_skills(prefix: str, limit: int = 10) -> list:
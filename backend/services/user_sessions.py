@@ -0,0 +1,52 @@
+"""
+Authenticated-user cache.
+
+Every authenticated request needs the caller's id and role, not their whole
+profile (resume projects, education and so on). ``get_principal`` returns a
+small projection of the user document, cached per token subject with a
+short TTL and a size bound, so most requests authenticate without a Mongo
+round-trip. Endpoints that need the full profile load it with
+``load_user_profile``.
+
+Profile writes call ``invalidate_user_session`` so a changed role or name
+is seen on the next request; the TTL bounds staleness for anything else.
+"""
+
+from cachetools import TTLCache
+
+from utils.db import get_database
+
+SESSION_CACHE_MAX_USERS = 10000
+SESSION_CACHE_TTL_SECONDS = 60
+
+# Enough for auth checks and the dashboard
+PRINCIPAL_PROJECTION = {"_id": 0, "id": 1, "role": 1, "email": 1, "full_name": 1, "profile_complete": 1}
+PROFILE_PROJECTION = {"_id": 0, "password": 0}
+
+_principals = TTLCache(maxsize=SESSION_CACHE_MAX_USERS, ttl=SESSION_CACHE_TTL_SECONDS)
+
+
+async def get_principal(user_id: str):
+    """The cached principal for ``user_id``, or None if there is no such user"""
+    principal = _principals.get(user_id)
+    if principal is not None:
+        return dict(principal)
+
+    db = get_database()
+    principal = await db.users.find_one({"id": user_id}, PRINCIPAL_PROJECTION)
+    if principal is None:
+        return None
+    _principals[user_id] = principal
+    return dict(principal)
+
+
+async def load_user_profile(user_id: str):
+    """The full profile without password, always read from the database"""
+    db = get_database()
+    return await db.users.find_one({"id": user_id}, PROFILE_PROJECTION)
+
+
+def invalidate_user_session(user_id: str) -> None:
+    """Drop the cached principal after the user document changed"""
+    _principals.pop(user_id, None)
+
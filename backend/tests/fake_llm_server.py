@@ -0,0 +1,153 @@
+"""
+Local stand-in for the OpenRouter chat completions API.
+
+Lets the resume pipeline run end to end without a real LLM provider:
+
+    python tests/fake_llm_server.py --port 8765 --delay 2
+
+then start the backend with
+
+    GEMINI_API_KEY=sk-or-fake-key OPENROUTER_BASE_URL=http://127.0.0.1:8765/api/v1
+
+Every completion returns the same parsed resume after ``--delay`` seconds
+(``--model-delay MODEL=SECONDS`` overrides it per model, e.g. to exercise
+hedged requests); ``--fail-every N`` answers every Nth request with HTTP 500.
+``--fail-first N`` fails the first N requests instead, and ``--fail-status``
+and ``--retry-after`` choose the error, e.g. a rate limit::
+
+    python tests/fake_llm_server.py --fail-first 1 --fail-status 429 --retry-after 1
+
+Tests start it in-process with ``serve`` and change its behaviour between
+cases with ``configure``.
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAKE_RESUME = {
+    "skills": ["Python", "FastAPI", "MongoDB", "React", "Docker"],
+    "experience_years": 4,
+    "education": [{"degree": "B.Sc. Computer Science", "institution": "Test University", "year": "2019"}],
+    "achievements": ["Shipped the test suite"],
+    "job_titles": ["Software Engineer"],
+    "summary": "Backend engineer used for local testing.",
+    "phone": "",
+    "location": "Remote",
+    "certifications": [],
+    "languages": ["English"],
+    "projects": [{"name": "Fake LLM", "description": "Canned responses", "technologies": ["Python"]}]
+}
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    model_delays = {}
+    fail_every = 0
+    fail_first = 0
+    fail_status = 500
+    retry_after = None
+    requests_seen = 0
+    lock = threading.Lock()
+
+    def _send(self, status: int, body: dict, headers: dict = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        with FakeLLMHandler.lock:
+            FakeLLMHandler.requests_seen += 1
+            count = FakeLLMHandler.requests_seen
+
+        time.sleep(self.model_delays.get(request.get("model"), self.delay))
+        if count <= self.fail_first or (self.fail_every and count % self.fail_every == 0):
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else None
+            self._send(self.fail_status, {"error": {"message": "Injected failure"}}, headers)
+            return
+
+        self._send(200, {
+            "id": f"fake-{count}",
+            "model": request.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(FAKE_RESUME)},
+                "finish_reason": "stop"
+            }]
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def configure(
+    delay: float = 0.0,
+    fail_every: int = 0,
+    model_delays: dict = None,
+    fail_first: int = 0,
+    fail_status: int = 500,
+    retry_after: int = None
+) -> None:
+    """Set how the server answers from now on and reset the request count"""
+    with FakeLLMHandler.lock:
+        FakeLLMHandler.delay = delay
+        FakeLLMHandler.model_delays = model_delays or {}
+        FakeLLMHandler.fail_every = fail_every
+        FakeLLMHandler.fail_first = fail_first
+        FakeLLMHandler.fail_status = fail_status
+        FakeLLMHandler.retry_after = retry_after
+        FakeLLMHandler.requests_seen = 0
+
+
+def serve(port: int = 8765, **settings) -> ThreadingHTTPServer:
+    """Start the fake server on a background thread and return it; ``settings`` go to ``configure``"""
+    configure(**settings)
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake OpenRouter-compatible LLM server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before answering")
+    parser.add_argument("--fail-every", type=int, default=0, help="Fail every Nth request")
+    parser.add_argument("--fail-first", type=int, default=0, help="Fail the first N requests")
+    parser.add_argument("--fail-status", type=int, default=500, help="HTTP status of injected failures")
+    parser.add_argument("--retry-after", type=int, default=None, help="Retry-After seconds sent with failures")
+    parser.add_argument("--model-delay", action="append", default=[], metavar="MODEL=SECONDS",
+                        help="Per-model delay, may be repeated")
+    args = parser.parse_args()
+
+    model_delays = {}
+    for item in args.model_delay:
+        model, _, seconds = item.rpartition("=")
+        model_delays[model] = float(seconds)
+    server = serve(
+        args.port,
+        delay=args.delay,
+        fail_every=args.fail_every,
+        model_delays=model_delays,
+        fail_first=args.fail_first,
+        fail_status=args.fail_status,
+        retry_after=args.retry_after
+    )
+    print(f"Fake LLM server listening on http://127.0.0.1:{args.port}/api/v1")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,29 +1,19 @@
 import networkx as nx
+import numpy as np
 from networkx.algorithms import bipartite
+from scipy import sparse
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+from services.scoring_engine import MatchScorer, entity_id, get_scoring_function
+
+# Dense Hungarian is used while the (candidates x job slots) matrix stays this small
+DENSE_ASSIGNMENT_MAX_CELLS = 4_000_000
 
 def calculate_edge_weight(candidate: dict, job: dict) -> float:
     """
     Calculate edge weight between candidate and job
     """
-    candidate_skills = set([s.lower() for s in candidate.get("skills", [])])
-    job_skills = set([s.lower() for s in job.get("required_skills", [])])
-    
-    # Skill match
-    skill_overlap = len(candidate_skills & job_skills)
-    skill_score = skill_overlap / len(job_skills) if job_skills else 0
-    
-    # Experience match
-    candidate_exp = candidate.get("experience", 0)
-    min_exp = job.get("min_experience", 0)
-    max_exp = job.get("max_experience", 100)
-    
-    if min_exp <= candidate_exp <= max_exp:
-        exp_score = 1.0
-    else:
-        exp_score = max(0, 1 - abs(candidate_exp - min_exp) * 0.1)
-    
-    # Combined weight (70% skills, 30% experience)
-    weight = (skill_score * 0.7) + (exp_score * 0.3)
+    weight, _ = get_scoring_function().score_docs(candidate, job)
     return weight
 
 def build_bipartite_graph(candidates: list, jobs: list):
@@ -34,43 +24,134 @@ def build_bipartite_graph(candidates: list, jobs: list):
     
     # Add candidate nodes
     for candidate in candidates:
-        candidate_id = str(candidate["_id"]) if "_id" in candidate else candidate["id"]
-        G.add_node(candidate_id, bipartite=0, data=candidate)
+        G.add_node(entity_id(candidate), bipartite=0, data=candidate)
     
     # Add job nodes
     for job in jobs:
-        job_id = str(job["_id"]) if "_id" in job else job["id"]
-        G.add_node(job_id, bipartite=1, data=job)
+        G.add_node(entity_id(job), bipartite=1, data=job)
     
-    # Add edges with weights
-    for candidate in candidates:
-        candidate_id = str(candidate["_id"]) if "_id" in candidate else candidate["id"]
-        for job in jobs:
-            job_id = str(job["_id"]) if "_id" in job else job["id"]
-            weight = calculate_edge_weight(candidate, job)
-            
-            if weight > 0.3:  # Only add edges with >30% match
-                G.add_edge(candidate_id, job_id, weight=weight)
+    # Add edges with weights, scored in vectorized blocks
+    scorer = MatchScorer(candidates, jobs)
+    for candidate_id, job_id, weight in scorer.edges(threshold=0.3):  # Only add edges with >30% match
+        G.add_edge(candidate_id, job_id, weight=weight)
     
     return G
 
-def find_optimal_matches(graph):
+def _solve_dense_assignment(weights: np.ndarray, capacity: int, threshold: float):
+    """Hungarian assignment on a dense matrix with each job column repeated ``capacity`` times"""
+    n_jobs = weights.shape[1]
+    scores = np.where(weights > threshold, weights, 0.0)
+    slots = np.tile(scores, (1, capacity))
+    rows, cols = linear_sum_assignment(slots, maximize=True)
+    keep = slots[rows, cols] > 0
+    return rows[keep], cols[keep] % n_jobs
+
+def _solve_sparse_assignment(weights: sparse.csr_matrix, capacity: int, threshold: float):
+    """
+    Min-cost assignment (sparse Jonker-Volgenant) on the thresholded edges.
+
+    Each candidate also gets a private "unassigned" column so a full matching of
+    the candidate side always exists; maximizing total weight is then the same
+    as minimizing ``2 - weight`` with the unassigned column costing 2.
+    """
+    n_candidates, n_jobs = weights.shape
+    edges = weights.tocsr(copy=True)
+    edges.data[edges.data <= threshold] = 0
+    edges.eliminate_zeros()
+    edges.data = 2.0 - edges.data
+    
+    unassigned = sparse.identity(n_candidates, format="csr") * 2.0
+    costs = sparse.hstack([edges] * capacity + [unassigned], format="csr")
+    rows, cols = min_weight_full_bipartite_matching(costs)
+    
+    keep = cols < n_jobs * capacity
+    return rows[keep], cols[keep] % n_jobs
+
+def solve_assignment(weights, capacity: int = 1, threshold: float = 0.3, method: str = "auto"):
     """
-    Find maximum weighted matching in bipartite graph
+    Maximum-weight assignment of candidates (rows) to jobs (columns).
+    
+    Every candidate gets at most one job and every job at most ``capacity``
+    candidates; only pairs with weight above ``threshold`` are eligible.
+    ``weights`` may be a dense ndarray or a scipy sparse matrix. Returns a list
+    of ``(row, column, weight)`` tuples.
+    """
+    if capacity < 1:
+        raise ValueError("capacity must be at least 1")
+    
+    n_candidates, n_jobs = weights.shape
+    if n_candidates == 0 or n_jobs == 0:
+        return []
+    
+    if method == "auto":
+        method = "dense" if n_candidates * n_jobs * capacity <= DENSE_ASSIGNMENT_MAX_CELLS else "sparse"
+    
+    if method == "dense":
+        dense = weights.toarray() if sparse.issparse(weights) else np.asarray(weights, dtype=np.float64)
+        rows, cols = _solve_dense_assignment(dense, capacity, threshold)
+        values = dense[rows, cols]
+    elif method == "sparse":
+        matrix = weights if sparse.issparse(weights) else sparse.csr_matrix(weights)
+        rows, cols = _solve_sparse_assignment(matrix, capacity, threshold)
+        values = np.asarray(matrix.tocsr()[rows, cols]).ravel()
+    else:
+        raise ValueError(f"Unknown assignment method: {method}")
+    
+    return [(int(r), int(c), float(w)) for r, c, w in zip(rows, cols, values)]
+
+def match_candidates_to_jobs(candidates: list, jobs: list, capacity: int = 1, threshold: float = 0.3):
+    """
+    Score every candidate/job pair and return the maximum-weight assignment
+    as ``(candidate_id, job_id, weight)`` tuples, without building a graph.
+    """
+    scorer = MatchScorer(candidates, jobs)
+    weights = scorer.sparse_weights(threshold=threshold)
+    assignment = solve_assignment(weights, capacity=capacity, threshold=threshold)
+    return [
+        (scorer.candidate_ids[row], scorer.job_ids[col], weight)
+        for row, col, weight in assignment
+    ]
+
+def find_optimal_matches(graph, capacity: int = 1, mode: str = "weighted"):
+    """
+    Find matches in the bipartite graph.
+    
+    ``mode="weighted"`` solves the maximum-weight assignment with up to
+    ``capacity`` candidates per job; ``mode="cardinality"`` keeps the old
+    Hopcroft-Karp maximum matching, which ignores edge weights.
     """
     # Get candidate and job nodes
-    candidate_nodes = {n for n, d in graph.nodes(data=True) if d.get('bipartite') == 0}
-    job_nodes = {n for n, d in graph.nodes(data=True) if d.get('bipartite') == 1}
+    candidate_nodes = [n for n, d in graph.nodes(data=True) if d.get('bipartite') == 0]
+    job_nodes = [n for n, d in graph.nodes(data=True) if d.get('bipartite') == 1]
     
-    # Find maximum weighted matching
-    matching = bipartite.maximum_matching(graph, top_nodes=candidate_nodes)
+    if mode == "cardinality":
+        candidate_set = set(candidate_nodes)
+        matching = bipartite.maximum_matching(graph, top_nodes=candidate_set)
+        
+        matches = []
+        for candidate_id, job_id in matching.items():
+            if candidate_id in candidate_set:
+                if graph.has_edge(candidate_id, job_id):
+                    weight = graph[candidate_id][job_id]['weight']
+                    matches.append((candidate_id, job_id, weight))
+        return matches
     
-    # Extract matches with scores
-    matches = []
-    for candidate_id, job_id in matching.items():
-        if candidate_id in candidate_nodes:
-            if graph.has_edge(candidate_id, job_id):
-                weight = graph[candidate_id][job_id]['weight']
-                matches.append((candidate_id, job_id, weight))
+    # Weighted assignment over the graph's biadjacency matrix
+    candidate_index = {n: i for i, n in enumerate(candidate_nodes)}
+    job_index = {n: i for i, n in enumerate(job_nodes)}
+    rows, cols, data = [], [], []
+    for u, v, weight in graph.edges(data="weight"):
+        if u not in candidate_index:
+            u, v = v, u
+        rows.append(candidate_index[u])
+        cols.append(job_index[v])
+        data.append(weight)
+    weights = sparse.csr_matrix(
+        (data, (rows, cols)), shape=(len(candidate_nodes), len(job_nodes))
+    )
     
-    return matches
+    assignment = solve_assignment(weights, capacity=capacity, threshold=0.0)
+    return [
+        (candidate_nodes[row], job_nodes[col], weight)
+        for row, col, weight in assignment
+    ]
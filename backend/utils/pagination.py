@@ -0,0 +1,92 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+A cursor is an opaque base64url token holding the sort key of the last item
+on a page. Lists are sorted newest first on ``(created_at, id)``, both
+descending, matching the compound indexes in ``services.db_indexes``, and
+the next page starts with a range condition on that key. Each page is one
+bounded index range read however deep into the list it is, and rows
+inserted between requests do not shift or repeat items.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 100
+
+NEWEST_FIRST = [("created_at", -1), ("id", -1)]
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(*values) -> str:
+    """Opaque cursor for a sort key, e.g. ``encode_cursor(created_at, id)``"""
+    raw = json.dumps(list(values), default=_default).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    """
+    Inverse of ``encode_cursor``, converting each value with ``types``
+    (``datetime`` values are parsed from ISO format). Raises ValueError for a
+    malformed cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if len(values) != len(types):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, values)
+        )
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def page_size(limit: Optional[int]) -> int:
+    return max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+
+def after_filter(query: dict, after: Optional[tuple]) -> dict:
+    """``query`` restricted to items that sort after the ``(created_at, id)`` key"""
+    if after is None:
+        return query
+    created_at, item_id = after
+    return {
+        "$and": [
+            query,
+            {"$or": [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "id": {"$lt": item_id}}
+            ]}
+        ]
+    }
+
+
+async def keyset_page(collection, query: dict, cursor: Optional[str] = None, limit: int = None, projection: dict = None) -> tuple:
+    """
+    One page of ``query``, newest first. Returns ``(docs, next_cursor)``;
+    ``next_cursor`` is None on the last page. Raises ValueError for a bad
+    cursor.
+    """
+    limit = page_size(limit)
+    after = decode_cursor(cursor, datetime, str) if cursor else None
+    docs = await (
+        collection.find(after_filter(query, after), projection)
+        .sort(NEWEST_FIRST)
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1]["created_at"], docs[-1]["id"])
+    return docs, next_cursor
@@ -86,6 +86,10 @@ export const authService = {
   },
 };
 
+// Give up waiting for a background parse after about two minutes
+const PARSE_POLL_INTERVAL_MS = 1000;
+const PARSE_POLL_MAX_ATTEMPTS = 120;
+
 export const resumeService = {
   uploadResume: async (file) => {
     try {
@@ -99,12 +103,42 @@ export const resumeService = {
         transformRequest: (data) => data,
       });
       
-      return response.data;
+      // Parsing happens in the background; wait for the parse job to finish
+      const parseJobId = response.data.data.parse_job_id;
+      for (let attempt = 0; attempt < PARSE_POLL_MAX_ATTEMPTS; attempt++) {
+        await new Promise((resolve) => setTimeout(resolve, PARSE_POLL_INTERVAL_MS));
+        const status = await resumeService.getParseJob(parseJobId);
+        const job = status.data;
+        if (job.status === 'done') {
+          return {
+            success: true,
+            data: {
+              message: job.message,
+              parsed_data: job.parsed_data,
+              parsing_method: job.parsing_method,
+            },
+          };
+        }
+        if (job.status === 'failed') {
+          const error = new Error(job.error);
+          error.response = { status: job.error_status, data: { detail: job.error } };
+          throw error;
+        }
+      }
+      const detail = 'Resume parsing is taking longer than expected. Please check your profile again in a few minutes.';
+      const error = new Error(detail);
+      error.response = { status: 408, data: { detail } };
+      throw error;
     } catch (error) {
       throw error;
     }
   },
 
+  getParseJob: async (parseJobId) => {
+    const response = await api.get(`/resume/parse-jobs/${parseJobId}`);
+    return response.data;
+  },
+
   getParsedData: async () => {
     const response = await api.get('/resume/parsed-data');
     return response.data;
@@ -166,6 +200,16 @@ export const aiMatchService = {
     return response.data;
   },
 
+  getMatchingRun: async (runId) => {
+    const response = await api.get(`/ai-match/run/${runId}`);
+    return response.data;
+  },
+
+  cancelMatchingRun: async (runId) => {
+    const response = await api.post(`/ai-match/run/${runId}/cancel`);
+    return response.data;
+  },
+
   getCandidatesForJob: async (jobId, limit = 20) => {
     const response = await api.get(`/ai-match/candidates/${jobId}`, {
       params: { limit },
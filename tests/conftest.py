@@ -0,0 +1,58 @@
+"""
+Shared test setup.
+
+Backend modules import each other as top-level packages, so ``backend`` goes
+on ``sys.path``. The resume parsers read their provider settings when they
+are imported, so the OpenRouter-format key, the address of the fake LLM
+server (``backend/tests/fake_llm_server.py``) and a throwaway parse cache
+are set here, before any test module imports the backend. No test talks to
+a real LLM provider.
+"""
+
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+sys.path.append(str(BACKEND_DIR))
+sys.path.append(str(BACKEND_DIR / "tests"))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+FAKE_LLM_PORT = _free_port()
+FAKE_LLM_URL = f"http://127.0.0.1:{FAKE_LLM_PORT}/api/v1"
+
+os.environ["GEMINI_API_KEY"] = "sk-or-fake-key"
+os.environ["OPENROUTER_BASE_URL"] = FAKE_LLM_URL
+os.environ["OPENROUTER_BACKOFF"] = "0.01"
+os.environ["RESUME_CACHE_DIR"] = tempfile.mkdtemp(prefix="resume_parse_cache_")
+
+import fake_llm_server  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def fake_llm_server_instance():
+    server = fake_llm_server.serve(FAKE_LLM_PORT)
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def fake_llm(fake_llm_server_instance):
+    """
+    The fake LLM server with default behaviour. Call the fixture value (its
+    ``configure``) to change how it answers; ``FakeLLMHandler.requests_seen``
+    counts the requests since.
+    """
+    fake_llm_server.configure()
+    yield fake_llm_server.configure
+    fake_llm_server.configure()
@@ -0,0 +1,116 @@
+import itertools
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from services.scoring_engine import MatchScorer
+from utils.graph_utils import calculate_edge_weight, solve_assignment
+
+THRESHOLD = 0.3
+SKILLS = ["Python", "python", "SQL", "React", "Docker", "AWS", "Java", "Go"]
+
+
+def brute_force_total(weights: np.ndarray, capacity: int, threshold: float) -> float:
+    """Best total weight over every assignment of candidates to a job or to nothing"""
+    n_candidates, n_jobs = weights.shape
+    best = 0.0
+    for choice in itertools.product([None, *range(n_jobs)], repeat=n_candidates):
+        load = Counter(job for job in choice if job is not None)
+        if any(count > capacity for count in load.values()):
+            continue
+        total = 0.0
+        for row, job in enumerate(choice):
+            if job is None:
+                continue
+            if weights[row, job] <= threshold:
+                break
+            total += weights[row, job]
+        else:
+            best = max(best, total)
+    return best
+
+
+def assert_valid(assignment, weights: np.ndarray, capacity: int, threshold: float):
+    rows = [row for row, _, _ in assignment]
+    assert len(rows) == len(set(rows))
+    assert all(count <= capacity for count in Counter(col for _, col, _ in assignment).values())
+    for row, col, weight in assignment:
+        assert weight == pytest.approx(weights[row, col])
+        assert weight > threshold
+
+
+@pytest.mark.parametrize("method", ["dense", "sparse"])
+@pytest.mark.parametrize("capacity", [1, 2])
+def test_solve_assignment_matches_brute_force(method, capacity):
+    rng = np.random.default_rng(capacity)
+    for _ in range(40):
+        n_candidates = int(rng.integers(1, 6))
+        n_jobs = int(rng.integers(1, 4))
+        weights = rng.random((n_candidates, n_jobs)).round(2)
+        # Leave some pairs below the threshold, as real score matrices do
+        weights[rng.random(weights.shape) < 0.3] = 0.0
+
+        matrix = sparse.csr_matrix(weights) if method == "sparse" else weights
+        assignment = solve_assignment(matrix, capacity=capacity, threshold=THRESHOLD, method=method)
+
+        assert_valid(assignment, weights, capacity, THRESHOLD)
+        assert sum(w for _, _, w in assignment) == pytest.approx(
+            brute_force_total(weights, capacity, THRESHOLD)
+        )
+
+
+def test_solve_assignment_rejects_zero_capacity():
+    with pytest.raises(ValueError):
+        solve_assignment(np.ones((2, 2)), capacity=0)
+
+
+def random_documents(seed: int):
+    """Candidates and jobs covering duplicate spellings and missing fields"""
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(80):
+        candidate = {"id": f"c{i}", "skills": rng.sample(SKILLS, rng.randint(0, 4))}
+        if rng.random() < 0.9:
+            candidate["experience"] = rng.choice([None, rng.randint(0, 15), rng.random() * 10])
+        candidates.append(candidate)
+    jobs = []
+    for i in range(30):
+        job = {"id": f"j{i}", "required_skills": rng.sample(SKILLS, rng.randint(0, 4))}
+        if rng.random() < 0.8:
+            job["min_experience"] = rng.randint(0, 8)
+        if rng.random() < 0.8:
+            job["max_experience"] = job.get("min_experience", 0) + rng.randint(0, 6)
+        jobs.append(job)
+    return candidates, jobs
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_match_scorer_weights_equal_scalar_scores(seed):
+    candidates, jobs = random_documents(seed)
+    scorer = MatchScorer(candidates, jobs)
+
+    expected = np.array([[calculate_edge_weight(c, j) for j in jobs] for c in candidates])
+    assert np.array_equal(scorer.weight_matrix(), expected)
+
+
+@pytest.mark.parametrize("threshold", [0.2, THRESHOLD, 0.5])
+def test_match_scorer_edges_equal_scalar_scores(threshold):
+    candidates, jobs = random_documents(7)
+    scorer = MatchScorer(candidates, jobs)
+
+    expected = {}
+    for c in candidates:
+        for j in jobs:
+            weight = calculate_edge_weight(c, j)
+            if weight > threshold:
+                expected[(c["id"], j["id"])] = weight
+
+    # A small block size runs several blocks; thresholds at or above the
+    # experience weight take the pruned sparse_block path
+    edges = {(c, j): w for c, j, w in scorer.edges(threshold=threshold, block_size=16)}
+    assert edges == expected
+    if threshold >= scorer.scoring.experience_weight:
+        assert 0 < scorer.pairs_evaluated < len(candidates) * len(jobs)
@@ -0,0 +1,68 @@
+import pytest
+
+from services.llm_output import parse_llm_json, validate_resume
+
+PARSE_CASES = [
+    ("valid", '{"skills": ["Python"], "experience_years": 3}', {"skills": ["Python"], "experience_years": 3}),
+    ("fence", '```json\n{"skills": ["Python"]}\n```', {"skills": ["Python"]}),
+    ("fence after prose", 'Here is the data:\n```json\n{"a": 1}\n```\nDone.', {"a": 1}),
+    ("trailing commas", '{"skills": ["Python", "SQL",], "a": 1,}', {"skills": ["Python", "SQL"], "a": 1}),
+    ("bare keys", '{skills: ["Go"], experience_years: 2, job_titles: []}',
+     {"skills": ["Go"], "experience_years": 2, "job_titles": []}),
+    ("single quotes", "{'summary': 'Backend engineer', 'skills': ['C']}",
+     {"summary": "Backend engineer", "skills": ["C"]}),
+    ("escaped single quote", "{'summary': 'It\\'s me', 'name': 'O\\'Brien'}",
+     {"summary": "It's me", "name": "O'Brien"}),
+    ("escaped double quote kept", '{"summary": "a \\"quoted\\" word" "b": 1}', {"summary": 'a "quoted" word', "b": 1}),
+    ("missing comma", '{"a": "b" "c": 1}', {"a": "b", "c": 1}),
+    ("missing comma on new line", '{"a": 1\n  "b": true\n  c: null}', {"a": 1, "b": True, "c": None}),
+    ("missing comma in arrays", '{"a": ["x" "y"], "b": [1 2], "c": [{"d": 1} {"d": 2}]}',
+     {"a": ["x", "y"], "b": [1, 2], "c": [{"d": 1}, {"d": 2}]}),
+    ("literals untouched", '{"a": true, "b": 1e5, "c": -2.5}', {"a": True, "b": 100000.0, "c": -2.5}),
+    ("truncated string", '{"skills": ["Python", "Dja', {"skills": ["Python", "Dja"]}),
+    ("truncated after key", '{"skills": ["Python"], "summary"', {"skills": ["Python"], "summary": None}),
+    ("truncated after colon", '{"skills": ["Python"], "summary": ', {"skills": ["Python"], "summary": None}),
+    ("truncated after comma", '{"education": [{"degree": "BSc",', {"education": [{"degree": "BSc"}]}),
+    ("truncated escape", '{"summary": "line\\', {"summary": "line"}),
+]
+
+
+@pytest.mark.parametrize("text, expected", [case[1:] for case in PARSE_CASES], ids=[case[0] for case in PARSE_CASES])
+def test_parse_llm_json(text, expected):
+    assert parse_llm_json(text) == expected
+
+
+@pytest.mark.parametrize("text", ["no json here", "[1, 2, 3]"])
+def test_parse_llm_json_rejects_non_objects(text):
+    with pytest.raises(ValueError):
+        parse_llm_json(text)
+
+
+VALIDATE_CASES = [
+    ("years from text", {"experience_years": "5+ years"}, {"experience_years": 5.0}, []),
+    ("comma separated list", {"skills": "Python, SQL ,"}, {"skills": ["Python", "SQL"]}, []),
+    ("education string", {"education": "BSc Physics"},
+     {"education": [{"degree": "BSc Physics", "institution": "", "year": ""}]}, []),
+    ("null is missing", {"skills": None, "job_titles": ["Dev"]}, {"skills": [], "job_titles": ["Dev"]}, ["skills"]),
+    ("scalar list is missing", {"skills": 5, "education": 3}, {"skills": [], "education": []}, ["skills", "education"]),
+    ("bad years is missing", {"experience_years": [1]}, {"experience_years": 0}, ["experience_years"]),
+]
+
+
+@pytest.mark.parametrize(
+    "data, expected, missing",
+    [case[1:] for case in VALIDATE_CASES],
+    ids=[case[0] for case in VALIDATE_CASES]
+)
+def test_validate_resume(data, expected, missing):
+    fields = list(expected)
+    parsed, left_out = validate_resume(data, fields)
+    assert parsed == expected
+    assert left_out == missing
+
+
+def test_validate_resume_fills_every_field_and_reports_required_ones():
+    parsed, missing = validate_resume({"skills": ["Python"], "phone": 123})
+    assert parsed["phone"] == "123"
+    assert parsed["projects"] == []
+    assert missing == ["experience_years", "education", "job_titles"]
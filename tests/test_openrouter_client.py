@@ -0,0 +1,113 @@
+"""
+OpenRouterClient retries and hedging against the fake LLM server.
+"""
+
+import asyncio
+import json
+import time
+from functools import partial
+
+import httpx
+import pytest
+
+from fake_llm_server import FAKE_RESUME, FakeLLMHandler
+from services.openrouter_client import OpenRouterClient, RetryableStatus
+
+MESSAGES = [{"role": "user", "content": "Parse this resume"}]
+EXPECTED_CONTENT = json.dumps(FAKE_RESUME)
+
+
+def run_with_client(coroutine_function, **settings):
+    """Run ``coroutine_function(client)`` with a fresh client on the fake server"""
+    settings.setdefault("backoff", 0.01)
+
+    async def main():
+        client = OpenRouterClient("sk-or-fake-key", **settings)
+        try:
+            return await coroutine_function(client)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_rate_limit_is_retried_after_retry_after(fake_llm):
+    fake_llm(fail_first=1, fail_status=429, retry_after=1)
+
+    started = time.monotonic()
+    content = run_with_client(lambda client: client.chat("fake/model", MESSAGES), max_retries=2)
+
+    assert content == EXPECTED_CONTENT
+    assert FakeLLMHandler.requests_seen == 2
+    # The jittered backoff is far shorter; only Retry-After explains the wait
+    assert time.monotonic() - started >= 1.0
+
+
+def test_retries_are_exhausted(fake_llm):
+    fake_llm(fail_every=1)
+
+    with pytest.raises(RetryableStatus) as error:
+        run_with_client(lambda client: client.chat("fake/model", MESSAGES), max_retries=2)
+
+    assert error.value.response.status_code == 500
+    assert FakeLLMHandler.requests_seen == 3
+
+
+def test_client_errors_are_not_retried(fake_llm):
+    fake_llm(fail_first=5, fail_status=400)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run_with_client(lambda client: client.chat("fake/model", MESSAGES), max_retries=2)
+
+    assert FakeLLMHandler.requests_seen == 1
+
+
+def test_hedged_request_takes_the_fast_answer_and_cancels_the_slow_one(fake_llm):
+    fake_llm(model_delays={"slow/model": 3.0})
+    cancelled = []
+
+    async def attempt(client, model):
+        try:
+            return model, await client.chat(model, MESSAGES)
+        except asyncio.CancelledError:
+            cancelled.append(model)
+            raise
+
+    async def hedged(client):
+        result = await client.first_successful([
+            partial(attempt, client, "slow/model"),
+            partial(attempt, client, "fast/model"),
+        ])
+        # Cancellation is delivered the next time the loser's task runs
+        for _ in range(100):
+            if cancelled:
+                break
+            await asyncio.sleep(0.01)
+        return result
+
+    started = time.monotonic()
+    model, content = run_with_client(hedged, hedge_after=0.2)
+
+    assert (model, content) == ("fast/model", EXPECTED_CONTENT)
+    assert cancelled == ["slow/model"]
+    assert time.monotonic() - started < 2.0
+    assert FakeLLMHandler.requests_seen == 2
+
+
+def test_without_hedging_a_failed_attempt_falls_through_to_the_next(fake_llm):
+    async def broken():
+        raise ValueError("unusable answer")
+
+    async def sequential(client):
+        return await client.first_successful([broken, partial(client.chat, "fake/model", MESSAGES)])
+
+    assert run_with_client(sequential, hedge_after=0) == EXPECTED_CONTENT
+    assert FakeLLMHandler.requests_seen == 1
+
+
+def test_last_error_is_raised_when_every_attempt_fails(fake_llm):
+    async def broken():
+        raise ValueError("unusable answer")
+
+    with pytest.raises(ValueError, match="unusable answer"):
+        run_with_client(lambda client: client.first_successful([broken, broken]))
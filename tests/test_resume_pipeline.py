@@ -0,0 +1,153 @@
+"""
+Resume upload end to end against the fake LLM server: the upload answers 202
+with a parse job id, and the job is polled until it is done or failed.
+Mongo is replaced by an in-memory mock.
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fake_llm_server import FAKE_RESUME, FakeLLMHandler
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+POLL_INTERVAL = 0.05
+POLL_TIMEOUT = 20
+
+# Nothing the local parser can use, so every upload goes to the LLM tier
+VAGUE_RESUME = ["Jane Roe", "Enjoys hiking and board games.", "Lives near the coast."]
+
+
+def make_pdf(lines: list) -> bytes:
+    """A one-page PDF showing ``lines`` in Helvetica"""
+    text = " ".join(f"({line}) '" for line in lines)
+    stream = f"BT /F1 12 Tf 72 720 Td 14 TL {text} ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        pdf += b"%010d 00000 n \n" % offset
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path, fake_llm):
+    import utils.db
+    monkeypatch.setattr(utils.db, "client", mongomock_motor.AsyncMongoMockClient())
+
+    import server
+    from routes import resume
+    monkeypatch.setattr(resume, "UPLOADS_DIR", tmp_path)
+
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def candidate_headers(client):
+    response = client.post("/api/auth/signup", json={
+        "email": "candidate@example.com",
+        "password": "secret-password",
+        "full_name": "Jane Roe",
+        "role": "candidate"
+    })
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+
+def upload(client, headers, lines: list) -> str:
+    response = client.post(
+        "/api/resume/upload",
+        files={"file": ("resume.pdf", make_pdf(lines), "application/pdf")},
+        headers=headers
+    )
+    assert response.status_code == 202
+    data = response.json()["data"]
+    assert data["status"] == "queued"
+    return data["parse_job_id"]
+
+
+def wait_for_job(client, headers, job_id: str) -> dict:
+    """Poll the parse job like the frontend does until it finishes"""
+    statuses = []
+    deadline = time.monotonic() + POLL_TIMEOUT
+    while time.monotonic() < deadline:
+        response = client.get(f"/api/resume/parse-jobs/{job_id}", headers=headers)
+        assert response.status_code == 200
+        job = response.json()["data"]
+        statuses.append(job["status"])
+        assert job["status"] in ("queued", "extracting", "parsing", "done", "failed")
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(POLL_INTERVAL)
+    pytest.fail(f"Parse job {job_id} did not finish; saw {statuses}")
+
+
+def test_upload_is_parsed_by_the_llm(client, candidate_headers, fake_llm):
+    fake_llm(delay=0.2)
+    job_id = upload(client, candidate_headers, VAGUE_RESUME)
+
+    job = wait_for_job(client, candidate_headers, job_id)
+
+    assert job["status"] == "done"
+    assert job["parsing_method"].startswith("local+openrouter_")
+    assert set(FAKE_RESUME["skills"]) <= set(job["parsed_data"]["skills"])
+    assert FakeLLMHandler.requests_seen >= 1
+
+    profile = client.get("/api/resume/parsed-data", headers=candidate_headers).json()["data"]
+    assert set(FAKE_RESUME["skills"]) <= set(profile["skills"])
+
+
+def test_upload_fails_when_the_llm_is_down(client, candidate_headers, fake_llm):
+    fake_llm(fail_every=1)
+    job_id = upload(client, candidate_headers, VAGUE_RESUME + ["Reads a lot."])
+
+    job = wait_for_job(client, candidate_headers, job_id)
+
+    assert job["status"] == "failed"
+    assert job["error_status"] == 503
+    assert job["error"]
+    assert FakeLLMHandler.requests_seen >= 1
+
+
+def test_unreadable_pdf_fails_without_calling_the_llm(client, candidate_headers, fake_llm):
+    response = client.post(
+        "/api/resume/upload",
+        files={"file": ("resume.pdf", b"not a pdf", "application/pdf")},
+        headers=candidate_headers
+    )
+    assert response.status_code == 202
+
+    job = wait_for_job(client, candidate_headers, response.json()["data"]["parse_job_id"])
+
+    assert job["status"] == "failed"
+    assert job["error_status"] == 400
+    assert FakeLLMHandler.requests_seen == 0
+
+
+def test_parse_jobs_are_private(client, candidate_headers):
+    job_id = upload(client, candidate_headers, VAGUE_RESUME)
+    other = client.post("/api/auth/signup", json={
+        "email": "other@example.com",
+        "password": "secret-password",
+        "full_name": "Other",
+        "role": "candidate"
+    }).json()["data"]["access_token"]
+
+    response = client.get(f"/api/resume/parse-jobs/{job_id}", headers={"Authorization": f"Bearer {other}"})
+    assert response.status_code == 404
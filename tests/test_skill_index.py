@@ -0,0 +1,187 @@
+import asyncio
+import random
+
+import pytest
+
+import utils.db
+from services import incremental_matching, job_rankings, skill_index
+from services.scoring_engine import candidate_features, get_scoring_function, job_features, to_percentage
+from services.skill_index import SkillIndex, can_prune
+
+SKILLS = ["Python", "python", "SQL", "React", "Docker", "Go", "AWS", "Java"]
+CUTOFF = 30
+
+
+def random_candidates(rng, count):
+    return [
+        {
+            "id": f"c{i}",
+            "skills": rng.sample(SKILLS, rng.randint(0, 3)),
+            "experience": rng.randint(0, 12),
+        }
+        for i in range(count)
+    ]
+
+
+def random_jobs(rng, count):
+    jobs = []
+    for i in range(count):
+        min_exp = rng.randint(0, 6)
+        jobs.append({
+            "id": f"j{i}",
+            "required_skills": rng.sample(SKILLS, rng.randint(0, 3)),
+            "min_experience": min_exp,
+            "max_experience": min_exp + rng.randint(0, 5),
+        })
+    return jobs
+
+
+def ranking(candidate, jobs, job_ids=None):
+    """``(percentage, job_id)`` above the cutoff, best first, optionally restricted to ``job_ids``"""
+    scoring = get_scoring_function()
+    ranked = []
+    for job in jobs:
+        if job_ids is not None and job["id"] not in job_ids:
+            continue
+        weight, _ = scoring.score(*candidate_features(candidate), *job_features(job))
+        if to_percentage(weight) > CUTOFF:
+            ranked.append((to_percentage(weight), job["id"]))
+    return sorted(ranked, reverse=True)
+
+
+def build_index(candidates, jobs):
+    index = SkillIndex()
+    for candidate in candidates:
+        index.update_candidate(candidate["id"], candidate["skills"])
+    for job in jobs:
+        index.update_job(job["id"], job["required_skills"])
+    return index
+
+
+def test_can_prune_only_once_the_index_is_built(monkeypatch):
+    monkeypatch.setattr(skill_index, "_skill_index", None)
+    assert not can_prune(CUTOFF / 100)
+
+    monkeypatch.setattr(skill_index, "_skill_index", SkillIndex())
+    assert can_prune(CUTOFF / 100)
+    assert not can_prune(get_scoring_function().experience_weight / 2)
+
+
+def test_pruned_rankings_match_unpruned():
+    rng = random.Random(5)
+    candidates = random_candidates(rng, 60)
+    jobs = random_jobs(rng, 25)
+    index = build_index(candidates, jobs)
+
+    for candidate in candidates:
+        pruned = index.jobs_for_skills(candidate["skills"])
+        assert ranking(candidate, jobs, pruned) == ranking(candidate, jobs)
+
+    for job in jobs:
+        pruned = index.candidates_for_skills(job["required_skills"])
+        unpruned = sorted(
+            (score, job_id) for candidate in candidates
+            for score, job_id in ranking(candidate, [job])
+        )
+        restricted = sorted(
+            (score, job_id) for candidate in candidates if candidate["id"] in pruned
+            for score, job_id in ranking(candidate, [job])
+        )
+        assert restricted == unpruned
+
+
+def test_pruned_rankings_follow_index_updates():
+    rng = random.Random(7)
+    candidates = random_candidates(rng, 30)
+    jobs = random_jobs(rng, 15)
+    index = build_index(candidates, jobs)
+
+    # Re-skill half of the candidates and drop a few jobs after the build
+    for candidate in candidates[::2]:
+        candidate["skills"] = rng.sample(SKILLS, rng.randint(0, 3))
+        index.update_candidate(candidate["id"], candidate["skills"])
+    for job in jobs[:3]:
+        index.remove_job(job["id"])
+    active = jobs[3:]
+
+    for candidate in candidates:
+        pruned = index.jobs_for_skills(candidate["skills"])
+        assert ranking(candidate, active, pruned) == ranking(candidate, active)
+
+
+def seed_documents(seed: int):
+    rng = random.Random(seed)
+    candidates = [{**c, "role": "candidate"} for c in random_candidates(rng, 60)]
+    jobs = [{**j, "status": "active", "title": j["id"]} for j in random_jobs(rng, 20)]
+    return rng, candidates, jobs
+
+
+async def pruning_scenario(pruned: bool, seed: int) -> dict:
+    """
+    Rank and match seeded data through the real query paths, with the skill
+    index built (pruned) or not, then change some profiles and jobs and run
+    an incremental match. Returns everything the two modes must agree on.
+    """
+    rng, candidates, jobs = seed_documents(seed)
+    db = utils.db.get_database()
+    await db.users.insert_many([dict(c) for c in candidates])
+    await db.jobs.insert_many([dict(j) for j in jobs])
+    if pruned:
+        await skill_index.initialize_skill_index_from_db()
+    assert can_prune(job_rankings.RANKING_CUTOFF / 100) is pruned
+    assert can_prune(incremental_matching.MATCH_THRESHOLD) is pruned
+
+    result = {"rankings": {}}
+    for job in jobs:
+        ranked, total = await job_rankings.get_job_ranking(job["id"], limit=5)
+        result["rankings"][job["id"]] = ([(c["id"], c["match_score"]) for c in ranked], total)
+    await incremental_matching.run_incremental_matching(rebuild=True)
+
+    # Re-skill a few candidates and jobs the way the write hooks would
+    for candidate in rng.sample(candidates, 10):
+        skills = rng.sample(SKILLS, rng.randint(0, 3))
+        await db.users.update_one({"id": candidate["id"]}, {"$set": {"skills": skills}})
+        skill_index.index_candidate({**candidate, "skills": skills})
+        await incremental_matching.mark_candidate_dirty(candidate["id"])
+        await job_rankings.rebuild_candidate_rankings(candidate["id"])
+    for job in rng.sample(jobs, 4):
+        skills = rng.sample(SKILLS, rng.randint(1, 3))
+        await db.jobs.update_one({"id": job["id"]}, {"$set": {"required_skills": skills}})
+        skill_index.index_job({**job, "required_skills": skills})
+        await incremental_matching.mark_job_dirty(job["id"])
+        await job_rankings.rebuild_job_ranking(job["id"])
+
+    stats = await incremental_matching.run_incremental_matching()
+    result["pairs_scored"] = stats["pairs_scored"]
+    result["ranking_rows"] = sorted(
+        (row["job_id"], row["user_id"], row["score"])
+        for row in await db.job_rankings.find({}, {"_id": 0}).to_list(length=None)
+    )
+    result["edges"] = sorted(
+        (edge["user_id"], edge["job_id"], edge["weight"])
+        for edge in await db.match_edges.find({}, {"_id": 0}).to_list(length=None)
+    )
+    result["matches"] = sorted(
+        (match["user_id"], match["job_id"])
+        for match in await db.matches.find({}, {"_id": 0}).to_list(length=None)
+    )
+    return result
+
+
+@pytest.mark.parametrize("seed", [11, 12])
+def test_pruned_queries_match_a_full_scan(monkeypatch, seed):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    runs = {}
+    for pruned in (False, True):
+        monkeypatch.setattr(utils.db, "client", mongomock_motor.AsyncMongoMockClient())
+        monkeypatch.setattr(skill_index, "_skill_index", None)
+        runs[pruned] = asyncio.run(pruning_scenario(pruned, seed))
+
+    full_scan, pruned = runs[False], runs[True]
+    assert pruned["rankings"] == full_scan["rankings"]
+    assert any(total for _, total in full_scan["rankings"].values())
+    assert pruned["ranking_rows"] == full_scan["ranking_rows"]
+    assert pruned["edges"] == full_scan["edges"]
+    assert pruned["matches"] == full_scan["matches"]
+    # The incremental run only scored pairs sharing a skill
+    assert pruned["pairs_scored"] < full_scan["pairs_scored"]